@@ -0,0 +1,380 @@
+"""
+Microbenchmarks for per-request hot paths, checked against stored baselines.
+
+Each case times one operation that runs on every turn or every realtime
+event (message conversion, /stream event filtering, Tiptap conversion, the
+realtime event queue, section prompt rendering, checkpoint serde of the
+founder state). Each case runs in batches sized to about `--round-time`
+seconds; the fastest batch gives the reported time per operation.
+
+Shared and throttled machines drift by tens of percent, even within a run,
+so batches of a fixed pure-Python reference workload alternate with the
+case's batches, and cases are compared by their median time relative to the
+reference. Results are compared with benchmarks/baselines/hot_paths.json: a
+case whose relative time grew by more than `--threshold` fails the run (exit
+status 1), so this can gate CI. The baseline also records absolute times for
+reading; after an intended change (or on a different Python), regenerate it
+with `--save`.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--filter tiptap] [--threshold 0.25]
+        [--rounds 9] [--round-time 0.1] [--save] [--baseline PATH]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+BASELINE = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+
+REPLY = (
+    "Thanks, that's a clear mission. Let me summarize what I've heard so far: you want to give "
+    "independent dental clinics the same scheduling tools that hospital chains have, starting with "
+    "automatic waitlist backfill for cancelled appointments. Does this capture it?"
+)
+
+# name -> builder returning (operation, is_async); builders run once, outside the timing
+CASES: dict[str, Callable[[], tuple[Callable[[], Any], bool]]] = {}
+
+
+def case(name: str):
+    def register(builder):
+        CASES[name] = builder
+        return builder
+
+    return register
+
+
+@case("langchain_to_chat_message.ai")
+def _ai_message():
+    from langchain_core.messages import AIMessage
+
+    from service.utils import langchain_to_chat_message
+
+    message = AIMessage(content=REPLY, response_metadata={"finish_reason": "stop"})
+    return lambda: langchain_to_chat_message(message), False
+
+
+@case("langchain_to_chat_message.human")
+def _human_message():
+    from langchain_core.messages import HumanMessage
+
+    from service.utils import langchain_to_chat_message
+
+    message = HumanMessage(content="We charge 49 per chair per month.", additional_kwargs={"section_id": "idea"})
+    return lambda: langchain_to_chat_message(message), False
+
+
+@case("convert_message_content_to_string.blocks")
+def _content_blocks():
+    from service.utils import convert_message_content_to_string
+
+    content = [{"type": "text", "text": word + " "} for word in REPLY.split()]
+    return lambda: convert_message_content_to_string(content), False
+
+
+@case("tiptap_to_plain_text")
+def _tiptap_to_plain_text():
+    from integrations.dentapp.dentapp_utils import plain_text_to_tiptap, tiptap_to_plain_text
+
+    document = plain_text_to_tiptap("\n\n".join([REPLY] * 12))
+    return lambda: tiptap_to_plain_text(document), False
+
+
+@case("plain_text_to_tiptap")
+def _plain_text_to_tiptap():
+    from integrations.dentapp.dentapp_utils import plain_text_to_tiptap
+
+    text = "\n\n".join([REPLY] * 12)
+    return lambda: plain_text_to_tiptap(text), False
+
+
+@case("event_processor.add_then_get")
+def _event_processor():
+    from integrations.supabase.event_processor import (
+        EventProcessor,
+        RealtimeEvent,
+        RealtimeEventType,
+    )
+
+    processor = EventProcessor()
+    counter = iter(range(10**12))
+
+    async def add_then_get():
+        # A realtime burst: 20 events queued for one thread, then drained in order
+        for _ in range(20):
+            n = next(counter)
+            await processor.add_event(
+                RealtimeEvent(
+                    event_type=RealtimeEventType.SECTION_STATE_UPDATED,
+                    user_id=1,
+                    thread_id="thread-1",
+                    section_id="mission",
+                    event_id=f"section_state:{n}",
+                    table="section_state",
+                    operation="UPDATE",
+                )
+            )
+        while await processor.get_next_event("thread-1"):
+            pass
+
+    return add_then_get, True
+
+
+@case("get_context.render")
+def _get_context():
+    from agents.founder_buddy.tools import get_context
+
+    founder_data = {"mission_description": "Scheduling for independent clinics", "target_audience": "Dental practices"}
+    arguments = {"user_id": 1, "thread_id": "thread-1", "section_id": "idea", "founder_data": founder_data}
+    return lambda: get_context.ainvoke(arguments), True
+
+
+def _founder_state() -> dict[str, Any]:
+    """Checkpoint channel values of a session in its last section."""
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from agents.founder_buddy.enums import SectionID, SectionStatus
+    from agents.founder_buddy.models import (
+        FounderBuddyData,
+        SectionContent,
+        SectionState,
+        TiptapDocument,
+    )
+    from integrations.dentapp.dentapp_utils import plain_text_to_tiptap
+
+    messages = []
+    for turn in range(12):
+        messages.append(HumanMessage(content=f"Turn {turn}: we help clinics fill cancelled slots.", id=f"h{turn}"))
+        messages.append(AIMessage(content=REPLY, id=f"a{turn}"))
+    section_states = {
+        section.value: SectionState(
+            section_id=section,
+            content=SectionContent(content=TiptapDocument.model_validate(plain_text_to_tiptap(REPLY)), plain_text=REPLY),
+            status=SectionStatus.DONE,
+        )
+        for section in SectionID
+    }
+    return {
+        "messages": messages,
+        "user_id": 1,
+        "thread_id": "3ab280c6-44ee-416d-87f9-73aad616c8ec",
+        "current_section": SectionID.INVEST_PLAN,
+        "section_states": section_states,
+        "founder_data": FounderBuddyData(
+            mission_description="Scheduling for independent clinics",
+            key_features=["waitlist backfill", "reminders", "online booking"],
+            team_members=[{"name": "A", "role": "CEO"}, {"name": "B", "role": "CTO"}],
+            funding_amount="500k",
+        ),
+        "business_plan": "\n\n".join([REPLY] * 20),
+    }
+
+
+@case("checkpoint_serde.dumps")
+def _serde_dumps():
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    serde, state = JsonPlusSerializer(), _founder_state()
+    return lambda: serde.dumps_typed(state), False
+
+
+@case("checkpoint_serde.loads")
+def _serde_loads():
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    serde = JsonPlusSerializer()
+    data = serde.dumps_typed(_founder_state())
+    return lambda: serde.loads_typed(data), False
+
+
+class StubAgent:
+    """Graph stand-in replaying one turn's worth of /stream events."""
+
+    def __init__(self, events: list[tuple[str, Any]], state: Any):
+        self.events = events
+        self.state = state
+
+    async def aget_state(self, config):
+        return self.state
+
+    async def astream(self, **kwargs):
+        for event in self.events:
+            yield event
+
+
+@case("message_generator.turn")
+def _message_generator():
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+    from agents.founder_buddy.enums import SectionID
+    from schema import StreamInput
+    from service import service
+
+    user_input = StreamInput(message="We charge 49 per chair per month.", thread_id="thread-1", user_id=1)
+    history = [HumanMessage(content="Earlier turn"), AIMessage(content=REPLY)]
+    metadata = {"tags": [], "langgraph_node": "generate_reply"}
+    # One turn: a token per word, the decision node's internal call, then the node updates
+    events = [("messages", (AIMessageChunk(content=word + " "), metadata)) for word in REPLY.split()]
+    events.append(("messages", (AIMessageChunk(content="{}"), {"tags": ["internal_decision"]})))
+    reply = AIMessage(content=REPLY)
+    events.append(("updates", {"generate_reply": {"messages": [*history, HumanMessage(content=user_input.message), reply]}}))
+    events.append(("updates", {"generate_decision": {"router_directive": "stay"}}))
+    state = SimpleNamespace(
+        values={"messages": history, "current_section": SectionID.IDEA, "section_states": {}}, tasks=[]
+    )
+    agent = StubAgent(events, state)
+
+    async def turn():
+        with patch.object(service, "get_agent", lambda agent_id: agent):
+            async for _ in service.message_generator(user_input, "founder-buddy"):
+                pass
+
+    return turn, True
+
+
+def reference() -> int:
+    """Fixed interpreter workload (dicts, strings, calls) that calibrates each case."""
+    counts: dict[str, int] = {}
+    for word in REPLY.split():
+        key = word.strip(".,:?").lower()
+        counts[key] = counts.get(key, 0) + len(key)
+    return sum(sorted(counts.values()))
+
+
+class Timer:
+    """Runs an operation in batches sized to about `round_time` seconds."""
+
+    def __init__(self, operation: Callable[[], Any], is_async: bool, round_time: float):
+        self.operation = operation
+        self.is_async = is_async
+        self.round_time = round_time
+        self.number = 0
+
+    async def _timed(self, number: int) -> float:
+        start = time.perf_counter()
+        if self.is_async:
+            for _ in range(number):
+                await self.operation()
+        else:
+            for _ in range(number):
+                self.operation()
+        return time.perf_counter() - start
+
+    async def calibrate(self) -> None:
+        number = 1
+        while (elapsed := await self._timed(number)) < self.round_time / 10:
+            number *= 10
+        self.number = max(1, int(number * self.round_time / max(elapsed, 1e-9)))
+
+    async def round(self) -> float:
+        """Seconds per operation over one batch."""
+        return await self._timed(self.number) / self.number
+
+
+def measure(operation: Callable[[], Any], is_async: bool, rounds: int, round_time: float) -> tuple[float, float]:
+    """
+    Seconds per operation and time relative to the reference workload.
+
+    Reference and case rounds alternate, so each ratio compares two batches
+    run moments apart; the median ratio is robust to the machine speeding up
+    or slowing down during the run.
+    """
+    case, ref = Timer(operation, is_async, round_time), Timer(reference, False, round_time)
+
+    async def run() -> tuple[float, float]:
+        await ref.calibrate()
+        await case.calibrate()
+        seconds, ratios = [], []
+        for _ in range(rounds):
+            ref_seconds = await ref.round()
+            seconds.append(await case.round())
+            ratios.append(seconds[-1] / ref_seconds)
+        return min(seconds), statistics.median(ratios)
+
+    # As timeit does: a collection landing in one round would dominate it
+    gc.collect()
+    gc.disable()
+    try:
+        return asyncio.run(run())
+    finally:
+        gc.enable()
+
+
+def configure_environment() -> None:
+    # No Supabase calls from get_context, quiet logs, a key so settings validate
+    os.environ["SUPABASE_URL"] = ""
+    os.environ["LOG_LEVEL"] = "ERROR"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake-openai-key")
+    sys.path.insert(0, str(SRC))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--round-time", type=float, default=0.1, help="seconds per round")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    configure_environment()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results_us": {}, "relative": {}}
+
+    results: dict[str, float] = {}
+    relative: dict[str, float] = {}
+    regressions = []
+    print(f"{'case':<42} {'us/op':>10} {'x ref':>8} {'baseline':>8} {'change':>8}")
+    for name, builder in CASES.items():
+        if args.filter not in name:
+            continue
+        operation, is_async = builder()
+        seconds, relative[name] = measure(operation, is_async, args.rounds, args.round_time)
+        results[name] = seconds * 1e6
+        previous = baseline["relative"].get(name)
+        change = relative[name] / previous - 1 if previous else None
+        flag = ""
+        if change is not None and change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<42} {results[name]:>10.2f} {relative[name]:>8.1f} {previous or float('nan'):>8.1f}"
+            f" {'' if change is None else f'{change:+.0%}':>8}{flag}"
+        )
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+                    "results_us": dict(sorted({**baseline["results_us"], **results}.items())),
+                    "relative": dict(sorted({**baseline["relative"], **relative}.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} case(s) more than {args.threshold:.0%} slower than baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Load test the service in-process with the fake model.
+
+Starts the FastAPI app under uvicorn in this process (real lifespan, real
+HTTP on a local port) with every model role routed to the fake model and a
+SQLite checkpointer in a temporary directory (or the Postgres database from
+the environment with `--database postgres`). Then `--conversations` founder
+conversations of `--turns` turns each run concurrently through /stream or
+/invoke; each conversation sends its turns one after another, like a user.
+
+The fake model streams its reply one character every `--token-delay`
+seconds, so TTFT and turn latency measure the service's own overhead on top
+of a predictable "provider". Its canned reply never completes a section,
+though; to benchmark full sessions (section transitions, business plan),
+record a cassette once against the real provider and replay it offline
+(see core/llm_cassette.py):
+
+    python benchmarks/bench_load.py --record session.jsonl --conversations 1 --turns 14
+    python benchmarks/bench_load.py --replay session.jsonl --turns 14 [--latency-scale 0.5]
+
+Recording uses the API keys and models from the environment; replaying needs
+neither and reproduces the recorded chunk timing times `--latency-scale`.
+
+The report is JSON (stdout, or `--output`) so runs can be diffed between
+commits:
+- throughput: completed turns per second and errors
+- ttft_ms / turn_ms: p50, p95, p99 and max (TTFT only for /stream: the first
+  token event, or the first message event if no tokens were streamed)
+- checkpoint: writes (put / put_writes calls) per second and per turn
+- event_loop_lag_ms: how late a 10 ms timer fires while the load runs; the
+  load generator shares the loop, so compare runs with the same settings
+
+Usage:
+    python benchmarks/bench_load.py [--conversations 20] [--turns 4]
+        [--endpoint stream|invoke] [--token-delay 0.005]
+        [--database sqlite|postgres] [--output report.json]
+        [--record CASSETTE | --replay CASSETTE [--latency-scale 1.0]]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+# One founder session through the four sections (mission, idea, team & traction,
+# investment plan), confirming each summary so the agent moves on
+SCRIPT = [
+    "Hi, I want to build a business around helping small clinics manage patient bookings.",
+    "Our mission is to give independent clinics the scheduling tools big hospital chains have.",
+    "Yes, that sounds right. Let's continue.",
+    "The idea is a booking app that fills cancelled slots automatically from a waitlist.",
+    "Our first customers would be dental practices with two to five chairs; they lose about 10% of revenue to no-shows.",
+    "Yes, that looks good. Next.",
+    "We are two founders: I ran operations at a dental group and my co-founder built scheduling software.",
+    "We have 12 clinics on a free pilot and 3 have agreed to pay after it ends.",
+    "Yes, that is right. Let's proceed.",
+    "We want to raise 500k to hire two engineers and a salesperson for 18 months.",
+    "We charge 49 per chair per month and expect 150 paying clinics by the end of next year.",
+    "Yes, that captures it. I'm satisfied.",
+    "Please put together the business plan.",
+    "Looks good, thanks. We're done.",
+]
+ROLE_MODELS = {"reply": "fake", "business_plan": "fake", "extraction": "fake", "summarization": "fake"}
+LAG_INTERVAL = 0.01
+
+
+def configure_environment(args: argparse.Namespace, tmp: str) -> None:
+    """Settings are read at import time, so this runs before importing the service."""
+    if args.record:
+        # Real models from the environment, recorded
+        os.environ.update({"LLM_CASSETTE_MODE": "record", "LLM_CASSETTE_PATH": args.record})
+    elif args.replay:
+        # USE_FAKE_MODEL only satisfies the API key check; every call is served from the cassette
+        os.environ.update(
+            {
+                "USE_FAKE_MODEL": "true",
+                "LLM_CASSETTE_MODE": "replay",
+                "LLM_CASSETTE_PATH": args.replay,
+                "LLM_CASSETTE_LATENCY_SCALE": str(args.latency_scale),
+            }
+        )
+    else:
+        os.environ.update(
+            {
+                "USE_FAKE_MODEL": "true",
+                "LLM_ROLE_MODELS": json.dumps(ROLE_MODELS),
+                "FAKE_MODEL_TOKEN_DELAY": str(args.token_delay),
+                "LLM_CASSETTE_MODE": "off",
+            }
+        )
+    os.environ.update(
+        {
+            "DATABASE_TYPE": args.database,
+            "SQLITE_DB_PATH": os.path.join(tmp, "checkpoints.db"),
+            "JOBS_SQLITE_PATH": os.path.join(tmp, "jobs.db"),
+            "REQUEST_LOG_SAMPLE_RATE": "0",
+            "LOG_LEVEL": "WARNING",
+            "LANGFUSE_TRACING": "false",
+            "USE_SUPABASE_REALTIME": "false",
+            "ADMISSION_CONTROL_ENABLED": "false",
+        }
+    )
+    for name in ("LLM_HEDGE_MODEL", "LLM_CACHE_ENABLED", "AUTH_SECRET", "PROMETHEUS_MULTIPROC_DIR"):
+        os.environ.pop(name, None)
+    sys.path.insert(0, str(SRC))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """p50/p95/p99/max in milliseconds (nearest rank)."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))] * 1000
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99), "max": ordered[-1] * 1000}
+
+
+def checkpoint_writes() -> float:
+    """put / put_writes calls recorded by the instrumented checkpointer so far."""
+    from prometheus_client import REGISTRY
+
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect()
+        if metric.name == "founder_buddy_external_call_duration_seconds"
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+        and sample.labels["service"] == "checkpointer"
+        and sample.labels["operation"] in ("put", "aput", "put_writes", "aput_writes")
+    )
+
+
+class LagMonitor:
+    """Samples how late a short asyncio timer fires (event-loop lag)."""
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class Results:
+    def __init__(self):
+        self.ttft: list[float] = []
+        self.turns: list[float] = []
+        self.errors: list[str] = []
+
+
+async def stream_turn(client: httpx.AsyncClient, payload: dict, results: Results) -> str | None:
+    """One /stream turn; returns the thread ID from the metadata event."""
+    start = time.perf_counter()
+    thread_id = payload.get("thread_id")
+    first_output = None
+    async with client.stream("POST", "/stream", json=payload) as response:
+        if response.status_code != 200:
+            results.errors.append(f"HTTP {response.status_code}")
+            return thread_id
+        async for line in response.aiter_lines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            event = json.loads(line[len("data: ") :])
+            if event["type"] == "metadata":
+                thread_id = event["content"]["thread_id"]
+            elif event["type"] in ("token", "message") and first_output is None:
+                first_output = time.perf_counter() - start
+            elif event["type"] == "error":
+                results.errors.append(str(event["content"]))
+                return thread_id
+    if first_output is None:
+        results.errors.append("no output")
+        return thread_id
+    results.ttft.append(first_output)
+    results.turns.append(time.perf_counter() - start)
+    return thread_id
+
+
+async def invoke_turn(client: httpx.AsyncClient, payload: dict, results: Results) -> str | None:
+    """One /invoke turn; returns the thread ID from the response."""
+    start = time.perf_counter()
+    response = await client.post("/invoke", json=payload)
+    if response.status_code != 200:
+        results.errors.append(f"HTTP {response.status_code}")
+        return payload.get("thread_id")
+    results.turns.append(time.perf_counter() - start)
+    return response.json()["thread_id"]
+
+
+async def conversation(client: httpx.AsyncClient, index: int, turns: int, endpoint: str, results: Results) -> None:
+    thread_id = None
+    run_turn = stream_turn if endpoint == "stream" else invoke_turn
+    for turn in range(turns):
+        payload = {"message": SCRIPT[turn % len(SCRIPT)], "user_id": 1000 + index}
+        if thread_id:
+            payload["thread_id"] = thread_id
+        try:
+            thread_id = await run_turn(client, payload, results)
+        except httpx.HTTPError as e:
+            results.errors.append(type(e).__name__)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import uvicorn
+
+    from service import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()  # startup failed: raise its error
+        await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=args.conversations, max_keepalive_connections=args.conversations)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120.0) as client:
+            # Warm up: compile the graph and open the checkpointer before measuring (not
+            # while recording, where it would add a second answer to the first prompt)
+            if not args.record:
+                await conversation(client, -1, 1, args.endpoint, Results())
+
+            results = Results()
+            lag = LagMonitor()
+            writes_before = checkpoint_writes()
+            lag.start()
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(conversation(client, index, args.turns, args.endpoint, results) for index in range(args.conversations))
+            )
+            elapsed = time.perf_counter() - start
+            await lag.stop()
+            writes = checkpoint_writes() - writes_before
+    finally:
+        server.should_exit = True
+        await serving
+
+    completed = len(results.turns)
+    return {
+        "config": {
+            "endpoint": args.endpoint,
+            "conversations": args.conversations,
+            "turns": args.turns,
+            "model": "record" if args.record else "replay" if args.replay else "fake",
+            "token_delay_s": args.token_delay if not (args.record or args.replay) else None,
+            "cassette": args.record or args.replay,
+            "latency_scale": args.latency_scale if args.replay else None,
+            "database": args.database,
+        },
+        "environment": {"commit": git_commit(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "duration_s": elapsed,
+        "throughput": {
+            "turns": completed,
+            "errors": len(results.errors),
+            "turns_per_s": completed / elapsed if elapsed else 0.0,
+        },
+        "ttft_ms": percentiles(results.ttft) if args.endpoint == "stream" else None,
+        "turn_ms": percentiles(results.turns),
+        "checkpoint": {
+            "writes": writes,
+            "writes_per_s": writes / elapsed if elapsed else 0.0,
+            "writes_per_turn": writes / completed if completed else None,
+        },
+        "event_loop_lag_ms": percentiles(lag.samples),
+        "error_samples": sorted(set(results.errors))[:10],
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=20, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=4, help="turns per conversation")
+    parser.add_argument("--endpoint", choices=["stream", "invoke"], default="stream")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="fake model seconds per character")
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE", help="call the real models and record them here")
+    cassette.add_argument("--replay", metavar="CASSETTE", help="serve every LLM call from this recording")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier on replayed delays")
+    args = parser.parse_args()
+    for name in ("record", "replay"):
+        if getattr(args, name):
+            setattr(args, name, str(Path(getattr(args, name)).resolve()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(args, tmp)
+        report = asyncio.run(run(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
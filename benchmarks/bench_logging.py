@@ -0,0 +1,135 @@
+"""
+Benchmark CPU time spent in logging per request.
+
+Replays the log calls a /stream request makes on its hot paths
+(get_context DATABASE_DEBUG lines, the generate_reply reload lines and one
+RAW_MESSAGE line per streamed message) in two configurations:
+
+- before: synchronous StreamHandler, eager f-strings at INFO
+- after:  setup_logging() queue handler, lazy %-args, hot-path lines at DEBUG
+
+CPU time is measured with time.thread_time() in the calling thread, i.e. the
+time the event loop would be blocked. Output is written to a temporary file
+so real formatting and I/O happen.
+
+Usage:
+    python benchmarks/bench_logging.py [--requests 500] [--messages 30]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from core import logging_config  # noqa: E402
+
+SECTION_ID = "mission"
+USER_ID = 1
+THREAD_ID = "847c6285-8fc9-4560-a83f-4e6285809254"
+PLAN = "# Business plan\n" + "Lorem ipsum dolor sit amet. " * 300
+
+
+def build_messages(count: int) -> list:
+    return [
+        (HumanMessage if i % 2 else AIMessage)(content=f"Message {i}: " + "founder story " * 150)
+        for i in range(count)
+    ]
+
+
+def request_before(service_log: logging.Logger, node_log: logging.Logger, messages: list) -> None:
+    node_log.info("=== DATABASE_DEBUG: get_context() ENTRY ===")
+    node_log.info(f"DATABASE_DEBUG: Section: {SECTION_ID}, User: {USER_ID}, Thread: {THREAD_ID}")
+    node_log.info(f"DATABASE_DEBUG: Final status: in_progress, draft: {bool(PLAN)}")
+    node_log.info("=== DATABASE_DEBUG: get_context() EXIT ===")
+    node_log.info(f"🔄 Generate reply: user_id={USER_ID}, thread_id={THREAD_ID}")
+    node_log.info(f"🔄 Generate reply: latest_content length={len(PLAN)}, current length={len(PLAN)}")
+    node_log.info(f"🔄 Generate reply: Business plan already in sync (length: {len(PLAN)})")
+    for message in messages:
+        service_log.info(f"🪵 RAW_MESSAGE: {repr(message)}")
+        service_log.info(f"🔧 CONVERTING message type: {type(message).__name__}")
+
+
+def request_after(service_log: logging.Logger, node_log: logging.Logger, messages: list) -> None:
+    node_log.debug(
+        "DATABASE_DEBUG: get_context() ENTRY section=%s user=%s thread=%s founder_data=%s",
+        SECTION_ID, USER_ID, THREAD_ID, True,
+    )
+    node_log.debug("DATABASE_DEBUG: get_context() EXIT status=%s draft=%s", "in_progress", bool(PLAN))
+    node_log.debug("🔄 Generate reply: user_id=%s, thread_id=%s", USER_ID, THREAD_ID)
+    node_log.debug("🔄 Generate reply: latest_content length=%d, current length=%d", len(PLAN), len(PLAN))
+    node_log.debug("🔄 Generate reply: Business plan already in sync (length: %d)", len(PLAN))
+    for message in messages:
+        service_log.debug("🪵 RAW_MESSAGE: %r", message)
+        service_log.debug("🔧 CONVERTING message type: %s", type(message).__name__)
+    # One INFO line per request still goes through the queue
+    node_log.info("[HTTP] POST /stream status=%d duration_ms=%.1f", 200, 812.4)
+
+
+def reset_root() -> logging.Logger:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.INFO)
+    return root
+
+
+def measure(fn, service_log, node_log, messages, requests: int) -> float:
+    """Return mean caller-thread CPU microseconds per request."""
+    for _ in range(20):
+        fn(service_log, node_log, messages)
+    start = time.thread_time()
+    for _ in range(requests):
+        fn(service_log, node_log, messages)
+    return (time.thread_time() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=30)
+    args = parser.parse_args()
+    messages = build_messages(args.messages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # before: the previous basicConfig setup, stream logger left at INFO
+        root = reset_root()
+        before_file = open(os.path.join(tmp, "before.log"), "w")
+        handler = logging.StreamHandler(before_file)
+        handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+        root.addHandler(handler)
+        before = measure(
+            request_before, logging.getLogger("bench.service"), logging.getLogger("bench.node"),
+            messages, args.requests,
+        )
+        before_file.close()
+
+        # after: queue-backed setup_logging()
+        reset_root()
+        after_file = open(os.path.join(tmp, "after.log"), "w")
+        sys.stderr, real_stderr = after_file, sys.stderr
+        try:
+            logging_config._configured = False
+            logging_config.setup_logging()
+        finally:
+            sys.stderr = real_stderr
+        after = measure(
+            request_after, logging.getLogger("bench.service"), logging.getLogger("bench.node"),
+            messages, args.requests,
+        )
+        logging_config.shutdown_logging()
+        after_file.close()
+
+    print(f"caller CPU per request, {args.messages} messages")
+    print(f"  before: {before:9.1f} us")
+    print(f"  after:  {after:9.1f} us  ({after / before:.1%} of before)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark realtime event dispatch with many idle subscriptions, and
+EventProcessor queues under bursts of events for one thread.
+
+A RealtimeWorker is subscribed to `--subscriptions` threads (no Supabase
+connection; the sync service is a stub that records when it is called) and
+two things are measured for each dispatch mode:
+
+- idle CPU: process CPU time while no events arrive, as a share of one core
+- delivery latency: from EventProcessor.add_event() to the sync service,
+  for `--events` events sent one at a time to random threads
+
+Modes:
+
+- poll:  the former RealtimeWorker loop, waking every 100 ms and asking each
+         subscribed thread's queue for an event
+- event: the worker's consumer tasks, woken by add_event()
+
+The burst benchmark queues `--burst` events for one thread (timestamps a
+millisecond apart with a few milliseconds of jitter, like editor autosaves
+arriving slightly out of order) and then drains them in order, comparing:
+
+- list: the former queue, re-sorted on every add and popped from the front
+- heap: EventProcessor's per-thread heap
+
+Usage:
+    python benchmarks/bench_realtime.py [--subscriptions 10000] [--idle 2]
+        [--events 200] [--burst 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+async def poll_loop(worker) -> None:
+    """The dispatch loop RealtimeWorker used before event-driven consumers."""
+    while True:
+        for thread_id in list(worker.subscriptions.keys()):
+            event = await worker.processor.get_next_event(thread_id)
+            if event:
+                await worker.sync_service.process_event(event)
+        await asyncio.sleep(0.1)
+
+
+async def run_burst(queue: str, size: int) -> dict[str, float]:
+    from integrations.supabase.event_processor import (
+        EventProcessor,
+        RealtimeEvent,
+        RealtimeEventType,
+    )
+
+    class ListEventProcessor(EventProcessor):
+        """The per-thread queue EventProcessor used before heaps."""
+
+        def __init__(self):
+            super().__init__()
+            self.locks = defaultdict(asyncio.Lock)
+
+        async def add_event(self, event) -> bool:
+            if not self.validate_event(event) or self.is_duplicate(event):
+                return False
+            async with self.locks[event.thread_id]:
+                self.event_queues[event.thread_id].append(event)
+                self.event_queues[event.thread_id].sort(key=lambda e: e.timestamp)
+            return True
+
+        async def get_next_event(self, thread_id):
+            async with self.locks[thread_id]:
+                if not self.event_queues[thread_id]:
+                    return None
+                return self.event_queues[thread_id].pop(0)
+
+    processor = ListEventProcessor() if queue == "list" else EventProcessor()
+    start = datetime(2026, 1, 1)
+    events = [
+        RealtimeEvent(
+            event_type=RealtimeEventType.BUSINESS_PLAN_UPDATED,
+            user_id=1,
+            thread_id="thread-0",
+            timestamp=start + timedelta(milliseconds=i + random.uniform(-5, 5)),
+            event_id=f"event-{i}",
+            table="business_plans",
+            operation="UPDATE",
+        )
+        for i in range(size)
+    ]
+
+    begin = time.perf_counter()
+    for event in events:
+        await processor.add_event(event)
+    added = time.perf_counter()
+    drained = []
+    while (event := await processor.get_next_event("thread-0")) is not None:
+        drained.append(event)
+    end = time.perf_counter()
+
+    assert [event.timestamp for event in drained] == sorted(event.timestamp for event in events)
+    return {"add_ms": (added - begin) * 1000, "drain_ms": (end - added) * 1000}
+
+
+async def run_mode(mode: str, subscriptions: int, idle: float, events: int) -> dict[str, float]:
+    from integrations.supabase.event_processor import (
+        EventProcessor,
+        RealtimeEvent,
+        RealtimeEventType,
+    )
+    from integrations.supabase.realtime_worker import RealtimeWorker
+
+    delivered: dict[str, float] = {}
+    arrived = asyncio.Event()
+
+    class StubSyncService:
+        async def process_event(self, event) -> bool:
+            delivered[event.event_id] = time.perf_counter()
+            arrived.set()
+            return True
+
+    worker = RealtimeWorker()
+    worker.processor = EventProcessor()
+    worker.sync_service = StubSyncService()
+    worker.subscriptions = {f"thread-{i}": {} for i in range(subscriptions)}
+    if mode == "poll":
+        tasks = [asyncio.create_task(poll_loop(worker))]
+    else:
+        tasks = [asyncio.create_task(worker._consume_events()) for _ in range(4)]
+
+    await asyncio.sleep(0.2)
+    cpu = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = (time.process_time() - cpu) / idle
+
+    latencies = []
+    for i in range(events):
+        event = RealtimeEvent(
+            event_type=RealtimeEventType.BUSINESS_PLAN_UPDATED,
+            user_id=1,
+            thread_id=f"thread-{random.randrange(subscriptions)}",
+            timestamp=datetime.now(),
+            event_id=f"event-{i}",
+            table="business_plans",
+            operation="UPDATE",
+        )
+        arrived.clear()
+        sent = time.perf_counter()
+        await worker.processor.add_event(event)
+        await asyncio.wait_for(arrived.wait(), timeout=5)
+        latencies.append((delivered[event.event_id] - sent) * 1000)
+        await asyncio.sleep(random.uniform(0, 0.01))
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    latencies.sort()
+    return {
+        "idle_cpu": idle_cpu,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscriptions", type=int, default=10_000)
+    parser.add_argument("--idle", type=float, default=2.0, help="seconds measured without events")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", default=["poll", "event"], choices=["poll", "event"])
+    parser.add_argument("--burst", type=int, default=10_000, help="events per burst, 0 to skip")
+    args = parser.parse_args()
+
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake-openai-key")
+    sys.path.insert(0, str(SRC))
+
+    print(f"{args.subscriptions} subscriptions, {args.idle:g}s idle, {args.events} events")
+    print(f"{'mode':<6} {'idle CPU':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        result = asyncio.run(run_mode(mode, args.subscriptions, args.idle, args.events))
+        print(f"{mode:<6} {result['idle_cpu']:>9.1%} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f}")
+
+    if args.burst:
+        print(f"\nBurst of {args.burst} events for one thread")
+        print(f"{'queue':<6} {'add ms':>9} {'drain ms':>9} {'us/event':>9}")
+        for queue in ("list", "heap"):
+            result = asyncio.run(run_burst(queue, args.burst))
+            per_event = (result["add_ms"] + result["drain_ms"]) * 1000 / args.burst
+            print(f"{queue:<6} {result['add_ms']:>9.1f} {result['drain_ms']:>9.1f} {per_event:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark request logging middleware overhead.
+
+Compares throughput of a trivial FastAPI app with:
+- no logging middleware
+- the previous BaseHTTPMiddleware implementation (reproduced below)
+- RequestLoggingMiddleware at full and 10% sampling
+
+Requests are driven in-process through httpx.ASGITransport, so the numbers
+measure middleware cost only (no sockets). Log output goes to a NullHandler.
+
+Usage:
+    python benchmarks/bench_request_logging.py [--requests 2000] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from service.middleware import RequestLoggingMiddleware, mask_sensitive_fields  # noqa: E402
+
+legacy_logger = logging.getLogger("bench.legacy")
+
+PAYLOAD = {
+    "message": "Tell me about my startup idea " * 20,
+    "thread_id": "847c6285-8fc9-4560-a83f-4e6285809254",
+    "user_id": 1,
+    "agent_config": {"api_key": "secret"},
+}
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI middleware: ~10 INFO lines, buffered and re-parsed bodies."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid4())[:8]
+        start_time = time.time()
+        legacy_logger.info(f"=== FRONTEND_REQUEST_START: {request_id} ===")
+        legacy_logger.info(f"FRONTEND_REQUEST: {request.method} {request.url}")
+        legacy_logger.info(f"FRONTEND_REQUEST: Client IP: {request.client.host if request.client else 'unknown'}")
+        legacy_logger.info(f"FRONTEND_REQUEST: User-Agent: {request.headers.get('user-agent', 'unknown')}")
+        legacy_logger.info(f"FRONTEND_REQUEST: Content-Type: {request.headers.get('content-type', 'unknown')}")
+        sensitive_headers = {"authorization", "cookie", "x-api-key"}
+        headers_to_log = {k: v for k, v in request.headers.items() if k.lower() not in sensitive_headers}
+        legacy_logger.info(f"FRONTEND_REQUEST: Headers: {headers_to_log}")
+        if request.query_params:
+            legacy_logger.info(f"FRONTEND_REQUEST: Query params: {dict(request.query_params)}")
+        if request.method in ["POST", "PUT", "PATCH"] and "/stream" not in str(request.url.path):
+            body = await request.body()
+            if body:
+                masked_body = mask_sensitive_fields(json.loads(body.decode("utf-8")))
+                legacy_logger.info(f"FRONTEND_REQUEST: Body (JSON): {json.dumps(masked_body, ensure_ascii=False)}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        legacy_logger.info(f"=== FRONTEND_RESPONSE_END: {request_id} ===")
+        legacy_logger.info(f"FRONTEND_RESPONSE: Status: {response.status_code}")
+        legacy_logger.info(f"FRONTEND_RESPONSE: Processing time: {process_time:.3f}s")
+        legacy_logger.info(f"FRONTEND_RESPONSE: Content-Type: {response.headers.get('content-type', 'unknown')}")
+        return response
+
+
+def build_app(middleware: type | None, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/invoke")
+    async def invoke(payload: dict) -> dict:
+        return {"type": "ai", "content": "ok"}
+
+    if middleware is not None:
+        app.add_middleware(middleware, **kwargs)
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Send `requests` POSTs with bounded concurrency and return requests/second."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.post("/invoke", json=PAYLOAD)
+                response.raise_for_status()
+
+        # Warm up routing, pydantic and the client pool
+        await asyncio.gather(*(one() for _ in range(min(100, requests))))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    # Emit records at INFO so formatting cost is included, but discard the output
+    root = logging.getLogger()
+    root.handlers = [logging.NullHandler()]
+    root.setLevel(logging.INFO)
+    logging.getLogger("service.middleware").setLevel(logging.INFO)
+
+    variants = {
+        "no middleware": build_app(None),
+        "legacy BaseHTTPMiddleware": build_app(LegacyRequestLoggingMiddleware),
+        "asgi, sample_rate=1.0": build_app(RequestLoggingMiddleware),
+        "asgi, sample_rate=1.0, log_body": build_app(RequestLoggingMiddleware, log_body=True),
+        "asgi, sample_rate=0.1": build_app(RequestLoggingMiddleware, sample_rate=0.1),
+    }
+
+    baseline = None
+    print(f"{'variant':<36} {'req/s':>10} {'vs none':>9}")
+    for name, app in variants.items():
+        rps = asyncio.run(run(app, args.requests, args.concurrency))
+        baseline = baseline or rps
+        print(f"{name:<36} {rps:>10.0f} {rps / baseline:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
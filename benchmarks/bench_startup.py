@@ -0,0 +1,82 @@
+"""
+Benchmark service startup: import time and RSS of `service.service`, plus
+the time to compile the default agent graph (done in the lifespan when
+PRELOAD_AGENTS includes it, otherwise on the first request).
+
+Each sample runs in a fresh interpreter so nothing is cached in-process
+(the OS page cache still warms up after the first run, so the first sample
+is discarded). Also reports which LLM provider packages were imported.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--module service.service]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+PROVIDER_PACKAGES = (
+    "langchain_anthropic",
+    "langchain_aws",
+    "langchain_google_genai",
+    "langchain_google_vertexai",
+    "langchain_groq",
+    "langchain_ollama",
+    "langchain_openai",
+)
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+providers = sorted(name for name in {providers!r} if name in sys.modules)
+from agents import DEFAULT_AGENT, get_agent
+start = time.perf_counter()
+get_agent(DEFAULT_AGENT)
+compile_s = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": elapsed,
+    "compile_s": compile_s,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "providers": providers,
+}}))
+"""
+
+
+def sample(module: str) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    env.setdefault("OPENAI_API_KEY", "sk-fake-openai-key")
+    code = PROBE.format(module=module, providers=PROVIDER_PACKAGES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="service.service")
+    args = parser.parse_args()
+
+    sample(args.module)  # warm the page cache
+    samples = [sample(args.module) for _ in range(args.runs)]
+
+    print(f"import {args.module} ({args.runs} runs, median)")
+    print(f"  import time: {statistics.median(s['import_s'] for s in samples):.2f} s")
+    print(f"  compile:     {statistics.median(s['compile_s'] for s in samples) * 1000:.0f} ms (default agent)")
+    print(f"  max RSS:     {statistics.median(s['max_rss_mb'] for s in samples):.0f} MB")
+    print(f"  modules:     {statistics.median(s['modules'] for s in samples):.0f}")
+    print(f"  providers:   {', '.join(samples[-1]['providers']) or '(none)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark throughput scaling of the service from 1 to N uvicorn workers.
+
+For each worker count the service is started through run_service.py (so the
+multi-worker checks, SQLite store and Prometheus multiprocess setup are the
+real ones), the script waits for /ready, then drives `--path` with
+`--concurrency` keep-alive clients for `--duration` seconds.
+
+Scaling efficiency is rps(N) / (N * rps(1)). The load generator runs in this
+process, so it needs spare cores: on a machine with C cores, results past
+roughly C - 1 workers measure the generator, not the service.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4 8] [--path /info]
+        [--concurrency 64] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(workers: int, port: int, tmp: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SRC),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WORKERS": str(workers),
+        "DATABASE_TYPE": "sqlite",
+        "SQLITE_DB_PATH": os.path.join(tmp, f"checkpoints-{workers}.db"),
+        "REQUEST_LOG_SAMPLE_RATE": "0",
+        "LOG_LEVEL": "WARNING",
+    }
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    env.setdefault("OPENAI_API_KEY", "sk-fake-openai-key")
+    return subprocess.Popen(
+        [sys.executable, str(SRC / "run_service.py")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 180.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"service at {base_url} not ready after {timeout}s")
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def stop_service(process: subprocess.Popen) -> None:
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--path", default="/info")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.concurrency} clients, {args.duration:.0f}s per run, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'efficiency':>10}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            port = free_port()
+            process = start_service(workers, port, tmp)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_ready(base_url)
+                asyncio.run(drive(base_url, args.path, args.concurrency, 1.0))  # warm connections
+                result = asyncio.run(drive(base_url, args.path, args.concurrency, args.duration))
+            finally:
+                stop_service(process)
+            if baseline is None:
+                baseline = result["rps"] / workers
+            efficiency = result["rps"] / (workers * baseline)
+            print(
+                f"{workers:>7} {result['rps']:>9.0f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+                f" {result['errors']:>7} {efficiency:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
-from .agents import DEFAULT_AGENT, AgentGraph, get_agent, get_all_agent_info
+from .agents import DEFAULT_AGENT, AgentGraph, configure_agents, get_agent, get_all_agent_info
 
-__all__ = ["get_agent", "get_all_agent_info", "DEFAULT_AGENT", "AgentGraph"]
+__all__ = ["get_agent", "get_all_agent_info", "configure_agents", "DEFAULT_AGENT", "AgentGraph"]
@@ -1,11 +1,17 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from typing import Any
 
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.pregel import Pregel
 
-from .founder_buddy.agent import graph as founder_buddy_agent
 from schema import AgentInfo
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_AGENT = "founder-buddy"
 
 # Type alias to handle LangGraph's different agent patterns
@@ -16,20 +22,76 @@ AgentGraph = CompiledStateGraph | Pregel
 
 @dataclass
 class Agent:
+    """
+    Registry entry for an agent.
+
+    Either pass a ready `graph`, or a `build(checkpointer, store)` callable that
+    imports and compiles the graph on first use (see get_agent()).
+    """
+
     description: str
-    graph: AgentGraph
+    graph: AgentGraph | None = None
+    build: Callable[[Any, Any], AgentGraph] | None = None
+
+
+def _build_founder_buddy(checkpointer: Any, store: Any) -> AgentGraph:
+    from .founder_buddy.graph import build_founder_buddy_graph
+
+    return build_founder_buddy_graph(checkpointer=checkpointer, store=store)
 
 
 agents: dict[str, Agent] = {
     "founder-buddy": Agent(
         description="A Founder Buddy agent that helps entrepreneurs validate and refine their startup ideas through structured conversations about mission, idea, team traction, and investment plan",
-        graph=founder_buddy_agent,
+        build=_build_founder_buddy,
     ),
 }
 
+# Memory components set by configure_agents() in the service lifespan.
+# Graphs compiled before that (scripts, tests) fall back to an in-memory saver.
+_checkpointer: Any = None
+_store: Any = None
+_compile_lock = threading.Lock()
+
+
+def _compile(agent_id: str, agent: Agent) -> AgentGraph:
+    with _compile_lock:
+        if agent.graph is not None:
+            return agent.graph
+        start = time.perf_counter()
+        agent.graph = agent.build(_checkpointer, _store)
+        logger.info(f"🧩 Compiled agent '{agent_id}' in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return agent.graph
+
 
 def get_agent(agent_id: str) -> AgentGraph:
-    return agents[agent_id].graph
+    agent = agents[agent_id]
+    if agent.graph is None:
+        return _compile(agent_id, agent)
+    return agent.graph
+
+
+def configure_agents(checkpointer: Any, store: Any, preload: Iterable[str] = ()) -> None:
+    """
+    Attach the service's checkpointer and store to every agent.
+
+    Graphs already compiled get the new components assigned; the rest are
+    compiled with them on first get_agent() call, or right away if listed
+    in `preload`.
+
+    Args:
+        checkpointer: Checkpoint saver for thread-scoped memory
+        store: Store for long-term memory
+        preload: Agent IDs to compile now instead of on first request
+    """
+    global _checkpointer, _store
+    _checkpointer, _store = checkpointer, store
+    for agent_id, agent in agents.items():
+        if agent.graph is not None:
+            agent.graph.checkpointer = checkpointer
+            agent.graph.store = store
+    for agent_id in preload:
+        get_agent(agent_id)
 
 
 def get_all_agent_info() -> list[AgentInfo]:
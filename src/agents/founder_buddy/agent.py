@@ -6,15 +6,11 @@ import uuid
 from langchain_core.messages import BaseMessage
 
 from .enums import RouterDirective, SectionID
-from .graph import build_founder_buddy_graph
 from .models import ContextPacket, FounderBuddyData, FounderBuddyState
 from .tools import get_context
 
 logger = logging.getLogger(__name__)
 
-# Create the runnable graph
-graph = build_founder_buddy_graph()
-
 
 async def initialize_founder_buddy_state(user_id: int = None, thread_id: str = None) -> FounderBuddyState:
     """Initialize a new Founder Buddy state.
@@ -65,7 +61,6 @@ async def initialize_founder_buddy_state(user_id: int = None, thread_id: str = N
 
 
 __all__ = [
-    "graph",
     "initialize_founder_buddy_state",
 ]
 
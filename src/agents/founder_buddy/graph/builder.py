@@ -4,6 +4,8 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 
+from core.metrics import instrument_node
+
 from ..models import FounderBuddyState
 from ..nodes import (
     generate_business_plan_node,
@@ -16,17 +18,26 @@ from ..nodes import (
 from .routes import route_after_memory_updater, route_decision
 
 
-def build_founder_buddy_graph():
-    """Build the Founder Buddy agent graph."""
+def build_founder_buddy_graph(checkpointer=None, store=None):
+    """Build and compile the Founder Buddy agent graph.
+
+    Args:
+        checkpointer: Checkpoint saver to compile with (in-memory saver if None)
+        store: Optional long-term memory store
+    """
     graph = StateGraph(FounderBuddyState)
     
-    # Add nodes
-    graph.add_node("initialize", initialize_node)
-    graph.add_node("router", router_node)
-    graph.add_node("generate_reply", generate_reply_node)
-    graph.add_node("generate_decision", generate_decision_node)
-    graph.add_node("memory_updater", memory_updater_node)
-    graph.add_node("generate_business_plan", generate_business_plan_node)
+    # Add nodes (each wrapped with latency/error metrics)
+    nodes = {
+        "initialize": initialize_node,
+        "router": router_node,
+        "generate_reply": generate_reply_node,
+        "generate_decision": generate_decision_node,
+        "memory_updater": memory_updater_node,
+        "generate_business_plan": generate_business_plan_node,
+    }
+    for name, node in nodes.items():
+        graph.add_node(name, instrument_node(name, node))
     
     # Add edges
     graph.add_edge(START, "initialize")
@@ -59,7 +70,6 @@ def build_founder_buddy_graph():
     # Business plan generation ends the conversation
     graph.add_edge("generate_business_plan", END)
     
-    # Compile with memory checkpointer
-    memory = MemorySaver()
-    return graph.compile(checkpointer=memory)
+    # Compile with the service's checkpointer, or an in-memory one for standalone use
+    return graph.compile(checkpointer=checkpointer or MemorySaver(), store=store)
 
@@ -43,6 +43,7 @@ class SectionState(BaseModel):
     content: SectionContent | None = None
     satisfaction_status: str | None = None  # satisfied, needs_improvement, or None
     status: SectionStatus = SectionStatus.PENDING
+    content_hash: str | None = None  # Hash of plain text, compared against section_states.content_hash
 
 
 class ContextPacket(BaseModel):
@@ -172,6 +173,7 @@ class FounderBuddyState(MessagesState):
     
     # Business plan
     business_plan: str | None = None
+    business_plan_hash: str | None = None  # Compared against business_plans.content_hash
     should_generate_business_plan: bool = False
 
 
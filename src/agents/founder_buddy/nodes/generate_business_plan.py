@@ -1,44 +1,21 @@
 """Generate business plan node for Founder Buddy Agent."""
 
 import logging
+import re
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from core.llm import get_model
+from core.llm import LLMPriority, invoke_llm
+from core.models import ModelRole
+from integrations.supabase.content_hash import compute_content_hash
 
 from ..enums import SectionStatus
 from ..models import FounderBuddyState
 
 logger = logging.getLogger(__name__)
 
-
-async def generate_business_plan_node(state: FounderBuddyState | dict, config: RunnableConfig) -> FounderBuddyState | dict:
-    """
-    Generate a comprehensive business plan document from all collected data.
-    
-    This node is called when all sections are complete to create a final summary document.
-    """
-    logger.info("Generating business plan document")
-    
-    # Handle both dict and FounderBuddyState types
-    if isinstance(state, dict):
-        messages = state.get("messages", [])
-        founder_data = state.get("founder_data", {})
-    else:
-        messages = state.get("messages", [])
-        founder_data = state.get("founder_data", {})
-    
-    # Extract conversation history as text
-    conversation_text = ""
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            conversation_text += f"User: {msg.content}\n\n"
-        elif isinstance(msg, AIMessage):
-            conversation_text += f"AI: {msg.content}\n\n"
-    
-    # Create business plan generation prompt
-    system_prompt = """You are a professional business plan writer helping founders create a comprehensive business plan document.
+BUSINESS_PLAN_PROMPT = """You are a professional business plan writer helping founders create a comprehensive business plan document.
 
 Based on the complete conversation history, create a well-structured business plan document in English that includes:
 
@@ -82,6 +59,37 @@ Requirements:
 - Use professional but accessible language
 - Ensure all information comes from the conversation content"""
 
+# "## " headings the plan is asked for; background jobs report progress against them
+BUSINESS_PLAN_SECTIONS = tuple(re.findall(r"^## (.+)$", BUSINESS_PLAN_PROMPT, re.MULTILINE))
+
+
+async def generate_business_plan_node(state: FounderBuddyState | dict, config: RunnableConfig) -> FounderBuddyState | dict:
+    """
+    Generate a comprehensive business plan document from all collected data.
+    
+    This node is called when all sections are complete to create a final summary document.
+    """
+    logger.info("Generating business plan document")
+    
+    # Handle both dict and FounderBuddyState types
+    if isinstance(state, dict):
+        messages = state.get("messages", [])
+        founder_data = state.get("founder_data", {})
+    else:
+        messages = state.get("messages", [])
+        founder_data = state.get("founder_data", {})
+    
+    # Extract conversation history as text
+    conversation_text = ""
+    for msg in messages:
+        if isinstance(msg, HumanMessage):
+            conversation_text += f"User: {msg.content}\n\n"
+        elif isinstance(msg, AIMessage):
+            conversation_text += f"AI: {msg.content}\n\n"
+    
+    # Create business plan generation prompt
+    system_prompt = BUSINESS_PLAN_PROMPT
+
     messages_for_llm = [
         SystemMessage(content=system_prompt),
         SystemMessage(content=f"""
@@ -93,14 +101,19 @@ Please generate a complete business plan based on the above conversation content
 """)
     ]
     
-    # Generate business plan
-    llm = get_model()
-    response = await llm.ainvoke(messages_for_llm)
+    # Generate business plan (long and not token-streamed, so background priority)
+    response = await invoke_llm(
+        messages_for_llm,
+        user_id=state.get("user_id"),
+        priority=LLMPriority.BACKGROUND,
+        role=ModelRole.BUSINESS_PLAN,
+    )
     
     business_plan_content = response.content if hasattr(response, 'content') else str(response)
     
     # Add business plan to state
     state["business_plan"] = business_plan_content
+    state["business_plan_hash"] = compute_content_hash(business_plan_content)
     
     # Save to Supabase database
     try:
@@ -5,7 +5,9 @@ import logging
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from core.llm import get_model
+from core.llm import LLMPriority, invoke_llm
+from core.models import ModelRole
+from integrations.supabase.content_hash import compute_content_hash
 
 from ..enums import SectionStatus
 from ..models import FounderBuddyState
@@ -27,7 +29,7 @@ async def generate_reply_node(state: FounderBuddyState, config: RunnableConfig)
     # This ensures Agent sees the latest changes made by the user
     try:
         from core.settings import settings
-        logger.info(f"🔄 Generate reply: Checking USE_SUPABASE_REALTIME={settings.USE_SUPABASE_REALTIME}")
+        logger.debug("🔄 Generate reply: Checking USE_SUPABASE_REALTIME=%s", settings.USE_SUPABASE_REALTIME)
         
         if settings.USE_SUPABASE_REALTIME:
             from integrations.supabase import SupabaseClient
@@ -63,12 +65,12 @@ async def generate_reply_node(state: FounderBuddyState, config: RunnableConfig)
                 elif hasattr(state, "thread_id"):
                     thread_id = getattr(state, "thread_id", None)
             
-            logger.info(f"🔄 Generate reply: user_id={user_id}, thread_id={thread_id}")
+            logger.debug("🔄 Generate reply: user_id=%s, thread_id=%s", user_id, thread_id)
             
             if user_id and thread_id:
                 # Load latest business plan from Supabase
                 latest_plan = supabase.get_business_plan(user_id, thread_id)
-                logger.info(f"🔄 Generate reply: latest_plan={latest_plan is not None}, has_content={latest_plan.get('content') is not None if latest_plan else False}")
+                logger.debug("🔄 Generate reply: latest_plan=%s", latest_plan is not None)
                 
                 if latest_plan:
                     latest_content = latest_plan.get("content") or latest_plan.get("markdown_content")
@@ -79,25 +81,31 @@ async def generate_reply_node(state: FounderBuddyState, config: RunnableConfig)
                     else:
                         current_business_plan = getattr(state, "business_plan", None) if hasattr(state, "business_plan") else None
                     
-                    logger.info(f"🔄 Generate reply: latest_content length={len(latest_content) if latest_content else 0}, current length={len(current_business_plan) if current_business_plan else 0}")
+                    logger.debug(
+                        "🔄 Generate reply: latest_content length=%d, current length=%d",
+                        len(latest_content or ""), len(current_business_plan or ""),
+                    )
                     
                     if latest_content:
                         if latest_content != current_business_plan:
-                            logger.info(f"🔄 Generate reply: ✅ Reloaded latest business_plan from Supabase (length: {len(latest_content)})")
+                            logger.info("🔄 Generate reply: ✅ Reloaded latest business_plan from Supabase (length: %d)", len(latest_content))
+                            latest_hash = latest_plan.get("content_hash") or compute_content_hash(latest_content)
                             if isinstance(state, dict):
                                 state["business_plan"] = latest_content
+                                state["business_plan_hash"] = latest_hash
                             else:
                                 setattr(state, "business_plan", latest_content)
+                                setattr(state, "business_plan_hash", latest_hash)
                         else:
-                            logger.info(f"🔄 Generate reply: Business plan already in sync (length: {len(latest_content)})")
+                            logger.debug("🔄 Generate reply: Business plan already in sync (length: %d)", len(latest_content))
                     else:
-                        logger.info(f"🔄 Generate reply: No content in latest_plan")
+                        logger.debug("🔄 Generate reply: No content in latest_plan")
                 else:
-                    logger.info(f"🔄 Generate reply: No business plan found in database")
+                    logger.debug("🔄 Generate reply: No business plan found in database")
             else:
-                logger.info(f"🔄 Generate reply: Missing user_id or thread_id (user_id={user_id}, thread_id={thread_id})")
+                logger.info("🔄 Generate reply: Missing user_id or thread_id (user_id=%s, thread_id=%s)", user_id, thread_id)
         else:
-            logger.info(f"🔄 Generate reply: USE_SUPABASE_REALTIME is False, skipping reload")
+            logger.debug("🔄 Generate reply: USE_SUPABASE_REALTIME is False, skipping reload")
     except Exception as e:
         logger.warning(f"❌ Could not reload business_plan from Supabase: {e}", exc_info=True)
         # Continue without reloading - not critical
@@ -113,9 +121,6 @@ async def generate_reply_node(state: FounderBuddyState, config: RunnableConfig)
     
     context_packet = state.get('context_packet')
     
-    # Get LLM - no tools, no structured output for streaming
-    llm = get_model()
-    
     messages: list[BaseMessage] = []
 
     # Section-specific system prompt from context packet
@@ -195,8 +200,15 @@ async def generate_reply_node(state: FounderBuddyState, config: RunnableConfig)
         )
         messages.append(SystemMessage(content=business_plan_context))
 
-    # Generate reply
-    response = await llm.ainvoke(messages)
+    # Generate reply (no tools, no structured output for streaming); the user is
+    # waiting on this, so it goes ahead of background LLM work
+    response = await invoke_llm(
+        messages,
+        user_id=state.get("user_id"),
+        priority=LLMPriority.INTERACTIVE,
+        role=ModelRole.REPLY,
+        hedge=True,
+    )
     
     # Extract content
     reply_content = response.content if hasattr(response, 'content') else str(response)
@@ -4,6 +4,7 @@ from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
 from core.logging_config import get_logger
+from integrations.supabase.content_hash import compute_content_hash
 
 from ..enums import RouterDirective, SectionID, SectionStatus
 from ..models import SectionContent, SectionState, TiptapDocument, TiptapParagraphNode, TiptapTextNode, FounderBuddyState
@@ -79,7 +80,8 @@ async def memory_updater_node(state: FounderBuddyState, config: RunnableConfig)
                 section_id=current_section,
                 content=section_content,
                 satisfaction_status="satisfied" if agent_out.is_satisfied else None,
-                status=SectionStatus(_status_from_output(agent_out.is_satisfied, RouterDirective(agent_out.router_directive)))
+                status=SectionStatus(_status_from_output(agent_out.is_satisfied, RouterDirective(agent_out.router_directive))),
+                content_hash=compute_content_hash(plain_text),
             )
             
             section_states[current_section_id] = section_state
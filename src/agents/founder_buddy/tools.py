@@ -40,10 +40,10 @@ async def get_context(
     Returns:
         Context packet with system prompt and draft content
     """
-    logger.info("=== DATABASE_DEBUG: get_context() ENTRY ===")
-    logger.info(f"DATABASE_DEBUG: Section: {section_id}, User: {user_id}, Thread: {thread_id}")
-    logger.debug(f"DATABASE_DEBUG: User ID type: {type(user_id)}, Thread ID type: {type(thread_id)}")
-    logger.debug(f"DATABASE_DEBUG: Founder data provided: {bool(founder_data)}")
+    logger.debug(
+        "DATABASE_DEBUG: get_context() ENTRY section=%s user=%s thread=%s founder_data=%s",
+        section_id, user_id, thread_id, bool(founder_data),
+    )
     
     # Get section template
     template = SECTION_TEMPLATES.get(section_id)
@@ -75,8 +75,10 @@ async def get_context(
     
     # Try Supabase API if configured
     if hasattr(settings, 'SUPABASE_URL') and settings.SUPABASE_URL:
-        logger.info("=== TOOLS_API_CALL: get_context() using Supabase ===")
-        logger.info(f"TOOLS_API_CALL: section_id='{section_id}', user_id='{user_id}', thread_id='{thread_id}'")
+        logger.debug(
+            "TOOLS_API_CALL: get_context() using Supabase section_id=%s user_id=%s thread_id=%s",
+            section_id, user_id, thread_id,
+        )
         try:
             client = SupabaseClient()
             
@@ -91,8 +93,7 @@ async def get_context(
                 .execute()
             
             if result.data:
-                logger.info(f"TOOLS_API_CALL: ✅ Found existing data for section {section_id}")
-                logger.debug(f"TOOLS_API_CALL: Content preview: {str(result.data.get('content', ''))[:200]}...")
+                logger.debug("TOOLS_API_CALL: ✅ Found existing data for section %s", section_id)
                 
                 # Create draft content from database response
                 content_data = result.data.get("content")
@@ -113,17 +114,16 @@ async def get_context(
                     else:
                         status = SectionStatus.PENDING.value
                     
-                logger.info(f"TOOLS_API_CALL: Status determined: {status}")
+                logger.debug("TOOLS_API_CALL: Status determined: %s", status)
             else:
-                logger.info(f"TOOLS_API_CALL: ✅ No existing data for section {section_id}")
+                logger.debug("TOOLS_API_CALL: ✅ No existing data for section %s", section_id)
                 
         except Exception as e:
             logger.error(f"TOOLS_API_CALL: ❌ Supabase error in get_context: {e}")
             # Continue without data (will use defaults)
             pass
     
-    logger.info(f"DATABASE_DEBUG: Final status: {status}, draft: {bool(draft)}")
-    logger.info("=== DATABASE_DEBUG: get_context() EXIT ===")
+    logger.debug("DATABASE_DEBUG: get_context() EXIT status=%s draft=%s", status, bool(draft))
     
     # Validate section_id (but return as string for Pydantic to convert)
     try:
@@ -0,0 +1,171 @@
+"""
+Memory diagnostics for long-running service processes.
+
+With DIAGNOSTICS_ENABLED the service starts tracemalloc at startup and
+`GET /debug/memory` reports:
+
+- RSS and memory traced by tracemalloc
+- the top allocation sites, by default as growth since startup (so what
+  keeps accumulating is at the top rather than import-time allocations)
+- the sizes of known in-process registries that live as long as the
+  process (realtime subscriptions and dedupe ids, in-memory checkpointer and
+  store, in-flight requests, logger state, ...)
+- a history of RSS and registry sizes sampled every DIAGNOSTICS_INTERVAL
+  seconds, to see which of them grows alongside RSS
+
+tracemalloc slows allocation-heavy code noticeably; enable this while
+investigating, not permanently.
+"""
+
+import asyncio
+import os
+import resource
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from functools import cache
+from typing import Any
+
+from core.logging_config import get_logger
+from core.settings import settings
+
+logger = get_logger(__name__)
+
+RegistrySize = Callable[[], int | None]
+
+# Allocations made by tracemalloc itself and the import machinery are noise here
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class MemoryDiagnostics:
+    """
+    tracemalloc snapshots plus sizes of named in-process registries.
+
+    Args:
+        frames: Stack frames stored per allocation (more = slower, deeper sites)
+        history: Samples kept
+        interval: Seconds between background samples
+    """
+
+    def __init__(self, frames: int = 1, history: int = 60, interval: float = 60.0):
+        self.frames = frames
+        self.interval = interval
+        self.registries: dict[str, RegistrySize] = {}
+        self.history: deque[dict[str, Any]] = deque(maxlen=history)
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._task: asyncio.Task | None = None
+        self._started_tracing = False
+
+    def register(self, name: str, size: RegistrySize) -> None:
+        """Report `size()` (entries held) under `name`; None means not applicable."""
+        self.registries[name] = size
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = self._snapshot()
+        self.sample()
+        self._task = asyncio.create_task(self._sample_periodically())
+        logger.info(f"🔬 Memory diagnostics enabled (tracemalloc, {self.frames} frame(s))")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline = None
+
+    async def _sample_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
+
+    def registry_sizes(self) -> dict[str, int | None]:
+        sizes = {}
+        for name, size in self.registries.items():
+            try:
+                sizes[name] = size()
+            except Exception as e:
+                logger.warning(f"⚠️ Registry size for {name} failed: {e}")
+                sizes[name] = None
+        return sizes
+
+    def sample(self) -> dict[str, Any]:
+        """Record RSS, traced memory and registry sizes now."""
+        traced, traced_peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        sample = {
+            "time": time.time(),
+            "rss_mb": rss_bytes() / 2**20,
+            "traced_mb": traced / 2**20,
+            "traced_peak_mb": traced_peak / 2**20,
+            "registries": self.registry_sizes(),
+        }
+        self.history.append(sample)
+        return sample
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+        )
+
+    def top_allocations(self, limit: int = 20, since_start: bool = True) -> list[dict[str, Any]]:
+        """
+        Largest allocation sites by file and line.
+
+        Args:
+            limit: Sites returned
+            since_start: Rank by growth since start() instead of current size
+        """
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = self._snapshot()
+        if since_start and self._baseline is not None:
+            return [
+                {
+                    "site": str(stat.traceback),
+                    "size_kb": stat.size / 1024,
+                    "size_diff_kb": stat.size_diff / 1024,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._baseline, "lineno")[:limit]
+            ]
+        return [
+            {"site": str(stat.traceback), "size_kb": stat.size / 1024, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def report(self, limit: int = 20, since_start: bool = True) -> dict[str, Any]:
+        current = self.sample()
+        return {
+            **current,
+            "top_allocations": self.top_allocations(limit, since_start),
+            "history": list(self.history),
+        }
+
+
+@cache
+def get_memory_diagnostics() -> MemoryDiagnostics | None:
+    """The process's diagnostics, or None when DIAGNOSTICS_ENABLED is off."""
+    if not settings.DIAGNOSTICS_ENABLED:
+        return None
+    return MemoryDiagnostics(
+        frames=settings.DIAGNOSTICS_TRACEMALLOC_FRAMES,
+        history=settings.DIAGNOSTICS_HISTORY,
+        interval=settings.DIAGNOSTICS_INTERVAL,
+    )
@@ -1,19 +1,28 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from enum import IntEnum
 from functools import cache
-try:
-    from typing import TypeAlias
-except ImportError:
-    # Python 3.9 compatibility
-    TypeAlias = str
-
-from langchain_anthropic import ChatAnthropic
-from langchain_aws import ChatBedrock
-from langchain_community.chat_models import FakeListChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_google_vertexai import ChatVertexAI
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_openai import AzureChatOpenAI, ChatOpenAI
+from typing import TYPE_CHECKING, Any, TypeAlias
 
+# Provider packages are imported on first use in _create_model(): production
+# only ever talks to one provider, and importing all of them (Vertex AI alone
+# pulls in google.cloud.aiplatform) dominates service startup time and memory.
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_aws import ChatBedrock
+    from langchain_community.chat_models import FakeListChatModel
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain_google_vertexai import ChatVertexAI
+    from langchain_groq import ChatGroq
+    from langchain_ollama import ChatOllama
+    from langchain_openai import AzureChatOpenAI, ChatOpenAI
+
+from core.logging_config import get_logger
+from core.metrics import LLM_HEDGE_OUTCOMES, LLM_QUEUE_WAIT_SECONDS, LLMMetricsCallback
 from core.models import (
     AllModelEnum,
     AnthropicModelName,
@@ -23,14 +32,18 @@ from core.models import (
     FakeModelName,
     GoogleModelName,
     GroqModelName,
+    ModelRole,
     OllamaModelName,
     OpenAICompatibleName,
     OpenAIModelName,
     OpenRouterModelName,
+    Provider,
     VertexAIModelName,
 )
 from core.settings import settings
 
+logger = get_logger(__name__)
+
 # =============================================================================
 # 🎯 LLM CONFIGURATION - THE ONLY PLACE TO MODIFY MODEL SETTINGS
 # =============================================================================
@@ -44,7 +57,31 @@ class LLMConfig:
     DEFAULT_TEMPERATURE: float = 0.0                      # 0.0=deterministic, 1.0=creative  
     DEFAULT_MAX_TOKENS: int = 3000                        # Max response length
     DEFAULT_TOP_P: float = 0.9                           # Sampling diversity
-    
+
+    # Per-role routing: None = DEFAULT_MODEL / DEFAULT_MAX_TOKENS. Point REPLY at a
+    # smaller, faster model to cut reply latency and cost while the business plan
+    # keeps the large one.
+    # LLM_ROLE_MODELS / LLM_ROLE_MAX_TOKENS in the environment override these.
+    ROLE_MODELS: dict[ModelRole, AllModelEnum | None] = {
+        ModelRole.REPLY: None,
+        ModelRole.BUSINESS_PLAN: None,
+        ModelRole.EXTRACTION: None,
+        ModelRole.SUMMARIZATION: None,
+    }
+    ROLE_MAX_TOKENS: dict[ModelRole, int | None] = {
+        ModelRole.REPLY: None,
+        ModelRole.BUSINESS_PLAN: None,
+        ModelRole.EXTRACTION: None,
+        ModelRole.SUMMARIZATION: None,
+    }
+
+    @classmethod
+    def get_model_for_role(cls, role: ModelRole | None) -> AllModelEnum:
+        """Model for a role: LLM_ROLE_MODELS, then ROLE_MODELS, then DEFAULT_MODEL"""
+        if role is None:
+            return cls.DEFAULT_MODEL
+        return settings.LLM_ROLE_MODELS.get(role) or cls.ROLE_MODELS.get(role) or cls.DEFAULT_MODEL
+
     @classmethod
     def get_temperature_for_model(cls, model: AllModelEnum) -> float:
         """Get the appropriate temperature for a specific model"""
@@ -54,11 +91,13 @@ class LLMConfig:
         return cls.DEFAULT_TEMPERATURE
     
     @classmethod
-    def get_max_tokens_for_model(cls, model: AllModelEnum) -> int | None:
-        """Get max tokens for specific models (None = no limit)"""
+    def get_max_tokens_for_model(cls, model: AllModelEnum, role: ModelRole | None = None) -> int | None:
+        """Get max tokens for specific models and roles (None = no limit)"""
         # GPT-5 series don't support max_tokens parameter
         if hasattr(model, 'value') and model.value.startswith('gpt-5'):
             return None
+        if role is not None:
+            return settings.LLM_ROLE_MAX_TOKENS.get(role) or cls.ROLE_MAX_TOKENS.get(role) or cls.DEFAULT_MAX_TOKENS
         return cls.DEFAULT_MAX_TOKENS
 
 # =============================================================================
@@ -79,36 +118,75 @@ _MODEL_TABLE = (
 )
 
 
-class FakeToolModel(FakeListChatModel):
-    def __init__(self, responses: list[str]):
-        super().__init__(responses=responses)
+@cache
+def _fake_tool_model_class() -> type["FakeListChatModel"]:
+    """Build FakeToolModel on first use so langchain_community is not imported at startup."""
+    from langchain_community.chat_models import FakeListChatModel
+    from langchain_core.language_models.chat_models import agenerate_from_stream
 
-    def bind_tools(self, tools):
-        return self
+    class FakeToolModel(FakeListChatModel):
+        def __init__(self, responses: list[str], sleep: float | None = None):
+            super().__init__(responses=responses, sleep=sleep)
 
+        def bind_tools(self, tools):
+            return self
 
-ModelT: TypeAlias = (
-    AzureChatOpenAI
-    | ChatOpenAI
-    | ChatAnthropic
-    | ChatGoogleGenerativeAI
-    | ChatVertexAI
-    | ChatGroq
-    | ChatBedrock
-    | ChatOllama
-    | FakeToolModel
-)
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            # Paced by `sleep` like streaming calls, so ainvoke() takes as long as a streamed reply
+            return await agenerate_from_stream(self._astream(messages, stop, run_manager, **kwargs))
+
+    return FakeToolModel
+
+
+if TYPE_CHECKING:
+    ModelT: TypeAlias = (
+        AzureChatOpenAI
+        | ChatOpenAI
+        | ChatAnthropic
+        | ChatGoogleGenerativeAI
+        | ChatVertexAI
+        | ChatGroq
+        | ChatBedrock
+        | ChatOllama
+        | FakeListChatModel
+    )
 
 
 # Removed get_gpt5_model function - using standard get_model instead for better performance
 
 
 @cache
-def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
+def get_model(model_name: AllModelEnum | None = None, /, role: ModelRole | None = None) -> "ModelT":
+    """
+    Cached model instance.
+
+    Args:
+        model_name: Model to use (default: the role's model, else DEFAULT_MODEL)
+        role: Model role; sets the max-token budget and the role metric label
+    """
     # Use centralized configuration if no model specified
     if model_name is None:
-        model_name = LLMConfig.DEFAULT_MODEL
-    
+        model_name = LLMConfig.get_model_for_role(role)
+
+    if settings.LLM_CASSETTE_MODE == "replay":
+        from core.llm_cassette import replay_model
+
+        model = replay_model()
+    else:
+        model = _create_model(model_name, role)
+    if settings.LLM_CASSETTE_MODE == "record":
+        from core.llm_cassette import recording_model
+
+        model = recording_model(model, str(model_name))
+    # Latency, token and error metrics for every call made through this model
+    model.callbacks = [
+        *(model.callbacks or []),
+        LLMMetricsCallback(str(model_name), str(role) if role is not None else None),
+    ]
+    return model
+
+
+def _create_model(model_name: AllModelEnum, role: ModelRole | None = None) -> "ModelT":
     # NOTE: models with streaming=True will send tokens as they are generated
     # if the /stream endpoint is called with stream_tokens=True (the default)
     api_model_name = _MODEL_TABLE.get(model_name)
@@ -117,9 +195,11 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
     
     # Get temperature from centralized config
     temperature = LLMConfig.get_temperature_for_model(model_name)
-    max_tokens = LLMConfig.get_max_tokens_for_model(model_name)
+    max_tokens = LLMConfig.get_max_tokens_for_model(model_name, role)
 
     if model_name in OpenAIModelName:
+        from langchain_openai import ChatOpenAI
+
         # Use centralized config for all OpenAI models
         if max_tokens:
             return ChatOpenAI(model=api_model_name, temperature=temperature, max_tokens=max_tokens, streaming=True)
@@ -128,6 +208,7 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
     if model_name in OpenAICompatibleName:
         if not settings.COMPATIBLE_BASE_URL or not settings.COMPATIBLE_MODEL:
             raise ValueError("OpenAICompatible base url and endpoint must be configured")
+        from langchain_openai import ChatOpenAI
 
         return ChatOpenAI(
             model=settings.COMPATIBLE_MODEL,
@@ -140,6 +221,7 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
     if model_name in AzureOpenAIModelName:
         if not settings.AZURE_OPENAI_API_KEY or not settings.AZURE_OPENAI_ENDPOINT:
             raise ValueError("Azure OpenAI API key and endpoint must be configured")
+        from langchain_openai import AzureChatOpenAI
 
         return AzureChatOpenAI(
             azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
@@ -152,6 +234,8 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
             max_retries=3,
         )
     if model_name in DeepseekModelName:
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(
             model=api_model_name,
             temperature=temperature,
@@ -161,18 +245,30 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
             openai_api_key=settings.DEEPSEEK_API_KEY,
         )
     if model_name in AnthropicModelName:
+        from langchain_anthropic import ChatAnthropic
+
         return ChatAnthropic(model=api_model_name, temperature=temperature, max_tokens=max_tokens, streaming=True)
     if model_name in GoogleModelName:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         return ChatGoogleGenerativeAI(model=api_model_name, temperature=temperature, max_tokens=max_tokens, streaming=True)
     if model_name in VertexAIModelName:
+        from langchain_google_vertexai import ChatVertexAI
+
         return ChatVertexAI(model=api_model_name, temperature=temperature, max_tokens=max_tokens, streaming=True)
     if model_name in GroqModelName:
+        from langchain_groq import ChatGroq
+
         # Use temperature 0.0 for LlamaGuard (deterministic), otherwise use default
         guard_temp = 0.0 if model_name == GroqModelName.LLAMA_GUARD_4_12B else temperature
         return ChatGroq(model=api_model_name, temperature=guard_temp, max_tokens=max_tokens)
     if model_name in AWSModelName:
+        from langchain_aws import ChatBedrock
+
         return ChatBedrock(model_id=api_model_name, temperature=temperature, max_tokens=max_tokens)
     if model_name in OllamaModelName:
+        from langchain_ollama import ChatOllama
+
         if settings.OLLAMA_BASE_URL:
             chat_ollama = ChatOllama(
                 model=settings.OLLAMA_MODEL, temperature=temperature, base_url=settings.OLLAMA_BASE_URL
@@ -181,6 +277,8 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
             chat_ollama = ChatOllama(model=settings.OLLAMA_MODEL, temperature=temperature)
         return chat_ollama
     if model_name in OpenRouterModelName:
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(
             model=api_model_name,
             temperature=temperature,
@@ -190,6 +288,578 @@ def get_model(model_name: AllModelEnum | None = None, /) -> ModelT:
             api_key=settings.OPENROUTER_API_KEY,
         )
     if model_name in FakeModelName:
-        return FakeToolModel(responses=["This is a test response from the fake model."])
+        return _fake_tool_model_class()(
+            responses=["This is a test response from the fake model."],
+            sleep=settings.FAKE_MODEL_TOKEN_DELAY or None,
+        )
+
+    raise ValueError(f"Unsupported model: {model_name}")
+
+
+# Same order as _create_model(): model names that exist in several enums
+# resolve to the first matching provider there too.
+_PROVIDER_ENUMS: tuple[tuple[Any, Provider], ...] = (
+    (OpenAIModelName, Provider.OPENAI),
+    (OpenAICompatibleName, Provider.OPENAI_COMPATIBLE),
+    (AzureOpenAIModelName, Provider.AZURE_OPENAI),
+    (DeepseekModelName, Provider.DEEPSEEK),
+    (AnthropicModelName, Provider.ANTHROPIC),
+    (GoogleModelName, Provider.GOOGLE),
+    (VertexAIModelName, Provider.VERTEXAI),
+    (GroqModelName, Provider.GROQ),
+    (AWSModelName, Provider.AWS),
+    (OllamaModelName, Provider.OLLAMA),
+    (OpenRouterModelName, Provider.OPENROUTER),
+    (FakeModelName, Provider.FAKE),
+)
+
 
+def provider_for_model(model_name: AllModelEnum) -> Provider:
+    for names, provider in _PROVIDER_ENUMS:
+        if model_name in names:
+            return provider
     raise ValueError(f"Unsupported model: {model_name}")
+
+
+# =============================================================================
+# LLM call scheduling: per-provider rate limits, per-user fairness, priorities
+# =============================================================================
+
+class LLMPriority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0  # replies a user is waiting for (/stream, /invoke)
+    BACKGROUND = 1  # business plan generation, summaries, batch work
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` per second.
+
+    Args:
+        per_minute: Sustained rate (requests or tokens per minute)
+        burst: Bucket capacity (defaults to one minute's worth)
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        """Current level after refilling (negative after an underestimate)."""
+        self._refill()
+        return self.level
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` can be consumed (0 if it can be now)."""
+        self._refill()
+        amount = min(amount, self.capacity)  # an oversized call must not wait forever
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` (may go negative when correcting an underestimate)."""
+        self._refill()
+        self.level -= min(amount, self.capacity) if amount > 0 else amount
+
+
+class _Waiter:
+    __slots__ = ("future", "tokens")
+
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+
+
+class _ProviderQueue:
+    """Rate limits and waiting calls for one provider."""
+
+    def __init__(self, provider: str, rpm: float | None, tpm: float | None, clock: Callable[[], float]):
+        self.provider = provider
+        self.requests = TokenBucket(rpm, clock=clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        # priority -> user -> waiters; users are served round-robin within a priority
+        self.waiting: dict[LLMPriority, OrderedDict[str, deque[_Waiter]]] = {
+            priority: OrderedDict() for priority in LLMPriority
+        }
+        self.wakeup = asyncio.Event()
+        self.dispatcher: asyncio.Task | None = None
+
+    def has_waiters(self) -> bool:
+        return any(self.waiting.values())
+
+    def time_until(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests:
+            wait = self.requests.time_until(1)
+        if self.tokens:
+            wait = max(wait, self.tokens.time_until(tokens))
+        return wait
+
+    def consume(self, tokens: int) -> None:
+        if self.requests:
+            self.requests.consume(1)
+        if self.tokens:
+            self.tokens.consume(tokens)
+
+    def next_waiter(self) -> tuple[LLMPriority, str, _Waiter] | None:
+        """Highest priority, least recently served user; drops cancelled waiters."""
+        for priority in LLMPriority:
+            users = self.waiting[priority]
+            while users:
+                user, waiters = next(iter(users.items()))
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if waiters:
+                    return priority, user, waiters[0]
+                del users[user]
+        return None
+
+    def pop(self, priority: LLMPriority, user: str) -> None:
+        users = self.waiting[priority]
+        users[user].popleft()
+        if users[user]:
+            users.move_to_end(user)  # this user goes to the back of the line
+        else:
+            del users[user]
+
+
+class LLMScheduler:
+    """
+    Admit LLM calls within per-provider requests/min and tokens/min limits.
+
+    Calls that fit the limits run immediately. Excess calls queue per provider
+    and are admitted by a dispatcher task as capacity refills: interactive
+    calls before background ones, and round-robin across users within a
+    priority so one user's burst cannot starve the rest. Token costs are
+    estimated up front and corrected with the real usage afterwards.
+
+    Args:
+        limits: Provider -> {"rpm": int, "tpm": int}; providers without an
+            entry (or with 0) are not limited
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(self, limits: dict[str, dict[str, float]] | None = None, clock: Callable[[], float] = time.monotonic):
+        self.limits = {str(provider): limit for provider, limit in (limits or {}).items()}
+        self._clock = clock
+        self._queues: dict[str, _ProviderQueue] = {}
+
+    def _queue(self, provider: str) -> _ProviderQueue | None:
+        limit = self.limits.get(provider)
+        if not limit or not (limit.get("rpm") or limit.get("tpm")):
+            return None
+        queue = self._queues.get(provider)
+        if queue is None:
+            queue = _ProviderQueue(provider, limit.get("rpm"), limit.get("tpm"), self._clock)
+            self._queues[provider] = queue
+        return queue
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        *,
+        user_id: Any = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        tokens: int = 0,
+    ) -> AsyncIterator[Callable[[int], None]]:
+        """
+        Wait for capacity, then run the body.
+
+        Yields a callback that takes the call's actual token usage to correct
+        the estimate.
+
+        Args:
+            provider: Provider name (see core.models.Provider)
+            user_id: Caller for fairness (None shares one "anonymous" slot)
+            priority: LLMPriority.INTERACTIVE or BACKGROUND
+            tokens: Estimated total tokens for the call
+        """
+        queue = self._queue(str(provider))
+        if queue is None:
+            yield lambda actual: None
+            return
+
+        start = time.perf_counter()
+        if queue.has_waiters() or queue.time_until(tokens) > 0:
+            future = asyncio.get_running_loop().create_future()
+            user = str(user_id) if user_id is not None else "anonymous"
+            queue.waiting[priority].setdefault(user, deque()).append(_Waiter(future, tokens))
+            queue.wakeup.set()
+            if queue.dispatcher is None or queue.dispatcher.done():
+                queue.dispatcher = asyncio.create_task(self._dispatch(queue))
+            await future  # cancellation leaves a done future the dispatcher skips
+        else:
+            queue.consume(tokens)
+        LLM_QUEUE_WAIT_SECONDS.labels(queue.provider, priority.name.lower()).observe(time.perf_counter() - start)
+
+        def record_usage(actual: int) -> None:
+            if queue.tokens and actual:
+                queue.tokens.consume(actual - tokens)
+
+        yield record_usage
+
+    async def _dispatch(self, queue: _ProviderQueue) -> None:
+        while True:
+            queue.wakeup.clear()
+            head = queue.next_waiter()
+            if head is None:
+                return
+            priority, user, waiter = head
+            wait = queue.time_until(waiter.tokens)
+            if wait > 0:
+                # Re-check early if a new (possibly higher priority) call arrives
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+                continue
+            queue.pop(priority, user)
+            queue.consume(waiter.tokens)
+            waiter.future.set_result(None)
+
+    def estimate_wait(
+        self, provider: str, priority: LLMPriority = LLMPriority.INTERACTIVE, tokens: int = 0
+    ) -> float:
+        """
+        Seconds a new call would wait for capacity.
+
+        Counts the calls queued at the same or a higher priority ahead of it,
+        against the current bucket levels and refill rates.
+        """
+        queue = self._queues.get(str(provider))
+        if queue is None:
+            return 0.0
+        ahead = [
+            waiter
+            for waiter_priority, users in queue.waiting.items() if waiter_priority <= priority
+            for waiters in users.values()
+            for waiter in waiters if not waiter.future.done()
+        ]
+        wait = 0.0
+        if queue.requests:
+            needed = len(ahead) + 1
+            wait = max(0.0, needed - queue.requests.available()) / queue.requests.rate
+        if queue.tokens:
+            needed = sum(waiter.tokens for waiter in ahead) + tokens
+            wait = max(wait, max(0.0, needed - queue.tokens.available()) / queue.tokens.rate)
+        return wait
+
+    def queue_depth(self, provider: str) -> int:
+        queue = self._queues.get(str(provider))
+        if queue is None:
+            return 0
+        return sum(
+            1 for users in queue.waiting.values() for waiters in users.values()
+            for waiter in waiters if not waiter.future.done()
+        )
+
+
+def estimate_tokens(messages: Sequence[Any], max_tokens: int | None = None) -> int:
+    """Rough token estimate for rate limiting: ~4 characters per token plus the output budget."""
+    chars = sum(len(str(getattr(message, "content", message))) for message in messages)
+    return chars // 4 + (max_tokens if max_tokens is not None else LLMConfig.DEFAULT_MAX_TOKENS)
+
+
+@cache
+def get_llm_scheduler() -> LLMScheduler:
+    return LLMScheduler(settings.LLM_RATE_LIMITS)
+
+
+async def invoke_llm(
+    messages: Sequence[Any],
+    *,
+    user_id: Any = None,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+    role: ModelRole | None = None,
+    model_name: AllModelEnum | None = None,
+    hedge: bool = False,
+) -> Any:
+    """
+    Call the model through the scheduler.
+
+    Streaming still works: tokens reach /stream through the node's callbacks
+    exactly as with a direct ainvoke().
+
+    Args:
+        messages: Prompt messages
+        user_id: Caller, for per-user fairness
+        priority: LLMPriority.INTERACTIVE or BACKGROUND
+        role: Model role, which picks the model and max-token budget
+        model_name: Model to use (default: the role's model)
+        hedge: Race settings.LLM_HEDGE_MODEL when the model is slow to first
+            token or fails (see invoke_hedged)
+    """
+    model_name = model_name or LLMConfig.get_model_for_role(role)
+    max_tokens = LLMConfig.get_max_tokens_for_model(model_name, role)
+
+    # Only deterministic calls are cached (see core/llm_cache.py)
+    cache = None
+    params = {"temperature": LLMConfig.get_temperature_for_model(model_name), "max_tokens": max_tokens}
+    if params["temperature"] == 0:
+        from core.llm_cache import get_llm_cache
+
+        cache = get_llm_cache()
+    if cache is not None:
+        cached = await cache.get_response(str(model_name), params, messages)
+        if cached is not None:
+            return await replay_response(cached, messages)
+
+    secondary = settings.LLM_HEDGE_MODEL
+    if hedge and secondary is not None and secondary != model_name:
+        response = await invoke_hedged(
+            messages,
+            primary=model_name,
+            secondary=secondary,
+            hedge_after=settings.LLM_HEDGE_AFTER,
+            user_id=user_id,
+            priority=priority,
+            role=role,
+        )
+    else:
+        llm = get_model(model_name, role=role)
+        tokens = estimate_tokens(messages, max_tokens)
+        async with get_llm_scheduler().slot(
+            provider_for_model(model_name), user_id=user_id, priority=priority, tokens=tokens
+        ) as record_usage:
+            response = await llm.ainvoke(messages)
+            usage = getattr(response, "usage_metadata", None) or {}
+            record_usage(usage.get("total_tokens", 0))
+
+    # An answer from the hedge model must not be served later as the primary's
+    answered_by_primary = response.response_metadata.get("hedge_outcome") not in ("hedge", "failover")
+    if cache is not None and response.content and answered_by_primary:
+        await cache.put_response(str(model_name), params, messages, response)
+    return response
+
+
+# =============================================================================
+# Hedged calls: race a secondary model when the primary is slow or failing
+# =============================================================================
+
+_ATTEMPT_DONE = object()
+
+
+def _has_output(chunk: Any) -> bool:
+    """Whether a streamed chunk carries text or tool calls, not just a role or metadata."""
+    if getattr(chunk, "tool_call_chunks", None):
+        return True
+    content = chunk.content
+    if isinstance(content, str):
+        return bool(content)
+    return any(
+        block if isinstance(block, str) else block.get("type", "text") != "text" or block.get("text")
+        for block in content
+    )
+
+
+@cache
+def _relay_model_class() -> type:
+    """Build the relay model on first use (keeps langchain_core.language_models off the import path)."""
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.language_models.chat_models import generate_from_stream
+    from langchain_core.outputs import ChatGenerationChunk, ChatResult
+    from pydantic import PrivateAttr
+
+    class RelayChatModel(BaseChatModel):
+        """
+        Replay chunks from an attempt that is already running, or from the cache.
+
+        The hedged attempts run with the "nostream" tag so the loser never
+        reaches /stream; the winner's chunks (or a cached answer) are passed
+        through this model, which the caller invokes like any other, so
+        callbacks (token streaming, tracing) see one ordinary chat model run.
+        """
+
+        _source: AsyncIterator[Any] = PrivateAttr()
+
+        def __init__(self, source: AsyncIterator[Any]):
+            super().__init__()
+            self._source = source
+
+        @property
+        def _llm_type(self) -> str:
+            return "hedged-relay"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            raise NotImplementedError("RelayChatModel is async only")
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+            async for chunk in self._source:
+                # Drop the attempt's run ID so the chunks belong to this run
+                yield ChatGenerationChunk(message=chunk.model_copy(update={"id": None}))
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            chunks = [chunk async for chunk in self._astream(messages)]
+            return generate_from_stream(iter(chunks))
+
+    return RelayChatModel
+
+
+async def replay_response(response: Any, messages: Sequence[Any]) -> Any:
+    """
+    Return a stored response as a fresh model run.
+
+    Going through the relay model streams the content to /stream as one
+    token chunk and gives the message a new ID, like a provider answer.
+    """
+    from langchain_core.messages import AIMessageChunk
+
+    async def chunks() -> AsyncIterator[Any]:
+        yield AIMessageChunk(
+            content=response.content,
+            additional_kwargs=response.additional_kwargs,
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(getattr(response, "tool_calls", None) or [])
+            ],
+        )
+
+    replayed = await _relay_model_class()(chunks()).ainvoke(messages, stream=True)
+    replayed.response_metadata["cached"] = True
+    return replayed
+
+
+async def _run_attempt(
+    name: str,
+    model_name: AllModelEnum,
+    messages: Sequence[Any],
+    events: asyncio.Queue,
+    *,
+    user_id: Any,
+    priority: LLMPriority,
+    role: ModelRole | None,
+) -> None:
+    """Stream one model into `events` as (name, chunk), then (name, _ATTEMPT_DONE) or (name, error)."""
+    from langgraph.constants import TAG_NOSTREAM
+
+    try:
+        llm = get_model(model_name, role=role)
+        tokens = estimate_tokens(messages, LLMConfig.get_max_tokens_for_model(model_name, role))
+        async with get_llm_scheduler().slot(
+            provider_for_model(model_name), user_id=user_id, priority=priority, tokens=tokens
+        ) as record_usage:
+            used = 0
+            async for chunk in llm.astream(messages, config={"tags": [TAG_NOSTREAM]}):
+                events.put_nowait((name, chunk))
+                used += (getattr(chunk, "usage_metadata", None) or {}).get("total_tokens", 0)
+            record_usage(used)
+    except Exception as e:
+        events.put_nowait((name, e))
+        return
+    events.put_nowait((name, _ATTEMPT_DONE))
+
+
+async def invoke_hedged(
+    messages: Sequence[Any],
+    *,
+    primary: AllModelEnum,
+    secondary: AllModelEnum,
+    hedge_after: float,
+    user_id: Any = None,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+    role: ModelRole | None = None,
+) -> Any:
+    """
+    Call `primary`, racing `secondary` if it is slow to first token or fails.
+
+    The secondary starts when the primary has sent no token after
+    `hedge_after` seconds, or as soon as the primary raises. The first
+    attempt to produce a token wins and the other is cancelled, so only one
+    answer is ever streamed. Chunks without content or tool calls (the
+    role-only / message-start chunks some providers send at once) do not
+    count as a first token; they are buffered and replayed for the winner. The outcome is counted in LLM_HEDGE_OUTCOMES.
+
+    Args:
+        messages: Prompt messages
+        primary: Model tried first
+        secondary: Hedge / failover model
+        hedge_after: Seconds to wait for the primary's first token
+        user_id: Caller, for per-user fairness
+        priority: LLMPriority.INTERACTIVE or BACKGROUND
+        role: Model role (max-token budget and metric label)
+
+    Raises:
+        The primary's error when every started attempt fails
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    attempts: dict[str, asyncio.Task] = {}
+    errors: dict[str, BaseException] = {}
+    leading: dict[str, list[Any]] = {"primary": [], "secondary": []}  # empty chunks before the first token
+    label = str(role) if role is not None else "default"
+
+    def start(name: str, model_name: AllModelEnum) -> None:
+        attempts[name] = asyncio.create_task(
+            _run_attempt(name, model_name, messages, events, user_id=user_id, priority=priority, role=role)
+        )
+
+    start("primary", primary)
+    hedge_at = loop.time() + hedge_after
+    try:
+        while True:
+            timeout = max(0.0, hedge_at - loop.time()) if "secondary" not in attempts else None
+            try:
+                name, item = await asyncio.wait_for(events.get(), timeout)
+            except TimeoutError:
+                logger.warning(f"⏱️ No first token from {primary} after {hedge_after}s, hedging with {secondary}")
+                start("secondary", secondary)
+                continue
+            if isinstance(item, BaseException):
+                errors[name] = item
+                logger.warning(f"⚠️ LLM attempt {name} ({primary if name == 'primary' else secondary}) failed: {item}")
+                if "secondary" not in attempts:
+                    start("secondary", secondary)
+                elif len(errors) == len(attempts):
+                    LLM_HEDGE_OUTCOMES.labels(label, "failed").inc()
+                    raise errors["primary"]
+                continue
+            if item is not _ATTEMPT_DONE and not _has_output(item):
+                leading[name].append(item)
+                continue
+            winner, first = name, item
+            break
+
+        for name, task in attempts.items():
+            if name != winner:
+                task.cancel()
+        if winner == "primary":
+            outcome = "primary_after_hedge" if "secondary" in attempts else "primary"
+        else:
+            outcome = "failover" if "primary" in errors else "hedge"
+        LLM_HEDGE_OUTCOMES.labels(label, outcome).inc()
+
+        async def winning_chunks() -> AsyncIterator[Any]:
+            from langchain_core.messages import AIMessageChunk
+
+            for chunk in leading[winner]:
+                yield chunk
+            item = first
+            while item is not _ATTEMPT_DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                name, item = await events.get()
+                while name != winner:
+                    name, item = await events.get()
+            if first is _ATTEMPT_DONE and not leading[winner]:
+                yield AIMessageChunk(content="")  # empty answer
+
+        # stream=True emits token callbacks like the provider models (streaming=True) do
+        response = await _relay_model_class()(winning_chunks()).ainvoke(messages, stream=True)
+        response.response_metadata["hedge_outcome"] = outcome
+        return response
+    finally:
+        for task in attempts.values():
+            task.cancel()
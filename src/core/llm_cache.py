@@ -0,0 +1,340 @@
+"""
+Response cache for deterministic (temperature 0) LLM calls.
+
+Regenerating a business plan for an unchanged thread, or replaying the same
+test scenario, sends the provider byte-for-byte identical prompts. With
+LLM_CACHE_ENABLED, core.llm.invoke_llm() looks the call up first and skips
+the provider on a hit. Keys hash the model, the parameters that change the
+output (temperature, max tokens) and the canonicalized messages; message IDs
+and response metadata are left out so they never cause a miss.
+
+Calls whose temperature is not 0 (GPT-5 models are pinned to 1.0) bypass the
+cache entirely.
+
+Backends (LLM_CACHE_BACKEND):
+- memory: per-process LRU
+- sqlite: LLM_CACHE_SQLITE_PATH, shared by the workers on one host
+- postgres: llm_response_cache table through pg_manager's pool
+
+Entries expire after LLM_CACHE_TTL seconds and the least recently used are
+evicted beyond LLM_CACHE_MAX_ENTRIES. Lookups are counted in
+founder_buddy_cache_requests_total{cache="llm_response"} and the tokens hits
+did not spend in founder_buddy_llm_cache_saved_tokens_total.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from functools import cache
+from typing import Any
+
+from core.logging_config import get_logger
+from core.metrics import LLM_CACHE_SAVED_TOKENS, record_cache_lookup
+from core.settings import settings
+
+logger = get_logger(__name__)
+
+CACHE_NAME = "llm_response"
+
+
+def canonical_messages(messages: Sequence[Any]) -> list[dict[str, Any]]:
+    """Messages reduced to the fields the model sees (no IDs or metadata)."""
+    from langchain_core.messages import convert_to_messages
+
+    canonical = []
+    for message in convert_to_messages(messages):
+        entry: dict[str, Any] = {"type": message.type, "content": message.content}
+        if message.name:
+            entry["name"] = message.name
+        if tool_calls := getattr(message, "tool_calls", None):
+            entry["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+        if tool_call_id := getattr(message, "tool_call_id", None):
+            entry["tool_call_id"] = tool_call_id
+        canonical.append(entry)
+    return canonical
+
+
+def cache_key(model: str, params: dict[str, Any], messages: Sequence[Any]) -> str:
+    payload = json.dumps(
+        {"model": model, "params": params, "messages": canonical_messages(messages)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InMemoryLLMCache:
+    """
+    Per-process LRU with TTL.
+
+    Args:
+        max_entries: Entries kept before the least recently used are evicted
+        ttl: Seconds an entry stays valid
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteLLMCache:
+    """
+    SQLite-backed cache shared by the workers on one host.
+
+    Expired and least recently used entries are evicted every `evict_every`
+    writes rather than on each one, so the table may briefly exceed
+    max_entries. Hits refresh accessed_at at most every `touch_interval`
+    seconds, so most reads do not write.
+
+    Args:
+        path: Database file
+        max_entries: Entries kept before the least recently used are evicted
+        ttl: Seconds an entry stays valid
+        evict_every: Writes (per process) between eviction passes
+        touch_interval: Seconds before a hit updates the entry's accessed_at again
+    """
+
+    def __init__(
+        self, path: str, max_entries: int, ttl: float, evict_every: int = 100, touch_interval: float = 60.0
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evict_every = evict_every
+        self.touch_interval = touch_interval
+        self._writes = 0
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def _connection(self):
+        if self._conn is None:
+            import aiosqlite
+
+            conn = await aiosqlite.connect(self.path)
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_response_cache_accessed ON llm_response_cache (accessed_at)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_response_cache_expires ON llm_response_cache (expires_at)"
+            )
+            await conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def get(self, key: str) -> str | None:
+        async with self._lock:
+            conn = await self._connection()
+            now = time.time()
+            cursor = await conn.execute(
+                "SELECT value, accessed_at FROM llm_response_cache WHERE key = ? AND expires_at > ?", (key, now)
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                return None
+            value, accessed_at = row
+            if now - accessed_at >= self.touch_interval:
+                await conn.execute("UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                await conn.commit()
+            return value
+
+    async def set(self, key: str, value: str) -> None:
+        async with self._lock:
+            conn = await self._connection()
+            now = time.time()
+            await conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                await self._evict(conn, now)
+            await conn.commit()
+
+    async def _evict(self, conn, now: float) -> None:
+        await conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+        cursor = await conn.execute("SELECT count(*) FROM llm_response_cache")
+        (count,) = await cursor.fetchone()
+        if count > self.max_entries:
+            await conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN "
+                "(SELECT key FROM llm_response_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class PostgresLLMCache:
+    """
+    Cache table in the service database, shared across hosts.
+
+    Eviction and accessed_at refreshes are batched as in SQLiteLLMCache.
+
+    Args:
+        max_entries: Entries kept before the least recently used are evicted
+        ttl: Seconds an entry stays valid
+        evict_every: Writes (per process) between eviction passes
+        touch_interval: Seconds before a hit updates the entry's accessed_at again
+    """
+
+    def __init__(self, max_entries: int, ttl: float, evict_every: int = 100, touch_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evict_every = evict_every
+        self.touch_interval = touch_interval
+        self._writes = 0
+        self._ready = False
+
+    async def _pool(self):
+        from memory import pg_manager
+
+        if pg_manager.pool is None:
+            raise RuntimeError("PostgreSQL pool is not initialized")
+        if not self._ready:
+            async with pg_manager.pool.connection() as conn:
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "expires_at TIMESTAMPTZ NOT NULL, accessed_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS llm_response_cache_accessed ON llm_response_cache (accessed_at)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS llm_response_cache_expires ON llm_response_cache (expires_at)"
+                )
+            self._ready = True
+        return pg_manager.pool
+
+    async def get(self, key: str) -> str | None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT value, accessed_at < now() - make_interval(secs => %s) AS stale "
+                "FROM llm_response_cache WHERE key = %s AND expires_at > now()",
+                (self.touch_interval, key),
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                return None
+            if row["stale"]:
+                await conn.execute("UPDATE llm_response_cache SET accessed_at = now() WHERE key = %s", (key,))
+        return row["value"]
+
+    async def set(self, key: str, value: str) -> None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            await conn.execute(
+                "INSERT INTO llm_response_cache (key, value, expires_at) "
+                "VALUES (%s, %s, now() + make_interval(secs => %s)) "
+                "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, "
+                "expires_at = EXCLUDED.expires_at, accessed_at = now()",
+                (key, value, self.ttl),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                await conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= now()")
+                cursor = await conn.execute("SELECT count(*) AS entries FROM llm_response_cache")
+                excess = (await cursor.fetchone())["entries"] - self.max_entries
+                if excess > 0:
+                    await conn.execute(
+                        "DELETE FROM llm_response_cache WHERE key IN "
+                        "(SELECT key FROM llm_response_cache ORDER BY accessed_at LIMIT %s)",
+                        (excess,),
+                    )
+
+    async def close(self) -> None:
+        pass
+
+
+LLMCacheBackend = InMemoryLLMCache | SQLiteLLMCache | PostgresLLMCache
+
+
+class LLMResponseCache:
+    """
+    Store and look up AI messages; backend errors are logged, never raised.
+
+    Args:
+        backend: Storage backend
+    """
+
+    def __init__(self, backend: LLMCacheBackend):
+        self.backend = backend
+
+    async def get_response(self, model: str, params: dict[str, Any], messages: Sequence[Any]) -> Any | None:
+        from langchain_core.messages import messages_from_dict
+
+        try:
+            value = await self.backend.get(cache_key(model, params, messages))
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache lookup failed: {e}")
+            return None
+        record_cache_lookup(CACHE_NAME, value is not None)
+        if value is None:
+            return None
+        response = messages_from_dict([json.loads(value)])[0]
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage.get("total_tokens"):
+            LLM_CACHE_SAVED_TOKENS.labels(model).inc(usage["total_tokens"])
+        return response
+
+    async def put_response(self, model: str, params: dict[str, Any], messages: Sequence[Any], response: Any) -> None:
+        from langchain_core.messages import message_to_dict
+
+        try:
+            await self.backend.set(cache_key(model, params, messages), json.dumps(message_to_dict(response)))
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache write failed: {e}")
+
+
+@cache
+def get_llm_cache() -> LLMResponseCache | None:
+    """The configured cache, or None when LLM_CACHE_ENABLED is off."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    backend: LLMCacheBackend
+    if settings.LLM_CACHE_BACKEND == "postgres":
+        backend = PostgresLLMCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL)
+    elif settings.LLM_CACHE_BACKEND == "sqlite":
+        backend = SQLiteLLMCache(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL)
+    else:
+        backend = InMemoryLLMCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL)
+    logger.info(f"🗄️ LLM response cache enabled ({settings.LLM_CACHE_BACKEND})")
+    return LLMResponseCache(backend)
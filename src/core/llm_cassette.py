@@ -0,0 +1,167 @@
+"""
+Record/replay "cassettes" of LLM calls for offline benchmarks.
+
+The fake model answers every prompt with one canned sentence, so it never
+drives the graph through section transitions or business plan generation.
+A cassette captures real calls once and serves them back without network
+access:
+
+- LLM_CASSETTE_MODE=record: every model from core.llm.get_model() is wrapped;
+  each call's prompt hash, streamed chunks and the delay before each chunk
+  are appended to LLM_CASSETTE_PATH (JSON lines)
+- LLM_CASSETTE_MODE=replay: get_model() returns a replay model that looks the
+  prompt up and streams the recorded chunks, sleeping the recorded delays
+  times LLM_CASSETTE_LATENCY_SCALE (0 replays instantly)
+
+Prompts are hashed like the response cache (core.llm_cache.canonical_messages),
+without the model name, so a cassette replays whatever role routing is
+configured. A prompt recorded several times is served its recordings in turn.
+Replayed answers are identical, so the follow-up prompts of a replayed session
+match the recording as long as the user messages do: record with the same
+script (and one conversation per script) that the benchmark will replay.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Sequence
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from core.llm_cache import cache_key
+from core.logging_config import get_logger
+from core.settings import settings
+
+logger = get_logger(__name__)
+
+
+class CassetteMiss(LookupError):
+    """The replayed prompt was not recorded."""
+
+
+def prompt_key(messages: Sequence[Any]) -> str:
+    return cache_key("cassette", {}, messages)
+
+
+class Cassette:
+    """
+    Recorded calls in a JSON lines file, one call per line.
+
+    Args:
+        path: Cassette file (created on the first recorded call)
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._calls: dict[str, list[list[dict[str, Any]]]] = {}
+        self._next: dict[str, int] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                for line in f:
+                    if line.strip():
+                        call = json.loads(line)
+                        self._calls.setdefault(call["key"], []).append(call["chunks"])
+
+    def __len__(self) -> int:
+        return sum(len(recordings) for recordings in self._calls.values())
+
+    def record(self, messages: Sequence[Any], model: str, chunks: list[dict[str, Any]]) -> None:
+        key = prompt_key(messages)
+        self._calls.setdefault(key, []).append(chunks)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps({"key": key, "model": model, "chunks": chunks}, ensure_ascii=False) + "\n")
+
+    def play(self, messages: Sequence[Any]) -> list[dict[str, Any]]:
+        """Recorded chunks for the prompt; raises CassetteMiss if it was never recorded."""
+        key = prompt_key(messages)
+        recordings = self._calls.get(key)
+        if not recordings:
+            raise CassetteMiss(f"Prompt {key[:12]} is not in cassette {self.path}")
+        index = self._next.get(key, 0)
+        self._next[key] = index + 1
+        return recordings[index % len(recordings)]
+
+
+@cache
+def get_cassette() -> Cassette:
+    cassette = Cassette(settings.LLM_CASSETTE_PATH)
+    logger.info(f"📼 LLM cassette {settings.LLM_CASSETTE_MODE}: {cassette.path} ({len(cassette)} calls)")
+    return cassette
+
+
+@cache
+def _cassette_model_classes() -> tuple[type, type]:
+    """Build the record/replay models on first use (keeps langchain_core.language_models off the import path)."""
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.language_models.chat_models import agenerate_from_stream
+    from langchain_core.messages import message_to_dict, messages_from_dict
+    from langchain_core.outputs import ChatGenerationChunk, ChatResult
+    from pydantic import PrivateAttr
+
+    class RecordingChatModel(BaseChatModel):
+        """Call the wrapped model and append the call to the cassette."""
+
+        recorded_model: str
+        _model: Any = PrivateAttr()
+
+        def __init__(self, model: Any, model_name: str):
+            super().__init__(recorded_model=model_name)
+            self._model = model
+
+        @property
+        def _llm_type(self) -> str:
+            return "cassette-recorder"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            raise NotImplementedError("RecordingChatModel is async only")
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+            chunks = []
+            last = time.perf_counter()
+            # The wrapped model runs without the caller's callbacks; tokens reach them from this model
+            async for chunk in self._model.astream(messages, stop=stop, **kwargs):
+                now = time.perf_counter()
+                chunks.append({"delay": now - last, "message": message_to_dict(chunk)})
+                last = now
+                yield ChatGenerationChunk(message=chunk)
+            get_cassette().record(messages, self.recorded_model, chunks)
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            return await agenerate_from_stream(self._astream(messages, stop, run_manager, **kwargs))
+
+    class ReplayChatModel(BaseChatModel):
+        """Serve recorded calls by prompt hash, with scaled recorded latency."""
+
+        latency_scale: float = 1.0
+
+        @property
+        def _llm_type(self) -> str:
+            return "cassette-replay"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            raise NotImplementedError("ReplayChatModel is async only")
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+            for recorded in get_cassette().play(messages):
+                if self.latency_scale and recorded["delay"]:
+                    await asyncio.sleep(recorded["delay"] * self.latency_scale)
+                message = messages_from_dict([recorded["message"]])[0]
+                # Fresh message ID per replay, as from a provider
+                yield ChatGenerationChunk(message=message.model_copy(update={"id": None}))
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            return await agenerate_from_stream(self._astream(messages, stop, run_manager, **kwargs))
+
+    return RecordingChatModel, ReplayChatModel
+
+
+def recording_model(model: Any, model_name: str) -> Any:
+    """`model` wrapped so its calls are appended to the cassette."""
+    return _cassette_model_classes()[0](model, model_name)
+
+
+def replay_model() -> Any:
+    """Model answering from the cassette (LLM_CASSETTE_LATENCY_SCALE applied)."""
+    return _cassette_model_classes()[1](latency_scale=settings.LLM_CASSETTE_LATENCY_SCALE)
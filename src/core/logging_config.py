@@ -5,12 +5,24 @@ Environment Variables:
 - LOG_LEVEL: Global log level (DEBUG, INFO, WARNING, ERROR)
 - LOG_STATE: Show state changes (true/false)
 - LOG_STREAM_EVENTS: Show streaming events (true/false)
-- LOG_FORMAT: Logging format (simple/detailed)
+- LOG_FORMAT: Logging format (simple/detailed/json)
+- LOG_ASYNC: Hand records to a background thread instead of writing them from
+  the caller (true/false, default true)
+- LOG_RATE_LIMIT: Max INFO/DEBUG records per second per logger (default 0,
+  no limit)
+- LOG_RATE_BURST: Records a logger may emit in a burst before being limited
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
+import threading
+import time
+import weakref
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
 # Get configuration from environment
@@ -18,46 +30,191 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_STATE = os.getenv("LOG_STATE", "false").lower() == "true"
 LOG_STREAM_EVENTS = os.getenv("LOG_STREAM_EVENTS", "false").lower() == "true"
 LOG_FORMAT = os.getenv("LOG_FORMAT", "simple").lower()
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "0"))
+LOG_RATE_BURST = int(os.getenv("LOG_RATE_BURST", "200"))
+
+_LOG_FORMATS = {
+    "simple": "%(levelname)s - %(message)s",
+    "detailed": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+}
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None), bytes)
+
+_queue_listener: QueueListener | None = None
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Queue handler that defers message formatting to the listener thread.
+
+    The stock QueueHandler formats every record in the calling thread; here
+    only records whose arguments are mutable objects are rendered eagerly (so
+    the log reflects their state at call time), everything else is formatted
+    by the background QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (
+            isinstance(args, tuple) and all(isinstance(a, _IMMUTABLE_ARGS) for a in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-logger token bucket for INFO and DEBUG records.
+
+    WARNING and above always pass. When a logger is throttled, the next record
+    it gets through carries how many records were dropped in between as
+    `record.rate_limited`; the message itself is left untouched.
+
+    Args:
+        rate: Records per second each logger may emit
+        burst: Bucket size (records a logger may emit at once)
+    """
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._buckets: dict[str, list[float]] = {}  # name -> [tokens, last_refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed = int(bucket[2])
+            bucket[2] = 0
+        if suppressed:
+            record.rate_limited = suppressed
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Plain-text formatter that notes records dropped by RateLimitFilter."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "rate_limited", 0)
+        if suppressed:
+            text = f"{text} [rate limited: {suppressed} earlier records dropped]"
+        return text
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json":
+        return JsonFormatter()
+    return TextFormatter(_LOG_FORMATS.get(LOG_FORMAT, _LOG_FORMATS["simple"]))
 
 
 def setup_logging():
-    """Configure logging for the entire application."""
-    # Set base logging level
-    logging.basicConfig(
-        level=getattr(logging, LOG_LEVEL, logging.INFO),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' if LOG_FORMAT == 'detailed' else '%(levelname)s - %(message)s'
-    )
-    
+    """
+    Configure logging for the entire application.
+
+    Safe to call more than once; only the first call installs handlers. Like
+    logging.basicConfig, existing root handlers (e.g. pytest's) are left alone.
+    """
+    global _configured, _queue_listener
+
+    root = logging.getLogger()
+    if not _configured and not root.handlers:
+        root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(_build_formatter())
+
+        if LOG_ASYNC:
+            handler: logging.Handler = AsyncQueueHandler(queue.SimpleQueue())
+            _queue_listener = QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+            _queue_listener.start()
+            atexit.register(shutdown_logging)
+        else:
+            handler = stream_handler
+
+        if LOG_RATE_LIMIT > 0:
+            handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT, LOG_RATE_BURST))
+        root.addHandler(handler)
+    _configured = True
+
     # Configure specific loggers if needed
     if not LOG_STREAM_EVENTS:
         # Reduce stream-related logging to WARNING level
         logging.getLogger("service.service").setLevel(logging.WARNING)
 
 
+def shutdown_logging():
+    """Flush queued records and stop the background logging thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 class SmartLogger:
     """Smart logger that handles different log types efficiently."""
     
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
+        _smart_loggers.add(self)
         self._stream_event_count = 0
         self._last_state = None
     
-    def info(self, message: str):
-        """Standard info logging."""
-        self.logger.info(message)
+    def isEnabledFor(self, level: int) -> bool:
+        """Check the level before building expensive log payloads."""
+        return self.logger.isEnabledFor(level)
+    
+    def info(self, message: str, *args: Any, **kwargs: Any):
+        """Standard info logging. Pass %-style args to defer formatting."""
+        self.logger.info(message, *args, stacklevel=2, **kwargs)
     
-    def debug(self, message: str):
-        """Debug logging - only if DEBUG level is set."""
-        if LOG_LEVEL == "DEBUG":
-            self.logger.debug(message)
+    def debug(self, message: str, *args: Any, **kwargs: Any):
+        """Debug logging - only formatted if DEBUG level is enabled."""
+        self.logger.debug(message, *args, stacklevel=2, **kwargs)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args: Any, **kwargs: Any):
         """Warning logging."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, stacklevel=2, **kwargs)
     
-    def error(self, message: str, exc_info: bool = False):
+    def error(self, message: str, *args: Any, exc_info: bool = False, **kwargs: Any):
         """Error logging."""
-        self.logger.error(message, exc_info=exc_info)
+        self.logger.error(message, *args, exc_info=exc_info, stacklevel=2, **kwargs)
     
     def state_change(self, section: str, old_state: Any, new_state: Any, action: str = ""):
         """Log state changes in a concise format."""
@@ -75,16 +232,20 @@ class SmartLogger:
             if event_type == "token" and self._stream_event_count % 10 != 0:
                 return
             
+            if not self.logger.isEnabledFor(logging.DEBUG):
+                return
             if details:
-                self.logger.debug(f"[STREAM] {event_type}: {json.dumps(details, default=str)[:100]}")
+                self.logger.debug("[STREAM] %s: %s", event_type, json.dumps(details, default=str)[:100])
             else:
-                self.logger.debug(f"[STREAM] {event_type}")
+                self.logger.debug("[STREAM] %s", event_type)
     
-    def stream_summary(self, total_events: int, duration: float = None):
+    def stream_summary(self, total_events: int, duration: float = None, ttft: float | None = None):
         """Log stream summary at the end."""
         msg = f"[STREAM COMPLETE] Processed {total_events} events"
         if duration:
             msg += f" in {duration:.2f}s"
+        if ttft is not None:
+            msg += f" (first token after {ttft:.2f}s)"
         self.logger.info(msg)
     
     def section_transition(self, from_section: str, to_section: str, directive: str):
@@ -129,11 +290,25 @@ class SmartLogger:
         )
 
 
+_smart_loggers: "weakref.WeakSet[SmartLogger]" = weakref.WeakSet()
+
+
 def get_logger(name: str) -> SmartLogger:
     """Get a smart logger instance."""
     return SmartLogger(name)
 
 
+def logging_registry_sizes() -> dict[str, int]:
+    """Live SmartLogger instances and rate limit buckets, for core.diagnostics."""
+    buckets = sum(
+        len(log_filter._buckets)
+        for handler in logging.getLogger().handlers
+        for log_filter in handler.filters
+        if isinstance(log_filter, RateLimitFilter)
+    )
+    return {"smart_loggers": len(_smart_loggers), "rate_limit_buckets": buckets}
+
+
 # Utility functions for common logging patterns
 def log_node_entry(logger: SmartLogger, node_name: str, section: str):
     """Log node entry in a standard format."""
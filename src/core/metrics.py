@@ -0,0 +1,390 @@
+"""
+Prometheus metrics for the agent service.
+
+All metrics live in the default prometheus_client registry and are exposed by
+the `/metrics` endpoint in service.py. Collection hooks:
+
+- instrument_node(): wraps a LangGraph node function (see graph/builder.py)
+- track_external_call(): context manager around Supabase, DentApp and other
+  external calls
+- LLMMetricsCallback: LangChain callback attached to every model by get_model(),
+  also labelled by role (reply, business_plan, ...) for role-routed models
+- LLM_QUEUE_WAIT_SECONDS: observed by core.llm.LLMScheduler
+- LLM_HEDGE_OUTCOMES: which attempt answered a hedged call in core.llm
+- record_cache_lookup() / LLM_CACHE_SAVED_TOKENS: core.llm_cache response cache
+- instrument_supabase_session(): httpx event hooks on the PostgREST session
+- memory.instrumented.InstrumentedCheckpointSaver: checkpointer timings
+- REQUESTS_SHED: service.middleware.AdmissionControlMiddleware
+- SINGLEFLIGHT_DEDUPED: service.singleflight.SingleFlight
+- BATCH_ITEMS: service.batch.run_batch (POST /{agent_id}/invoke_batch)
+- StreamTimer: time-to-first-token and inter-token latency for /stream
+"""
+
+import functools
+import inspect
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langgraph.errors import GraphBubbleUp
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+# Seconds; covers sub-millisecond checkpoint reads up to multi-minute plan generation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+GRAPH_NODE_SECONDS = Histogram(
+    "founder_buddy_graph_node_duration_seconds",
+    "Time spent in each LangGraph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_CALL_SECONDS = Histogram(
+    "founder_buddy_external_call_duration_seconds",
+    "Time spent in calls to external services",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "founder_buddy_llm_tokens_total",
+    "LLM tokens by model and kind (input, output, cache_read)",
+    ["model", "kind"],
+)
+LLM_ROLE_SECONDS = Histogram(
+    "founder_buddy_llm_role_duration_seconds",
+    "LLM call latency by model role and model",
+    ["role", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_ROLE_TOKENS = Counter(
+    "founder_buddy_llm_role_tokens_total",
+    "LLM tokens by model role, model and kind (input, output, cache_read)",
+    ["role", "model", "kind"],
+)
+LLM_HEDGE_OUTCOMES = Counter(
+    "founder_buddy_llm_hedge_outcomes_total",
+    "Hedged LLM calls by role and outcome (primary, primary_after_hedge, hedge, failover, failed)",
+    ["role", "outcome"],
+)
+LLM_CACHE_SAVED_TOKENS = Counter(
+    "founder_buddy_llm_cache_saved_tokens_total",
+    "LLM tokens not spent because the response cache answered",
+    ["model"],
+)
+CACHE_REQUESTS = Counter(
+    "founder_buddy_cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+)
+REQUESTS_SHED = Counter(
+    "founder_buddy_requests_shed_total",
+    "Requests rejected with 429 by admission control",
+    ["endpoint", "reason"],
+)
+SINGLEFLIGHT_DEDUPED = Counter(
+    "founder_buddy_singleflight_deduplicated_total",
+    "Requests that awaited an identical in-flight request instead of repeating it",
+    ["endpoint"],
+)
+BATCH_ITEMS = Counter(
+    "founder_buddy_batch_items_total",
+    "Batch invocation items by outcome (ok, error, skipped)",
+    ["status"],
+)
+ERRORS = Counter(
+    "founder_buddy_errors_total",
+    "Errors raised by graph nodes and external calls",
+    ["component", "operation"],
+)
+
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "founder_buddy_llm_queue_wait_seconds",
+    "Time LLM calls waited in the scheduler for provider rate limit capacity",
+    ["provider", "priority"],
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+STREAM_TTFT_SECONDS = Histogram(
+    "founder_buddy_stream_ttft_seconds",
+    "Time from /stream request accepted to first streamed token",
+    ["agent"],
+    buckets=LATENCY_BUCKETS,
+)
+STREAM_GENERATION_SECONDS = Histogram(
+    "founder_buddy_stream_generation_seconds",
+    "Time from first to last streamed token",
+    ["agent"],
+    buckets=LATENCY_BUCKETS,
+)
+STREAM_INTER_TOKEN_SECONDS = Histogram(
+    "founder_buddy_stream_inter_token_seconds",
+    "Gap between consecutive streamed tokens",
+    ["agent"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+STREAM_TOKENS = Counter(
+    "founder_buddy_stream_tokens_total",
+    "Token chunks streamed to clients",
+    ["agent"],
+)
+STREAM_TOKENS_PER_SECOND = Histogram(
+    "founder_buddy_stream_tokens_per_second",
+    "Streamed token chunks per second between first and last token",
+    ["agent"],
+    buckets=(1, 5, 10, 20, 40, 60, 80, 100, 150, 200, 400),
+)
+
+
+class StreamTimer:
+    """
+    Track time-to-first-token and inter-token latency for one /stream run.
+
+    Args:
+        agent_id: Agent label for the metrics
+        accepted_at: time.perf_counter() value when the request was accepted
+    """
+
+    def __init__(self, agent_id: str, accepted_at: float | None = None):
+        self.agent_id = agent_id
+        self.accepted_at = accepted_at if accepted_at is not None else time.perf_counter()
+        self.first_token_at: float | None = None
+        self.last_token_at: float | None = None
+        self.tokens = 0
+        self._inter_token = STREAM_INTER_TOKEN_SECONDS.labels(agent_id)
+
+    def token(self) -> None:
+        """Record that a token chunk was sent to the client."""
+        now = time.perf_counter()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        else:
+            self._inter_token.observe(now - self.last_token_at)
+        self.last_token_at = now
+        self.tokens += 1
+
+    def finish(self) -> dict[str, Any]:
+        """Export the run's metrics and return a summary for the client."""
+        total = time.perf_counter() - self.accepted_at
+        summary: dict[str, Any] = {
+            "total_ms": round(total * 1000, 1),
+            "ttft_ms": None,
+            "generation_ms": None,
+            "tokens": self.tokens,
+            "tokens_per_second": None,
+        }
+        if self.first_token_at is None:
+            return summary
+
+        ttft = self.first_token_at - self.accepted_at
+        generation = self.last_token_at - self.first_token_at
+        STREAM_TTFT_SECONDS.labels(self.agent_id).observe(ttft)
+        STREAM_GENERATION_SECONDS.labels(self.agent_id).observe(generation)
+        STREAM_TOKENS.labels(self.agent_id).inc(self.tokens)
+        summary["ttft_ms"] = round(ttft * 1000, 1)
+        summary["generation_ms"] = round(generation * 1000, 1)
+        if generation > 0:
+            tokens_per_second = (self.tokens - 1) / generation
+            STREAM_TOKENS_PER_SECOND.labels(self.agent_id).observe(tokens_per_second)
+            summary["tokens_per_second"] = round(tokens_per_second, 1)
+        return summary
+
+
+@contextmanager
+def track_external_call(service: str, operation: str) -> Iterator[None]:
+    """
+    Time a call to an external service and count its failures.
+
+    Works for both sync and async code:
+
+        with track_external_call("dentapp", "get_section_state"):
+            response = await client.request(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        EXTERNAL_CALL_SECONDS.labels(service, operation).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a LangGraph node function with a latency histogram and error counter.
+
+    functools.wraps keeps the signature and type hints, so LangGraph still
+    injects `config`/`store` and infers the input schema as before.
+    Interrupts (GraphBubbleUp) are control flow, not errors.
+    """
+    histogram = GRAPH_NODE_SECONDS.labels(name)
+
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await node(*args, **kwargs)
+            except GraphBubbleUp:
+                raise
+            except Exception:
+                ERRORS.labels("node", name).inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return async_wrapper
+
+    @functools.wraps(node)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return node(*args, **kwargs)
+        except GraphBubbleUp:
+            raise
+        except Exception:
+            ERRORS.labels("node", name).inc()
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return sync_wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Record LLM call latency, token usage and errors for one model.
+
+    Args:
+        model_name: Model label
+        role: Model role label (core.models.ModelRole) for per-role latency and cost
+    """
+
+    # Cheap and thread-safe enough to run on the event loop instead of an executor
+    run_inline = True
+
+    def __init__(self, model_name: str, role: str | None = None):
+        self.model_name = model_name
+        self.role = role
+        self._started: dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: dict, prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe(run_id)
+        for kind, count in _token_usage(response).items():
+            if count:
+                LLM_TOKENS.labels(self.model_name, kind).inc(count)
+                if self.role:
+                    LLM_ROLE_TOKENS.labels(self.role, self.model_name, kind).inc(count)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe(run_id)
+        ERRORS.labels("llm", self.model_name).inc()
+
+    def _observe(self, run_id: UUID) -> None:
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            EXTERNAL_CALL_SECONDS.labels("llm", self.model_name).observe(elapsed)
+            if self.role:
+                LLM_ROLE_SECONDS.labels(self.role, self.model_name).observe(elapsed)
+
+
+def _token_usage(response: LLMResult) -> dict[str, int]:
+    """Extract input/output/cache_read token counts from an LLM result."""
+    usage = {"input": 0, "output": 0, "cache_read": 0}
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not metadata:
+                continue
+            found = True
+            usage["input"] += metadata.get("input_tokens", 0)
+            usage["output"] += metadata.get("output_tokens", 0)
+            usage["cache_read"] += (metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+    if not found and response.llm_output:
+        # Providers that only report usage in llm_output (non-streaming OpenAI)
+        token_usage = response.llm_output.get("token_usage") or response.llm_output.get("usage") or {}
+        usage["input"] = token_usage.get("prompt_tokens", token_usage.get("input_tokens", 0)) or 0
+        usage["output"] = token_usage.get("completion_tokens", token_usage.get("output_tokens", 0)) or 0
+    return usage
+
+
+def instrument_supabase_session(session: httpx.Client) -> None:
+    """Time every PostgREST request made through a Supabase client's httpx session."""
+
+    def on_request(request: httpx.Request) -> None:
+        request.extensions["metrics_start"] = time.perf_counter()
+
+    def on_response(response: httpx.Response) -> None:
+        start = response.request.extensions.get("metrics_start")
+        if start is None:
+            return
+        # /rest/v1/<table>?... -> "GET section_states"
+        table = response.request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        operation = f"{response.request.method} {table}"
+        EXTERNAL_CALL_SECONDS.labels("supabase", operation).observe(time.perf_counter() - start)
+        if response.status_code >= 400:
+            ERRORS.labels("supabase", operation).inc()
+
+    hooks = session.event_hooks
+    hooks.setdefault("request", []).append(on_request)
+    hooks.setdefault("response", []).append(on_response)
+    session.event_hooks = hooks
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Return the exposition payload and its content type.
+
+    With several workers (PROMETHEUS_MULTIPROC_DIR set by run_service.py) the
+    values of all worker processes are aggregated, not just the one serving
+    the scrape.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+__all__ = [
+    "BATCH_ITEMS",
+    "CACHE_REQUESTS",
+    "ERRORS",
+    "EXTERNAL_CALL_SECONDS",
+    "GRAPH_NODE_SECONDS",
+    "LLM_CACHE_SAVED_TOKENS",
+    "LLM_HEDGE_OUTCOMES",
+    "LLM_QUEUE_WAIT_SECONDS",
+    "LLM_ROLE_SECONDS",
+    "LLM_ROLE_TOKENS",
+    "LLM_TOKENS",
+    "LLMMetricsCallback",
+    "REQUESTS_SHED",
+    "SINGLEFLIGHT_DEDUPED",
+    "StreamTimer",
+    "instrument_node",
+    "instrument_supabase_session",
+    "record_cache_lookup",
+    "render_metrics",
+    "track_external_call",
+]
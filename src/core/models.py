@@ -21,6 +21,15 @@ class Provider(StrEnum):
     FAKE = auto()
 
 
+class ModelRole(StrEnum):
+    """What a model call is for; each role can use its own model and output budget."""
+
+    REPLY = auto()
+    BUSINESS_PLAN = auto()
+    EXTRACTION = auto()
+    SUMMARIZATION = auto()
+
+
 class OpenAIModelName(StrEnum):
     """https://platform.openai.com/docs/models/gpt-5-mini"""
 
@@ -1,6 +1,6 @@
 from enum import StrEnum
 from json import loads
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 from dotenv import find_dotenv
 from pydantic import (
@@ -22,6 +22,7 @@ from core.models import (
     FakeModelName,
     GoogleModelName,
     GroqModelName,
+    ModelRole,
     OllamaModelName,
     OpenAICompatibleName,
     OpenAIModelName,
@@ -54,6 +55,8 @@ class Settings(BaseSettings):
 
     HOST: str = "0.0.0.0"
     PORT: int = Field(default=8080, description="Port to run the server on")
+    # uvicorn worker processes; >1 requires shared memory components (see memory/__init__.py)
+    WORKERS: int = Field(default=1, ge=1, description="Number of service worker processes")
 
     AUTH_SECRET: SecretStr | None = None
 
@@ -67,6 +70,8 @@ class Settings(BaseSettings):
     OLLAMA_MODEL: str | None = None
     OLLAMA_BASE_URL: str | None = None
     USE_FAKE_MODEL: bool = False
+    # Seconds between streamed characters of the fake model, to mimic provider pacing in load tests
+    FAKE_MODEL_TOKEN_DELAY: float = Field(default=0.0, ge=0)
     OPENROUTER_API_KEY: str | None = None
 
     # If DEFAULT_MODEL is None, it will be set in model_post_init
@@ -125,6 +130,85 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: SecretStr | None = None
     SUPABASE_DB_URL: str | None = None
     USE_SUPABASE_REALTIME: bool = False
+    # Lock files for realtime subscription ownership when WORKERS > 1 without Postgres
+    REALTIME_LOCK_DIR: str = "/tmp/founder_buddy_realtime_locks"
+    # Realtime events are synced by this many consumer tasks, one thread at a time each
+    REALTIME_CONSUMERS: int = Field(default=4, ge=1, description="Threads whose realtime events sync at once")
+
+    # Request logging (see service/middleware.py)
+    REQUEST_LOG_SAMPLE_RATE: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Fraction of successful requests to log"
+    )
+    REQUEST_LOG_BODY: bool = False
+    REQUEST_LOG_BODY_MAX_BYTES: int = 2048
+    REQUEST_LOG_SLOW_MS: float = 2000.0
+
+    # Agents to compile during startup: "all", "none" (compile on first request)
+    # or a comma-separated list of agent IDs
+    PRELOAD_AGENTS: str = "all"
+
+    # Startup warm-up (see service/warmup.py); /ready returns 503 until it finishes
+    WARMUP_ENABLED: bool = False
+    WARMUP_TIMEOUT: float = Field(default=30.0, gt=0, description="Per-step warm-up timeout in seconds")
+    # Dependency probes behind /ready (see service/readiness.py)
+    READINESS_CACHE_TTL: float = Field(default=5.0, ge=0, description="Seconds a probe result is reused")
+    READINESS_PROBE_TIMEOUT: float = Field(default=3.0, gt=0, description="Per-probe timeout in seconds")
+
+    # Per-provider LLM rate limits enforced by core.llm.LLMScheduler (per worker process),
+    # e.g. {"openai": {"rpm": 500, "tpm": 200000}}; providers not listed are not limited
+    LLM_RATE_LIMITS: dict[str, dict[str, float]] = Field(default_factory=dict)
+
+    # Per-role overrides of LLMConfig.ROLE_MODELS / ROLE_MAX_TOKENS in core/llm.py,
+    # e.g. {"reply": "gpt-4o-mini"} and {"business_plan": 6000}
+    LLM_ROLE_MODELS: dict[ModelRole, AllModelEnum] = Field(default_factory=dict)  # type: ignore[valid-type]
+    LLM_ROLE_MAX_TOKENS: dict[ModelRole, int] = Field(default_factory=dict)
+    # Hedged replies (see core.llm.invoke_llm): if the primary model has not sent its
+    # first token after LLM_HEDGE_AFTER seconds, or fails, this model is tried too
+    LLM_HEDGE_MODEL: AllModelEnum | None = None  # type: ignore[assignment]
+    LLM_HEDGE_AFTER: float = Field(default=4.0, gt=0, description="Seconds to first token before hedging")
+    # Response cache for temperature-0 calls (see core/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_BACKEND: Literal["memory", "sqlite", "postgres"] = "memory"
+    LLM_CACHE_SQLITE_PATH: str = "llm_cache.db"
+    LLM_CACHE_TTL: float = Field(default=86400.0, gt=0, description="Seconds a cached response stays valid")
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=10000, gt=0)
+    # Record/replay of LLM calls for offline benchmarks (see core/llm_cassette.py)
+    LLM_CASSETTE_MODE: Literal["off", "record", "replay"] = "off"
+    LLM_CASSETTE_PATH: str = "benchmarks/cassettes/founder_session.jsonl"
+    LLM_CASSETTE_LATENCY_SCALE: float = Field(default=1.0, ge=0, description="Multiplier on recorded delays")
+
+    # Background jobs (see service/jobs.py), off by default: job workers per process
+    # and the SQLite file used when DATABASE_TYPE is not postgres
+    JOBS_ENABLED: bool = False
+    JOBS_CONCURRENCY: int = Field(default=2, ge=1, description="Jobs run at once per process")
+    JOBS_SQLITE_PATH: str = "/tmp/jobs.db"
+    JOBS_POLL_INTERVAL: float = Field(default=1.0, gt=0)
+    JOBS_STALE_AFTER: float = Field(default=300.0, gt=0, description="Seconds without heartbeat before a job is retried")
+
+    # Batch invocation (see service/batch.py): items run at once per batch request,
+    # and the largest batch accepted
+    BATCH_MAX_CONCURRENCY: int = Field(default=4, ge=1, description="Batch items run at once per request")
+    BATCH_MAX_ITEMS: int = Field(default=500, ge=1)
+
+    # Memory diagnostics (see core/diagnostics.py): tracemalloc plus in-process registry
+    # sizes at GET /debug/memory; slows allocation-heavy code, enable only to investigate
+    DIAGNOSTICS_ENABLED: bool = False
+    DIAGNOSTICS_INTERVAL: float = Field(default=60.0, gt=0, description="Seconds between memory samples")
+    DIAGNOSTICS_HISTORY: int = Field(default=60, ge=1, description="Memory samples kept")
+    DIAGNOSTICS_TRACEMALLOC_FRAMES: int = Field(default=1, ge=1)
+
+    # Admission control (see service/middleware.py), off by default: per-endpoint
+    # concurrency and expected queue wait limits; beyond them requests get 429 with Retry-After
+    ADMISSION_CONTROL_ENABLED: bool = False
+    ADMISSION_LIMITS: dict[str, dict[str, float]] = Field(
+        default_factory=lambda: {
+            "stream": {"max_concurrent": 100, "max_wait_s": 20},
+            "invoke": {"max_concurrent": 100, "max_wait_s": 20},
+            "invoke_batch": {"max_concurrent": 2, "max_wait_s": 60},
+            "generate_business_plan": {"max_concurrent": 8, "max_wait_s": 60},
+            "refine_section": {"max_concurrent": 20, "max_wait_s": 20},
+        }
+    )
 
     # Note: LLM configuration moved to src/core/llm_config.py
 
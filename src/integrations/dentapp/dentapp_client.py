@@ -6,6 +6,7 @@ from typing import Any
 
 from httpx import AsyncClient, HTTPStatusError, RequestError, TimeoutException
 
+from core.metrics import track_external_call
 from core.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -66,18 +67,22 @@ class DentAppClient:
         if params:
             logger.info(f"  Params: {params}")
         logger.info("=== DENTAPP_API_REQUEST END ===")
+
+        # Metrics label without ids, e.g. "/section_states/1/2" -> "section_states"
+        endpoint_name = url.strip("/").split("/", 1)[0]
             
         for attempt in range(retries):
             try:
                 logger.debug(f"DentApp API {method} {url} - Attempt {attempt + 1}")
                 
-                response = await self._client.request(
-                    method=method,
-                    url=url,
-                    json=json,
-                    params=params
-                )
-                response.raise_for_status()
+                with track_external_call("dentapp", f"{method} {endpoint_name}"):
+                    response = await self._client.request(
+                        method=method,
+                        url=url,
+                        json=json,
+                        params=params
+                    )
+                    response.raise_for_status()
                 
                 result = response.json()
                 logger.info(f"=== DENTAPP_API_RESPONSE: Status {response.status_code} SUCCESS ===")
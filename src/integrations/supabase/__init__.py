@@ -1,7 +1,8 @@
 """Supabase integration module."""
+from .content_hash import compute_content_hash, section_content_hash, section_text
 from .supabase_client import get_supabase_client, SupabaseClient
 
-__all__ = ["get_supabase_client", "SupabaseClient"]
+__all__ = ["get_supabase_client", "SupabaseClient", "compute_content_hash", "section_content_hash", "section_text"]
 
 
 
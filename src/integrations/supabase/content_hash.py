@@ -0,0 +1,80 @@
+"""Content hashing shared by the agent state and the Supabase tables.
+
+The same hash is computed in Postgres by the trigger in
+``supabase/migrations/002_content_hashes.sql``, so both sides must normalize
+text identically: trim ASCII whitespace, encode as UTF-8, SHA-256, hex digest.
+"""
+
+import hashlib
+from typing import Any
+
+# Must match the characters passed to btrim() in the migration
+_TRIM_CHARS = " \t\n\r"
+
+
+def compute_content_hash(text: str | None) -> str | None:
+    """
+    Hash section or business plan text for cheap sync comparisons.
+
+    Args:
+        text: Plain text (sections) or markdown (business plan)
+
+    Returns:
+        Hex SHA-256 digest, or None when there is no content
+    """
+    if not text:
+        return None
+    normalized = text.strip(_TRIM_CHARS)
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _tiptap_text(node: Any) -> str:
+    """Concatenate text nodes of a Tiptap document (dict or Pydantic model)."""
+    if isinstance(node, dict):
+        if "text" in node:
+            return node["text"] or ""
+        children = node.get("content")
+    else:
+        text = getattr(node, "text", None)
+        if text:
+            return text
+        children = getattr(node, "content", None)
+    if isinstance(children, list):
+        return "".join(_tiptap_text(child) for child in children)
+    return ""
+
+
+def section_text(section_state: Any) -> str:
+    """
+    Get the plain text of a section state held in agent state.
+
+    Section states are usually ``SectionState`` models but may be plain dicts
+    after a Realtime sync, so both shapes are handled.
+    """
+    if section_state is None:
+        return ""
+    if isinstance(section_state, dict):
+        content = section_state.get("content")
+    else:
+        content = getattr(section_state, "content", None)
+    if not content:
+        return ""
+    if isinstance(content, dict):
+        return content.get("plain_text") or _tiptap_text(content.get("content") or {})
+    return getattr(content, "plain_text", None) or _tiptap_text(getattr(content, "content", None))
+
+
+def section_content_hash(section_state: Any) -> str | None:
+    """Return the stored content hash of a section state, computing it for older states."""
+    if section_state is None:
+        return None
+    if isinstance(section_state, dict):
+        stored = section_state.get("content_hash")
+    else:
+        stored = getattr(section_state, "content_hash", None)
+    return stored or compute_content_hash(section_text(section_state))
+
+
+__all__ = ["compute_content_hash", "section_text", "section_content_hash"]
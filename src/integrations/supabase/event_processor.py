@@ -1,13 +1,18 @@
 """EventProcessor - Parses, validates, deduplicates, and orders Realtime events."""
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
+import sys
+import time
 from datetime import datetime
 from typing import Optional
 from enum import Enum
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
 
 from core.logging_config import get_logger
 
@@ -47,20 +52,86 @@ class RealtimeEvent:
         return f"{self.table}:{self.thread_id}:{self.section_id or 'none'}:{self.timestamp.isoformat()}"
 
 
+class ProcessedEventIds:
+    """
+    Event IDs seen in the last `ttl` seconds, for deduplication.
+    
+    Every ID lives for the same TTL, so IDs expire in insertion order:
+    expired ones are popped from the front of an OrderedDict on each check,
+    keeping check/insert O(1) amortized.
+    
+    Args:
+        ttl: Seconds an ID is remembered
+        max_entries: Hard cap; beyond it the oldest IDs are forgotten early
+        clock: Monotonic clock (injectable for tests)
+    """
+    
+    def __init__(self, ttl: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._ids: OrderedDict[str, float] = OrderedDict()  # event_id -> expires_at
+    
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._ids)
+    
+    def __contains__(self, event_id: str) -> bool:
+        self._expire()
+        return event_id in self._ids
+    
+    def add(self, event_id: str) -> bool:
+        """Remember `event_id`; False if it is already remembered."""
+        self._expire()
+        if event_id in self._ids:
+            return False
+        self._ids[event_id] = self._clock() + self.ttl
+        if len(self._ids) > self.max_entries:
+            self._ids.popitem(last=False)
+        return True
+    
+    def _expire(self):
+        now = self._clock()
+        while self._ids:
+            expires_at = self._ids[next(iter(self._ids))]
+            if expires_at > now:
+                return
+            self._ids.popitem(last=False)
+    
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the IDs and their expiry times (O(n), for diagnostics)."""
+        return sys.getsizeof(self._ids) + sum(
+            sys.getsizeof(event_id) + sys.getsizeof(expires_at) for event_id, expires_at in self._ids.items()
+        )
+
+
 class EventProcessor:
     """Processes Realtime events: parsing, validation, deduplication, ordering."""
     
-    def __init__(self, cache_ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        cache_ttl_seconds: int = 3600,
+        max_processed_events: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize EventProcessor.
         
         Args:
             cache_ttl_seconds: Time to keep processed events in cache (default: 1 hour)
+            max_processed_events: Most event IDs kept for deduplication
+            clock: Monotonic clock for the deduplication TTL (injectable for tests)
         """
-        self.processed_events: set[str] = set()
+        self.processed_events = ProcessedEventIds(cache_ttl_seconds, max_processed_events, clock)
         self.cache_ttl_seconds = cache_ttl_seconds
-        self.event_queues: dict[str, list[RealtimeEvent]] = defaultdict(list)  # thread_id -> events
-        self.locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # thread_id -> heap of (timestamp, arrival number, event); the arrival
+        # number keeps events with equal timestamps in the order they came in
+        self.event_queues: dict[str, list[tuple[datetime, int, RealtimeEvent]]] = defaultdict(list)
+        self._arrivals = itertools.count()
+        # Threads with queued events, each listed once until a consumer has drained it.
+        # Queue updates never await, so they need no per-thread locks
+        self.ready_threads: asyncio.Queue[str] = asyncio.Queue()
+        self._scheduled: set[str] = set()
     
     def parse_payload(self, payload: dict) -> Optional[RealtimeEvent]:
         """
@@ -260,12 +331,10 @@ class EventProcessor:
         Returns:
             True if duplicate, False otherwise
         """
-        if event.event_id in self.processed_events:
+        # Remembers the ID if it is new
+        if not self.processed_events.add(event.event_id):
             logger.debug(f"Duplicate event detected: {event.event_id}")
             return True
-        
-        # Add to processed events
-        self.processed_events.add(event.event_id)
         return False
     
     def order_events(self, thread_id: str) -> list[RealtimeEvent]:
@@ -282,8 +351,7 @@ class EventProcessor:
             return []
         
         # Sort by timestamp
-        events = sorted(self.event_queues[thread_id], key=lambda e: e.timestamp)
-        return events
+        return [event for _, _, event in sorted(self.event_queues[thread_id])]
     
     async def add_event(self, event: RealtimeEvent) -> bool:
         """
@@ -307,14 +375,27 @@ class EventProcessor:
         
         # Add to queue
         thread_id = event.thread_id
-        async with self.locks[thread_id]:
-            self.event_queues[thread_id].append(event)
-            # Sort by timestamp
-            self.event_queues[thread_id].sort(key=lambda e: e.timestamp)
+        heapq.heappush(self.event_queues[thread_id], (event.timestamp, next(self._arrivals), event))
+        if thread_id not in self._scheduled:
+            self._scheduled.add(thread_id)
+            self.ready_threads.put_nowait(thread_id)
         
         logger.info(f"📥 EventProcessor: Added event {event.event_id} to queue for thread {thread_id} (type: {event.event_type})")
         return True
     
+    async def next_ready_thread(self) -> str:
+        """
+        Wait for a thread with queued events.
+        
+        The thread is handed to one caller only, which should call
+        get_next_event() until it returns None; events added meanwhile are
+        picked up by that same caller, so each thread's events stay in order.
+        
+        Returns:
+            Thread ID
+        """
+        return await self.ready_threads.get()
+    
     async def get_next_event(self, thread_id: str) -> Optional[RealtimeEvent]:
         """
         Get next event from queue for a thread.
@@ -323,17 +404,18 @@ class EventProcessor:
             thread_id: Thread ID
         
         Returns:
-            Next event or None if queue is empty
+            Next event or None if queue is empty (the thread is then no
+            longer ready until add_event() queues another event)
         """
-        async with self.locks[thread_id]:
-            if not self.event_queues[thread_id]:
-                return None
-            
-            return self.event_queues[thread_id].pop(0)
+        if not self.event_queues.get(thread_id):
+            self.event_queues.pop(thread_id, None)
+            self._scheduled.discard(thread_id)
+            return None
+        
+        return heapq.heappop(self.event_queues[thread_id])[2]
     
     async def clear_queue(self, thread_id: str):
         """Clear event queue for a thread."""
         if thread_id in self.event_queues:
-            async with self.locks[thread_id]:
-                self.event_queues[thread_id].clear()
+            self.event_queues[thread_id].clear()
 
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from enum import StrEnum
 from typing import Optional, Dict, Callable
 
 from core.logging_config import get_logger
@@ -9,10 +10,21 @@ from core.settings import settings
 from integrations.supabase.realtime_listener import RealtimeListener
 from integrations.supabase.event_processor import EventProcessor, RealtimeEvent
 from integrations.supabase.state_sync_service import StateSyncService
+from integrations.supabase.subscription_ownership import (
+    SubscriptionOwnership,
+    create_subscription_ownership,
+)
 
 logger = get_logger(__name__)
 
 
+class SubscriptionResult(StrEnum):
+    SUBSCRIBED = "subscribed"
+    ALREADY_SUBSCRIBED = "already_subscribed"
+    OWNED_ELSEWHERE = "owned_elsewhere"  # another worker handles this thread
+    FAILED = "failed"
+
+
 class RealtimeWorker:
     """Orchestrates Realtime components and manages worker lifecycle."""
     
@@ -23,7 +35,8 @@ class RealtimeWorker:
         self.sync_service: Optional[StateSyncService] = None
         self.is_running: bool = False
         self.subscriptions: Dict[str, Dict] = {}  # thread_id -> subscription info
-        self._task: Optional[asyncio.Task] = None
+        self.ownership: Optional[SubscriptionOwnership] = None
+        self._consumers: list[asyncio.Task] = []
     
     async def start(self):
         """Start the Realtime worker."""
@@ -43,6 +56,7 @@ class RealtimeWorker:
             self.listener = RealtimeListener()
             self.processor = EventProcessor()
             self.sync_service = StateSyncService()
+            self.ownership = create_subscription_ownership()
             
             # Connect
             connected = await self.listener.connect()
@@ -53,8 +67,10 @@ class RealtimeWorker:
             self.is_running = True
             logger.info("✅ RealtimeWorker: Started successfully")
             
-            # Start event processing loop
-            self._task = asyncio.create_task(self._process_events_loop())
+            # Start event consumers; they sleep until add_event() queues something
+            self._consumers = [
+                asyncio.create_task(self._consume_events()) for _ in range(settings.REALTIME_CONSUMERS)
+            ]
         
         except Exception as e:
             logger.error(f"❌ RealtimeWorker: Failed to start: {e}", exc_info=True)
@@ -67,18 +83,21 @@ class RealtimeWorker:
         
         self.is_running = False
         
-        # Cancel event processing task
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        # Cancel event consumers
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
         
         # Unsubscribe from all channels
         if self.listener:
             await self.listener.disconnect()
         
+        # Hand our threads over to the other workers
+        if self.ownership:
+            await self.ownership.close()
+        self.subscriptions.clear()
+        
         logger.info("✅ RealtimeWorker: Stopped")
     
     async def subscribe_to_thread(
@@ -86,22 +105,36 @@ class RealtimeWorker:
         user_id: int,
         thread_id: str,
         agent_id: str = "founder-buddy"
-    ):
+    ) -> SubscriptionResult:
         """
         Subscribe to Realtime events for a specific thread.
         
+        With several service workers only the worker that claims the thread
+        subscribes; the others return OWNED_ELSEWHERE.
+        
         Args:
             user_id: User ID
             thread_id: Thread ID
             agent_id: Agent ID (default: "founder-buddy")
+        
+        Returns:
+            Outcome of the subscription attempt
         """
         if not self.is_running or not self.listener:
             logger.error("RealtimeWorker: Not running or listener not initialized")
-            return
+            return SubscriptionResult.FAILED
         
         if thread_id in self.subscriptions:
             logger.debug(f"RealtimeWorker: Already subscribed to thread {thread_id}")
-            return
+            return SubscriptionResult.ALREADY_SUBSCRIBED
+        
+        try:
+            if not await self.ownership.acquire(thread_id):
+                logger.debug(f"RealtimeWorker: Thread {thread_id} is owned by another worker")
+                return SubscriptionResult.OWNED_ELSEWHERE
+        except Exception as e:
+            logger.error(f"❌ RealtimeWorker: Failed to claim thread {thread_id}: {e}", exc_info=True)
+            return SubscriptionResult.FAILED
         
         try:
             logger.info(
@@ -137,6 +170,7 @@ class RealtimeWorker:
                 )
                 logger.info(f"   - Section channel: {section_channel}")
                 logger.info(f"   - Plan channel: {plan_channel}")
+                return SubscriptionResult.SUBSCRIBED
             else:
                 logger.error(
                     f"❌ RealtimeWorker: Failed to subscribe to thread {thread_id} "
@@ -148,6 +182,10 @@ class RealtimeWorker:
                 f"❌ RealtimeWorker: Failed to subscribe to thread {thread_id}: {e}",
                 exc_info=True
             )
+        
+        # Let another worker (or a later call) take the thread
+        await self.ownership.release(thread_id)
+        return SubscriptionResult.FAILED
     
     async def unsubscribe_from_thread(self, thread_id: str):
         """
@@ -176,6 +214,8 @@ class RealtimeWorker:
             
             # Remove subscription
             del self.subscriptions[thread_id]
+            if self.ownership:
+                await self.ownership.release(thread_id)
             
             logger.info(f"✅ RealtimeWorker: Unsubscribed from thread {thread_id}")
         
@@ -217,52 +257,47 @@ class RealtimeWorker:
                 exc_info=True
             )
     
-    async def _process_events_loop(self):
-        """Process events from queues."""
-        logger.info("RealtimeWorker: Event processing loop started")
+    async def _consume_events(self):
+        """
+        Sync queued events as they arrive.
         
-        while self.is_running:
-            try:
-                # Process events for all subscribed threads
-                for thread_id in list(self.subscriptions.keys()):
-                    if not self.processor or not self.sync_service:
-                        continue
-                    
-                    # Get next event for this thread
-                    event = await self.processor.get_next_event(thread_id)
-                    if not event:
-                        continue
-                    
-                    logger.info(
-                        f"🔄 RealtimeWorker: Processing event {event.event_id} "
-                        f"(type: {event.event_type}) for thread {thread_id}"
-                    )
-                    
-                    # Process event
-                    success = await self.sync_service.process_event(event)
-                    if success:
-                        logger.info(
-                            f"✅ RealtimeWorker: Successfully synced event {event.event_id} "
-                            f"for thread {thread_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"⚠️ RealtimeWorker: Failed to sync event {event.event_id} "
-                            f"for thread {thread_id}"
-                        )
-                
-                # Sleep briefly to avoid busy waiting
-                await asyncio.sleep(0.1)
-            
-            except asyncio.CancelledError:
-                logger.info("RealtimeWorker: Event processing loop cancelled")
-                break
-            except Exception as e:
-                logger.error(
-                    f"❌ RealtimeWorker: Error in event processing loop: {e}",
-                    exc_info=True
-                )
-                await asyncio.sleep(1)  # Wait before retrying
+        Each consumer takes one ready thread at a time and syncs its events in
+        order, so a thread is never synced by two consumers at once and idle
+        subscriptions cost nothing.
+        """
+        while True:
+            thread_id = await self.processor.next_ready_thread()
+            while (event := await self.processor.get_next_event(thread_id)) is not None:
+                if thread_id not in self.subscriptions:
+                    # Unsubscribed after the event was queued
+                    continue
+                await self._sync_event(event)
+    
+    async def _sync_event(self, event: RealtimeEvent):
+        """Apply one event through the StateSyncService."""
+        thread_id = event.thread_id
+        logger.info(
+            f"🔄 RealtimeWorker: Processing event {event.event_id} "
+            f"(type: {event.event_type}) for thread {thread_id}"
+        )
+        try:
+            success = await self.sync_service.process_event(event)
+        except Exception as e:
+            logger.error(
+                f"❌ RealtimeWorker: Error syncing event {event.event_id}: {e}",
+                exc_info=True
+            )
+            return
+        if success:
+            logger.info(
+                f"✅ RealtimeWorker: Successfully synced event {event.event_id} "
+                f"for thread {thread_id}"
+            )
+        else:
+            logger.warning(
+                f"⚠️ RealtimeWorker: Failed to sync event {event.event_id} "
+                f"for thread {thread_id}"
+            )
     
     async def health_check(self) -> bool:
         """
@@ -14,6 +14,7 @@ from core.settings import settings
 from memory.postgres import pg_manager
 from memory.sqlite import get_sqlite_saver
 from agents import get_agent, AgentGraph
+from integrations.supabase.content_hash import compute_content_hash
 from integrations.supabase.event_processor import RealtimeEvent, RealtimeEventType
 
 logger = get_logger(__name__)
@@ -53,7 +54,9 @@ class StateSyncService:
         section_id: str,
         new_content: dict,
         new_status: Optional[str] = None,
-        new_satisfaction_status: Optional[str] = None
+        new_satisfaction_status: Optional[str] = None,
+        new_plain_text: Optional[str] = None,
+        new_content_hash: Optional[str] = None
     ) -> bool:
         """
         Sync section state update to LangGraph agent state.
@@ -66,6 +69,8 @@ class StateSyncService:
             new_content: New Tiptap JSON content
             new_status: New status (optional)
             new_satisfaction_status: New satisfaction status (optional)
+            new_plain_text: Plain text stored with the row (optional, extracted if missing)
+            new_content_hash: content_hash stored with the row (optional, computed if missing)
         
         Returns:
             True if successful, False otherwise
@@ -98,9 +103,10 @@ class StateSyncService:
             from agents.founder_buddy.enums import SectionID
             
             # Convert Tiptap JSON to SectionContent
+            plain_text = new_plain_text or self._extract_plain_text(new_content)
             section_content = SectionContent(
                 content=new_content,  # Tiptap JSON
-                plain_text=self._extract_plain_text(new_content)
+                plain_text=plain_text
             )
             
             # Determine status
@@ -128,7 +134,8 @@ class StateSyncService:
                 section_id=section_id_enum,
                 content=section_content,
                 status=status,
-                satisfaction_status=new_satisfaction_status
+                satisfaction_status=new_satisfaction_status,
+                content_hash=new_content_hash or compute_content_hash(plain_text)
             )
             
             # Update state
@@ -158,7 +165,8 @@ class StateSyncService:
         agent_id: str,
         thread_id: str,
         user_id: int,
-        new_content: str
+        new_content: str,
+        new_content_hash: Optional[str] = None
     ) -> bool:
         """
         Sync business plan update to LangGraph agent state.
@@ -168,6 +176,7 @@ class StateSyncService:
             thread_id: Thread ID
             user_id: User ID
             new_content: New business plan content (markdown)
+            new_content_hash: content_hash stored with the row (optional, computed if missing)
         
         Returns:
             True if successful, False otherwise
@@ -193,6 +202,7 @@ class StateSyncService:
             
             # Update business_plan
             current_state["business_plan"] = new_content
+            current_state["business_plan_hash"] = new_content_hash or compute_content_hash(new_content)
             
             # Save updated state to checkpoint store
             await self._update_checkpoint_state(agent, config, current_state)
@@ -343,13 +353,15 @@ class StateSyncService:
                     section_id=event.section_id or "",
                     new_content=content,
                     new_status=status,
-                    new_satisfaction_status=satisfaction_status
+                    new_satisfaction_status=satisfaction_status,
+                    new_plain_text=new_data.get("plain_text"),
+                    new_content_hash=new_data.get("content_hash")
                 )
             
             elif event.event_type == RealtimeEventType.BUSINESS_PLAN_UPDATED:
                 logger.info(f"📄 StateSyncService: Syncing business_plan")
                 new_data = event.payload.get("new", {})
-                content = new_data.get("content") or new_data.get("markdown_content")
+                content = new_data.get("markdown_content") or new_data.get("content")
                 
                 if not content:
                     logger.warning("StateSyncService: No content in business plan event")
@@ -359,7 +371,8 @@ class StateSyncService:
                     agent_id=agent_id,
                     thread_id=event.thread_id,
                     user_id=event.user_id,
-                    new_content=content
+                    new_content=content,
+                    new_content_hash=new_data.get("content_hash")
                 )
             
             else:
@@ -0,0 +1,158 @@
+"""
+Cross-worker ownership of realtime thread subscriptions.
+
+With WORKERS > 1 every uvicorn worker runs its own RealtimeWorker, and the
+`/realtime/subscribe` call for a thread can land on any of them. Each thread
+must be subscribed (and its events synced) by exactly one worker, so
+RealtimeWorker claims a thread before subscribing:
+
+- LocalOwnership: single worker, every claim succeeds
+- FileLockOwnership: one flock() per thread in REALTIME_LOCK_DIR; works
+  across workers on one host
+- PostgresAdvisoryOwnership: session advisory locks on a dedicated
+  connection; works across hosts when DATABASE_TYPE=postgres
+
+Locks are tied to the owning process (file descriptor or database session),
+so a crashed worker releases its threads and the next subscribe call on
+another worker takes them over.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+
+from core.logging_config import get_logger
+from core.settings import DatabaseType, settings
+
+logger = get_logger(__name__)
+
+
+class LocalOwnership:
+    """Single-process ownership: every claim succeeds."""
+
+    async def acquire(self, thread_id: str) -> bool:
+        return True
+
+    async def release(self, thread_id: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class FileLockOwnership:
+    """
+    Per-thread flock() files shared by the workers on one host.
+
+    Args:
+        lock_dir: Directory for the lock files (created if missing)
+    """
+
+    def __init__(self, lock_dir: str):
+        self.lock_dir = lock_dir
+        self._held: dict[str, int] = {}  # thread_id -> fd
+        os.makedirs(lock_dir, exist_ok=True)
+
+    def _path(self, thread_id: str) -> str:
+        return os.path.join(self.lock_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", thread_id) + ".lock")
+
+    async def acquire(self, thread_id: str) -> bool:
+        import fcntl  # POSIX only; multi-worker mode is not supported on Windows
+
+        if thread_id in self._held:
+            return True
+        fd = os.open(self._path(thread_id), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._held[thread_id] = fd
+        return True
+
+    async def release(self, thread_id: str) -> None:
+        import fcntl
+
+        fd = self._held.pop(thread_id, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    async def close(self) -> None:
+        for thread_id in list(self._held):
+            await self.release(thread_id)
+
+
+class PostgresAdvisoryOwnership:
+    """
+    Session-level pg_try_advisory_lock() per thread.
+
+    Uses its own connection (not the pool): session locks belong to the
+    connection that took them, and a pooled connection would be handed to
+    other requests.
+
+    Args:
+        conninfo: PostgreSQL connection string
+    """
+
+    def __init__(self, conninfo: str):
+        self.conninfo = conninfo
+        self._conn = None
+        self._held: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def lock_key(thread_id: str) -> int:
+        """Stable signed 64-bit key for a thread ID."""
+        digest = hashlib.blake2b(f"realtime:{thread_id}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    async def _connection(self):
+        if self._conn is None or self._conn.closed:
+            from psycopg import AsyncConnection
+
+            self._conn = await AsyncConnection.connect(self.conninfo, autocommit=True)
+            # Locks from a dropped session are gone; forget them
+            self._held.clear()
+        return self._conn
+
+    async def acquire(self, thread_id: str) -> bool:
+        async with self._lock:
+            if thread_id in self._held:
+                return True
+            conn = await self._connection()
+            cursor = await conn.execute("SELECT pg_try_advisory_lock(%s)", (self.lock_key(thread_id),))
+            acquired = (await cursor.fetchone())[0]
+            if acquired:
+                self._held.add(thread_id)
+            return acquired
+
+    async def release(self, thread_id: str) -> None:
+        async with self._lock:
+            if thread_id not in self._held or self._conn is None or self._conn.closed:
+                self._held.discard(thread_id)
+                return
+            await self._conn.execute("SELECT pg_advisory_unlock(%s)", (self.lock_key(thread_id),))
+            self._held.discard(thread_id)
+
+    async def close(self) -> None:
+        if self._conn is not None and not self._conn.closed:
+            await self._conn.close()
+        self._held.clear()
+
+
+SubscriptionOwnership = LocalOwnership | FileLockOwnership | PostgresAdvisoryOwnership
+
+
+def create_subscription_ownership() -> SubscriptionOwnership:
+    """Pick the ownership backend for the configured worker count and database."""
+    if settings.WORKERS <= 1:
+        return LocalOwnership()
+    if settings.DATABASE_TYPE == DatabaseType.POSTGRES:
+        from memory.postgres import pg_manager
+
+        logger.info("RealtimeWorker: Using Postgres advisory locks for subscription ownership")
+        return PostgresAdvisoryOwnership(pg_manager.get_connection_string())
+    logger.info(f"RealtimeWorker: Using file locks in {settings.REALTIME_LOCK_DIR} for subscription ownership")
+    return FileLockOwnership(settings.REALTIME_LOCK_DIR)
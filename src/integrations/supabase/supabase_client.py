@@ -2,6 +2,7 @@
 import logging
 from typing import Optional
 from supabase import create_client, Client
+from core.metrics import instrument_supabase_session
 from core.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,7 @@ def get_supabase_client() -> Client:
         
         logger.info(f"Creating Supabase client with URL: {supabase_url}")
         _supabase_client = create_client(supabase_url, key_value)
+        instrument_supabase_session(_supabase_client.postgrest.session)
         logger.info("✅ Supabase client initialized successfully")
     
     return _supabase_client
@@ -141,4 +143,72 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"Error getting section states: {e}")
             return []
-
+    
+    def get_section_hashes(
+        self,
+        user_id: int,
+        thread_id: str,
+        agent_id: str = "founder-buddy",
+        section_id: str | None = None
+    ) -> list[dict]:
+        """Get section ids and content hashes only, without content (synchronous operation)."""
+        try:
+            query = self.client.table("section_states")\
+                .select("section_id,content_hash,updated_at")\
+                .eq("user_id", user_id)\
+                .eq("thread_id", thread_id)\
+                .eq("agent_id", agent_id)
+            
+            if section_id:
+                query = query.eq("section_id", section_id)
+            
+            result = query.execute()
+            return result.data if result.data else []
+        except Exception as e:
+            logger.error(f"Error getting section hashes: {e}")
+            return []
+    
+    def get_section_texts(
+        self,
+        user_id: int,
+        thread_id: str,
+        section_ids: list[str],
+        agent_id: str = "founder-buddy"
+    ) -> list[dict]:
+        """Get plain text for selected sections only (synchronous operation)."""
+        if not section_ids:
+            return []
+        try:
+            result = self.client.table("section_states")\
+                .select("section_id,plain_text,updated_at")\
+                .eq("user_id", user_id)\
+                .eq("thread_id", thread_id)\
+                .eq("agent_id", agent_id)\
+                .in_("section_id", section_ids)\
+                .execute()
+            
+            return result.data if result.data else []
+        except Exception as e:
+            logger.error(f"Error getting section texts: {e}")
+            return []
+    
+    def get_business_plan_hash(
+        self,
+        user_id: int,
+        thread_id: str,
+        agent_id: str = "founder-buddy"
+    ) -> dict | None:
+        """Get business plan content hash without content (synchronous operation)."""
+        try:
+            result = self.client.table("business_plans")\
+                .select("content_hash,updated_at")\
+                .eq("user_id", user_id)\
+                .eq("thread_id", thread_id)\
+                .eq("agent_id", agent_id)\
+                .maybe_single()\
+                .execute()
+            
+            return result.data if result and result.data else None
+        except Exception as e:
+            logger.error(f"Error getting business plan hash: {e}")
+            return None
@@ -1,10 +1,13 @@
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
+from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.store.memory import InMemoryStore
 
 from core.settings import DatabaseType, settings
+from memory.instrumented import InstrumentedCheckpointSaver, instrument_checkpointer
 from memory.mongodb import get_mongo_saver
 from memory.postgres import pg_manager, get_postgres_saver, get_postgres_store
 from memory.sqlite import get_sqlite_saver, get_sqlite_store
@@ -46,4 +49,31 @@ async def initialize_store():
             yield store
 
 
-__all__ = ["initialize_database", "initialize_store"]
+def check_shared_memory(saver, store) -> None:
+    """
+    Refuse process-local memory components when running several workers.
+
+    Each uvicorn worker is its own process: an in-memory checkpointer or store
+    would silently split conversations and long-term memory between them.
+
+    Raises:
+        RuntimeError: If WORKERS > 1 and the saver or store is in-memory
+    """
+    if settings.WORKERS <= 1:
+        return
+    if isinstance(saver, InstrumentedCheckpointSaver):
+        saver = saver.saver
+    local = []
+    if isinstance(saver, InMemorySaver):
+        local.append(f"checkpointer {type(saver).__name__}")
+    if isinstance(store, InMemoryStore):
+        local.append(f"store {type(store).__name__}")
+    if local:
+        raise RuntimeError(
+            f"WORKERS={settings.WORKERS} requires shared memory components, "
+            f"but {' and '.join(local)} is process-local. "
+            "Use DATABASE_TYPE=postgres or sqlite, or set WORKERS=1."
+        )
+
+
+__all__ = ["check_shared_memory", "initialize_database", "initialize_store", "instrument_checkpointer"]
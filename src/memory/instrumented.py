@@ -0,0 +1,117 @@
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+from core.metrics import track_external_call
+
+
+class InstrumentedCheckpointSaver(BaseCheckpointSaver):
+    """Checkpointer wrapper that records read/write latency for the wrapped saver.
+
+    Every other attribute (setup(), conn, ...) is forwarded to the wrapped saver.
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.saver, name)
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with track_external_call("checkpointer", "get_tuple"):
+            return self.saver.get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with track_external_call("checkpointer", "put"):
+            return self.saver.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with track_external_call("checkpointer", "put_writes"):
+            return self.saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with track_external_call("checkpointer", "delete_thread"):
+            return self.saver.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with track_external_call("checkpointer", "get_tuple"):
+            return await self.saver.aget_tuple(config)
+
+    def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        return self.saver.alist(config, filter=filter, before=before, limit=limit)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with track_external_call("checkpointer", "put"):
+            return await self.saver.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with track_external_call("checkpointer", "put_writes"):
+            return await self.saver.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        with track_external_call("checkpointer", "delete_thread"):
+            return await self.saver.adelete_thread(thread_id)
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+
+def instrument_checkpointer(saver: BaseCheckpointSaver) -> BaseCheckpointSaver:
+    """Wrap a checkpointer with latency metrics (idempotent)."""
+    if isinstance(saver, InstrumentedCheckpointSaver):
+        return saver
+    return InstrumentedCheckpointSaver(saver)
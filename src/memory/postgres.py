@@ -125,6 +125,23 @@ class PostgresConnectionManager:
             self.store = None
             logger.info("PostgreSQL connection pool closed")
     
+    def estimate_wait(self) -> float:
+        """
+        Rough seconds a new request would wait for a pool connection.
+
+        Requests already waiting are served max_size at a time, each holding
+        a connection for the pool's average usage time so far.
+        """
+        if self.pool is None:
+            return 0.0
+        stats = self.pool.get_stats()
+        waiting = stats.get("requests_waiting", 0)
+        if not waiting:
+            return 0.0
+        served = stats.get("requests_num", 0)
+        avg_usage_s = (stats.get("usage_ms", 0) / served / 1000) if served else 0.1
+        return (waiting + 1) * avg_usage_s / max(stats.get("pool_max", 1), 1)
+
     def get_saver(self) -> AsyncPostgresSaver:
         """Get saver instance"""
         if self.saver is None:
@@ -2,6 +2,7 @@ from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.store.memory import InMemoryStore
+from langgraph.store.sqlite.aio import AsyncSqliteStore
 
 from core.settings import settings
 
@@ -33,8 +34,13 @@ class AsyncInMemoryStore:
 async def get_sqlite_store():
     """Initialize and return a store instance for long-term memory.
 
-    Note: SQLite-specific store isn't available in LangGraph,
-    so we use InMemoryStore wrapped in an async context manager for compatibility.
+    A single worker uses InMemoryStore wrapped in an async context manager.
+    With WORKERS > 1 an in-memory store would give every process its own
+    long-term memory, so the store lives in the SQLite database file instead.
     """
+    if settings.WORKERS > 1:
+        async with AsyncSqliteStore.from_conn_string(settings.SQLITE_DB_PATH) as store:
+            yield store
+        return
     store_manager = AsyncInMemoryStore()
     yield await store_manager.__aenter__()
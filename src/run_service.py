@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+import tempfile
 
 import uvicorn
 from dotenv import load_dotenv
@@ -27,5 +28,14 @@ if __name__ == "__main__":
     
     # Use Heroku's PORT if available, otherwise use settings.PORT
     port = int(os.environ.get("PORT", settings.PORT))
-    # Disable reload to force fresh code loading
-    uvicorn.run("service.service:app", host=settings.HOST, port=port, reload=False)
+    # Workers inherit this and write their Prometheus samples to shared files,
+    # which /metrics aggregates (see core.metrics.render_metrics)
+    if settings.WORKERS > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="founder_buddy_metrics_")
+    # Disable reload to force fresh code loading.
+    # With WORKERS > 1 each worker is a separate process running the lifespan;
+    # memory components must be shared (Postgres/SQLite) and realtime threads
+    # are claimed by exactly one worker.
+    uvicorn.run(
+        "service.service:app", host=settings.HOST, port=port, reload=False, workers=settings.WORKERS
+    )
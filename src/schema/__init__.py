@@ -1,6 +1,8 @@
 from core.models import AllModelEnum
 from schema.schema import (
     AgentInfo,
+    BatchInvokeInput,
+    BatchInvokeResult,
     ChatHistory,
     ChatHistoryInput,
     ChatMessage,
@@ -16,6 +18,8 @@ from schema.schema import (
 
 __all__ = [
     "AgentInfo",
+    "BatchInvokeInput",
+    "BatchInvokeResult",
     "AllModelEnum",
     "UserInput",
     "ChatMessage",
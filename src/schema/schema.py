@@ -221,6 +221,44 @@ class InvokeResponse(BaseModel):
     )
 
 
+class BatchInvokeInput(BaseModel):
+    """Many agent invocations run concurrently; items for one thread run in order."""
+
+    items: list[UserInput] = Field(
+        description="Invocations to run. Items sharing a thread_id run one after another, in list order.",
+        min_length=1,
+    )
+    max_concurrency: int | None = Field(
+        description="Items run at once (capped by the server's BATCH_MAX_CONCURRENCY).",
+        default=None,
+        ge=1,
+        examples=[4],
+    )
+
+
+class BatchInvokeResult(BaseModel):
+    """One NDJSON line of a batch invocation, sent as its item finishes."""
+
+    index: int = Field(
+        description="Position of the item in the request.",
+    )
+    thread_id: str | None = Field(
+        description="Thread the item ran in (the new thread for items without one).",
+        default=None,
+    )
+    status: Literal["ok", "error", "skipped"] = Field(
+        description="'skipped' when an earlier item for the same thread failed.",
+    )
+    response: InvokeResponse | None = Field(
+        description="The agent's response when status is 'ok'.",
+        default=None,
+    )
+    error: str | None = Field(
+        description="Error detail when status is 'error' or 'skipped'.",
+        default=None,
+    )
+
+
 class RefineSectionInput(BaseModel):
     """Input for refining a section with AI."""
 
@@ -0,0 +1,93 @@
+"""
+Batch invocation for offline evaluation and backfills.
+
+`POST /{agent_id}/invoke_batch` takes many invoke items and runs them
+concurrently instead of one `/invoke` at a time:
+
+- at most `max_concurrency` items run at once (capped by BATCH_MAX_CONCURRENCY)
+- items sharing a thread_id run one after another in request order, since each
+  turn depends on the checkpoint the previous one wrote; items without a
+  thread_id each start their own conversation
+- once an item fails, the later items for its thread are skipped rather than
+  run against a conversation that diverged from the script
+
+Results are yielded as items finish (not in request order); each carries the
+item's index so callers can match them up.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable, Sequence
+
+from fastapi import HTTPException
+
+from core.logging_config import get_logger
+from core.metrics import BATCH_ITEMS
+from schema import BatchInvokeResult, InvokeResponse, UserInput
+
+logger = get_logger(__name__)
+
+InvokeOne = Callable[[UserInput], Awaitable[InvokeResponse]]
+
+
+def group_by_thread(items: Sequence[UserInput]) -> list[list[tuple[int, UserInput]]]:
+    """Items as (index, item) sequences that must run in order, one per thread."""
+    groups: dict[Hashable, list[tuple[int, UserInput]]] = {}
+    for index, item in enumerate(items):
+        key = item.thread_id or ("new", index)
+        groups.setdefault(key, []).append((index, item))
+    return list(groups.values())
+
+
+async def run_batch(
+    items: Sequence[UserInput], invoke_one: InvokeOne, max_concurrency: int
+) -> AsyncGenerator[BatchInvokeResult, None]:
+    """
+    Run `items` with bounded parallelism and per-thread ordering.
+
+    Args:
+        items: Invocations to run
+        invoke_one: Runs a single item (the /invoke handler)
+        max_concurrency: Items running at once
+
+    Yields:
+        One result per item, as it finishes. Closing the generator early
+        cancels the items still running.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: asyncio.Queue[BatchInvokeResult] = asyncio.Queue()
+
+    async def run_thread(entries: list[tuple[int, UserInput]]) -> None:
+        failed_index: int | None = None
+        for index, item in entries:
+            if failed_index is not None:
+                result = BatchInvokeResult(
+                    index=index,
+                    thread_id=item.thread_id,
+                    status="skipped",
+                    error=f"item {failed_index} for this thread failed",
+                )
+            else:
+                async with semaphore:
+                    try:
+                        response = await invoke_one(item)
+                        result = BatchInvokeResult(
+                            index=index, thread_id=response.thread_id, status="ok", response=response
+                        )
+                    except Exception as e:
+                        detail = e.detail if isinstance(e, HTTPException) else str(e) or type(e).__name__
+                        logger.warning(f"⚠️ Batch item {index} failed: {detail}")
+                        result = BatchInvokeResult(
+                            index=index, thread_id=item.thread_id, status="error", error=str(detail)
+                        )
+                        failed_index = index
+            BATCH_ITEMS.labels(result.status).inc()
+            results.put_nowait(result)
+
+    tasks = [asyncio.create_task(run_thread(entries)) for entries in group_by_thread(items)]
+    try:
+        for _ in range(len(items)):
+            yield await results.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,435 @@
+"""
+Background jobs for long-running work (business plan generation).
+
+Generating a business plan inline holds an HTTP connection and a uvicorn
+worker for the whole LLM call, and proxies time out long before it finishes.
+Instead, `POST /jobs/business_plan/{agent_id}` stores a job and returns its
+ID at once; `GET /jobs/{job_id}` reports status and progress (plan sections
+written so far) and `GET /jobs/{job_id}/result` returns the plan.
+
+Only this endpoint goes through the queue. When a /stream or /invoke turn
+sets should_generate_business_plan, the graph's generate_business_plan node
+still writes the plan inline within that request.
+
+Jobs live in the `service_jobs` table so every uvicorn worker (and, with
+Postgres, every host) can serve status requests and claim queued work:
+
+- SQLiteJobStore: JOBS_SQLITE_PATH (DATABASE_TYPE sqlite or mongo)
+- PostgresJobStore: the service database through pg_manager's pool
+
+Each process runs JOBS_CONCURRENCY job workers, independent of how many HTTP
+requests it serves. A job whose worker died (no heartbeat for
+JOBS_STALE_AFTER seconds) is claimed again by another worker.
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from enum import StrEnum
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from core.logging_config import get_logger
+from core.settings import DatabaseType, settings
+
+logger = get_logger(__name__)
+
+ReportProgress = Callable[[dict[str, Any]], Awaitable[None]]
+JobHandler = Callable[[dict[str, Any], ReportProgress], Awaitable[Any]]
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+_COLUMNS = "id, kind, status, payload, progress, result, error, created_at, updated_at"
+
+
+def _job_from_row(row: Sequence[Any] | dict[str, Any]) -> dict[str, Any]:
+    if not isinstance(row, dict):
+        row = dict(zip(_COLUMNS.split(", "), row))
+    job = dict(row)
+    for field in ("payload", "progress", "result"):
+        job[field] = json.loads(job[field]) if job[field] is not None else None
+    for field in ("created_at", "updated_at"):
+        if hasattr(job[field], "timestamp"):
+            job[field] = job[field].timestamp()
+    return job
+
+
+class SQLiteJobStore:
+    """
+    Job table in a SQLite file shared by the workers on one host.
+
+    Args:
+        path: Database file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def _connection(self):
+        if self._conn is None:
+            import aiosqlite
+
+            conn = await aiosqlite.connect(self.path)
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS service_jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "progress TEXT, result TEXT, error TEXT, dedupe_key TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            await conn.execute("CREATE INDEX IF NOT EXISTS service_jobs_status_created ON service_jobs (status, created_at)")
+            await conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def create(self, kind: str, payload: dict[str, Any], dedupe_key: str | None = None) -> dict[str, Any]:
+        async with self._lock:
+            conn = await self._connection()
+            if dedupe_key is not None:
+                cursor = await conn.execute(
+                    f"SELECT {_COLUMNS} FROM service_jobs WHERE dedupe_key = ? AND status IN (?, ?)",
+                    (dedupe_key, JobStatus.QUEUED, JobStatus.RUNNING),
+                )
+                if row := await cursor.fetchone():
+                    return _job_from_row(row)
+            now = time.time()
+            job_id = str(uuid.uuid4())
+            await conn.execute(
+                "INSERT INTO service_jobs (id, kind, status, payload, dedupe_key, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JobStatus.QUEUED, json.dumps(payload), dedupe_key, now, now),
+            )
+            await conn.commit()
+            return await self._get(conn, job_id)
+
+    async def claim(self, stale_after: float) -> dict[str, Any] | None:
+        """Atomically take the oldest queued (or abandoned running) job."""
+        async with self._lock:
+            conn = await self._connection()
+            now = time.time()
+            cursor = await conn.execute(
+                f"UPDATE service_jobs SET status = ?, updated_at = ? WHERE id = ("
+                f"SELECT id FROM service_jobs WHERE status = ? OR (status = ? AND updated_at < ?) "
+                f"ORDER BY created_at LIMIT 1) RETURNING {_COLUMNS}",
+                (JobStatus.RUNNING, now, JobStatus.QUEUED, JobStatus.RUNNING, now - stale_after),
+            )
+            row = await cursor.fetchone()
+            await conn.commit()
+            return _job_from_row(row) if row else None
+
+    async def update_progress(self, job_id: str, progress: dict[str, Any]) -> None:
+        async with self._lock:
+            conn = await self._connection()
+            await conn.execute(
+                "UPDATE service_jobs SET progress = ?, updated_at = ? WHERE id = ?", (json.dumps(progress), time.time(), job_id)
+            )
+            await conn.commit()
+
+    async def heartbeat(self, job_id: str) -> None:
+        async with self._lock:
+            conn = await self._connection()
+            await conn.execute("UPDATE service_jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+            await conn.commit()
+
+    async def finish(self, job_id: str, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        async with self._lock:
+            conn = await self._connection()
+            await conn.execute(
+                "UPDATE service_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+            await conn.commit()
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        async with self._lock:
+            return await self._get(await self._connection(), job_id)
+
+    async def _get(self, conn, job_id: str) -> dict[str, Any] | None:
+        cursor = await conn.execute(f"SELECT {_COLUMNS} FROM service_jobs WHERE id = ?", (job_id,))
+        row = await cursor.fetchone()
+        return _job_from_row(row) if row else None
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class PostgresJobStore:
+    """Job table in the service database; claims use FOR UPDATE SKIP LOCKED."""
+
+    def __init__(self):
+        self._ready = False
+
+    async def _pool(self):
+        from memory import pg_manager
+
+        if pg_manager.pool is None:
+            raise RuntimeError("PostgreSQL pool is not initialized")
+        if not self._ready:
+            async with pg_manager.pool.connection() as conn:
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS service_jobs ("
+                    "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                    "progress TEXT, result TEXT, error TEXT, dedupe_key TEXT, "
+                    "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), updated_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+                )
+                await conn.execute("CREATE INDEX IF NOT EXISTS service_jobs_status_created ON service_jobs (status, created_at)")
+            self._ready = True
+        return pg_manager.pool
+
+    async def create(self, kind: str, payload: dict[str, Any], dedupe_key: str | None = None) -> dict[str, Any]:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            if dedupe_key is not None:
+                cursor = await conn.execute(
+                    f"SELECT {_COLUMNS} FROM service_jobs WHERE dedupe_key = %s AND status IN (%s, %s)",
+                    (dedupe_key, JobStatus.QUEUED, JobStatus.RUNNING),
+                )
+                if row := await cursor.fetchone():
+                    return _job_from_row(row)
+            cursor = await conn.execute(
+                f"INSERT INTO service_jobs (id, kind, status, payload, dedupe_key) VALUES (%s, %s, %s, %s, %s) "
+                f"RETURNING {_COLUMNS}",
+                (str(uuid.uuid4()), kind, JobStatus.QUEUED, json.dumps(payload), dedupe_key),
+            )
+            return _job_from_row(await cursor.fetchone())
+
+    async def claim(self, stale_after: float) -> dict[str, Any] | None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            cursor = await conn.execute(
+                f"UPDATE service_jobs SET status = %s, updated_at = now() WHERE id = ("
+                f"SELECT id FROM service_jobs WHERE status = %s "
+                f"OR (status = %s AND updated_at < now() - make_interval(secs => %s)) "
+                f"ORDER BY created_at LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING {_COLUMNS}",
+                (JobStatus.RUNNING, JobStatus.QUEUED, JobStatus.RUNNING, stale_after),
+            )
+            row = await cursor.fetchone()
+        return _job_from_row(row) if row else None
+
+    async def update_progress(self, job_id: str, progress: dict[str, Any]) -> None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            await conn.execute(
+                "UPDATE service_jobs SET progress = %s, updated_at = now() WHERE id = %s", (json.dumps(progress), job_id)
+            )
+
+    async def heartbeat(self, job_id: str) -> None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            await conn.execute("UPDATE service_jobs SET updated_at = now() WHERE id = %s", (job_id,))
+
+    async def finish(self, job_id: str, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            await conn.execute(
+                "UPDATE service_jobs SET status = %s, result = %s, error = %s, updated_at = now() WHERE id = %s",
+                (status, json.dumps(result) if result is not None else None, error, job_id),
+            )
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        pool = await self._pool()
+        async with pool.connection() as conn:
+            cursor = await conn.execute(f"SELECT {_COLUMNS} FROM service_jobs WHERE id = %s", (job_id,))
+            row = await cursor.fetchone()
+        return _job_from_row(row) if row else None
+
+    async def close(self) -> None:
+        pass
+
+
+JobStore = SQLiteJobStore | PostgresJobStore
+
+
+class JobQueue:
+    """
+    Submit jobs and run them on a bounded set of worker tasks.
+
+    Args:
+        store: Job table
+        handlers: Job kind -> handler(payload, report_progress) returning a JSON-serializable result
+        concurrency: Jobs run at once by this process
+        poll_interval: Seconds between checks for jobs submitted by other processes
+        stale_after: Seconds without a heartbeat before a running job is claimed again
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        stale_after: float = 300.0,
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    async def submit(self, kind: str, payload: dict[str, Any], dedupe_key: str | None = None) -> dict[str, Any]:
+        """
+        Queue a job, or return the queued/running job with the same dedupe key.
+
+        Args:
+            kind: Handler name
+            payload: JSON-serializable handler input
+            dedupe_key: Identity of the work (e.g. agent, thread and checkpoint)
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = await self.store.create(kind, payload, dedupe_key)
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        return await self.store.get(job_id)
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        logger.info(f"🧵 Job queue started with {self.concurrency} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running are picked up again once stale."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.store.close()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self.store.claim(self.stale_after)
+            except Exception as e:
+                logger.error(f"❌ Job claim failed: {e}")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: dict[str, Any]) -> None:
+        job_id = job["id"]
+
+        async def report(progress: dict[str, Any]) -> None:
+            await self.store.update_progress(job_id, progress)
+
+        start = time.perf_counter()
+        logger.info(f"▶️ Job {job_id} ({job['kind']}) started")
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await self.handlers[job["kind"]](job["payload"], report)
+        except Exception as e:
+            logger.error(f"❌ Job {job_id} ({job['kind']}) failed: {e}")
+            await self.store.finish(job_id, JobStatus.FAILED, error=str(e))
+            return
+        finally:
+            heartbeat.cancel()
+        await self.store.finish(job_id, JobStatus.SUCCEEDED, result=result)
+        logger.info(f"✅ Job {job_id} ({job['kind']}) finished in {time.perf_counter() - start:.1f}s")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep a long job (e.g. one unstreamed LLM call) from looking abandoned."""
+        while True:
+            await asyncio.sleep(self.stale_after / 3)
+            try:
+                await self.store.heartbeat(job_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Job {job_id} heartbeat failed: {e}")
+
+
+class PlanProgressCallback(AsyncCallbackHandler):
+    """
+    Report business plan progress from the streamed tokens.
+
+    A section is counted as started when its "## " heading line appears.
+
+    Args:
+        sections: Section headings the plan prompt asks for
+        report: Progress callback
+    """
+
+    def __init__(self, sections: Sequence[str], report: ReportProgress):
+        self.sections = list(sections)
+        self.report = report
+        self._line = ""
+        self._started: list[str] = []
+
+    def progress(self, done: bool = False) -> dict[str, Any]:
+        return {
+            "sections_total": len(self.sections),
+            "sections_started": len(self.sections) if done else len(self._started),
+            "current_section": None if done else (self._started[-1] if self._started else None),
+        }
+
+    async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self._line += token
+        *complete, self._line = self._line.split("\n")
+        for line in complete:
+            heading = re.match(r"^##\s+(.+?)\s*$", line)
+            if heading and len(self._started) < len(self.sections):
+                self._started.append(heading.group(1))
+                await self.report(self.progress())
+
+
+async def run_business_plan_job(payload: dict[str, Any], report: ReportProgress) -> dict[str, Any]:
+    """Generate (or return the existing) business plan for a thread."""
+    from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+    from agents import get_agent
+    from agents.founder_buddy.nodes.generate_business_plan import (
+        BUSINESS_PLAN_SECTIONS,
+        generate_business_plan_node,
+    )
+
+    config = RunnableConfig(configurable={"thread_id": payload["thread_id"], "user_id": payload["user_id"]})
+    state_snapshot = await get_agent(payload["agent_id"]).aget_state(config=config)
+    state_values = dict(state_snapshot.values or {})
+    progress = PlanProgressCallback(BUSINESS_PLAN_SECTIONS, report)
+    if not state_values.get("business_plan"):
+        await report(progress.progress())
+        # Run as a runnable so the node's LLM call reports its tokens to the progress callback
+        state_values = await RunnableLambda(generate_business_plan_node).ainvoke(
+            state_values, config={**config, "callbacks": [progress]}
+        )
+    business_plan = state_values.get("business_plan")
+    if not business_plan:
+        raise RuntimeError("Failed to generate business plan")
+    await report(progress.progress(done=True))
+    return {"business_plan": business_plan}
+
+
+def create_job_queue() -> JobQueue:
+    """Job queue on the configured database with the service's job handlers."""
+    store: JobStore
+    if settings.DATABASE_TYPE == DatabaseType.POSTGRES:
+        store = PostgresJobStore()
+    else:
+        store = SQLiteJobStore(settings.JOBS_SQLITE_PATH)
+    return JobQueue(
+        store,
+        {"business_plan": run_business_plan_job},
+        concurrency=settings.JOBS_CONCURRENCY,
+        poll_interval=settings.JOBS_POLL_INTERVAL,
+        stale_after=settings.JOBS_STALE_AFTER,
+    )
@@ -0,0 +1,297 @@
+"""
+ASGI middleware for the agent service.
+
+Both middlewares are pure ASGI (no BaseHTTPMiddleware) so they add no extra
+task or response buffering per request.
+
+RequestLoggingMiddleware writes one log line per request with timing and never
+holds on to request or response bodies: request bodies are only teed (up to a
+byte limit) when body logging is enabled, and response bodies are only counted.
+
+AdmissionControlMiddleware sheds load early: a request that would exceed its
+endpoint's concurrency limit, or queue longer than its wait limit for the LLM
+scheduler or the Postgres pool, gets a 429 with Retry-After instead of piling
+up until it times out.
+"""
+
+import json
+import logging
+import math
+import random
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.logging_config import get_logger
+from core.metrics import REQUESTS_SHED
+
+logger = get_logger(__name__)
+
+SENSITIVE_KEYS = ("password", "token", "secret", "key", "auth")
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+# Per-request opt-in to body logging, e.g. `curl -H "X-Log-Body: 1"`
+LOG_BODY_HEADER = b"x-log-body"
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+def mask_sensitive_fields(data: dict | list | Any) -> dict | list | Any:
+    """Mask sensitive fields in request data for logging."""
+    if isinstance(data, dict):
+        masked = {}
+        for key, value in data.items():
+            key_lower = key.lower()
+            if any(sensitive in key_lower for sensitive in SENSITIVE_KEYS):
+                masked[key] = "***MASKED***"
+            elif isinstance(value, dict | list):
+                masked[key] = mask_sensitive_fields(value)
+            else:
+                masked[key] = value
+        return masked
+    elif isinstance(data, list):
+        return [mask_sensitive_fields(item) for item in data]
+    else:
+        return data
+
+
+def format_body(body: bytes, truncated: bool) -> str:
+    """Render a captured request body for the log line, masking JSON secrets."""
+    if not body:
+        return "(empty)"
+    if not truncated:
+        try:
+            return json.dumps(mask_sensitive_fields(json.loads(body)), ensure_ascii=False)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            pass
+    text = body.decode("utf-8", errors="replace")
+    return f"{text}...(truncated)" if truncated else text
+
+
+class RequestLoggingMiddleware:
+    """
+    Log one line per HTTP request: method, path, status, duration and sizes.
+
+    Args:
+        app: The wrapped ASGI application
+        sample_rate: Fraction of successful requests to log (0.0 - 1.0). Errors,
+            5xx responses and slow requests are always logged.
+        log_body: Log request bodies for every sampled request
+        body_max_bytes: Maximum number of request body bytes to capture
+        slow_request_ms: Requests slower than this are always logged
+        skip_body_paths: Path fragments whose request bodies are never captured
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        log_body: bool = False,
+        body_max_bytes: int = 2048,
+        slow_request_ms: float = 2000.0,
+        skip_body_paths: Iterable[str] = ("/stream",),
+    ) -> None:
+        self.app = app
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.log_body = log_body
+        self.body_max_bytes = body_max_bytes
+        self.slow_request_ms = slow_request_ms
+        self.skip_body_paths = tuple(skip_body_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        method = scope["method"]
+        path = scope["path"]
+
+        capture_body = (
+            sampled
+            and method in BODY_METHODS
+            and not any(fragment in path for fragment in self.skip_body_paths)
+            and (self.log_body or _header(scope, LOG_BODY_HEADER) is not None)
+        )
+        body_chunks: list[bytes] = []
+        body_state = {"captured": 0, "truncated": False}
+        response_state = {"status": 0, "bytes_out": 0}
+
+        if capture_body:
+            async def receive_wrapper() -> Message:
+                message = await receive()
+                if message["type"] == "http.request":
+                    chunk = message.get("body", b"")
+                    room = self.body_max_bytes - body_state["captured"]
+                    if len(chunk) > room:
+                        body_state["truncated"] = True
+                        chunk = chunk[:max(room, 0)]
+                    if chunk:
+                        body_chunks.append(chunk)
+                        body_state["captured"] += len(chunk)
+                return message
+        else:
+            receive_wrapper = receive
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response_state["bytes_out"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception as e:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            logger.error(
+                f"[HTTP] {method} {path} error={type(e).__name__}: {e} "
+                f"duration_ms={duration_ms:.1f} {self._context(scope)}"
+            )
+            raise
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        status = response_state["status"]
+        is_slow = duration_ms >= self.slow_request_ms
+        if not (sampled or status >= 500 or is_slow):
+            return
+
+        level = logging.WARNING if status >= 500 or is_slow else logging.INFO
+        if not logger.logger.isEnabledFor(level):
+            return
+
+        line = (
+            f"[HTTP] {method} {path} status={status} duration_ms={duration_ms:.1f} "
+            f"bytes_out={response_state['bytes_out']} {self._context(scope)}"
+        )
+        if capture_body:
+            line += f" body={format_body(b''.join(body_chunks), body_state['truncated'])}"
+        if level == logging.WARNING:
+            logger.warning(line)
+        else:
+            logger.info(line)
+
+    @staticmethod
+    def _context(scope: Scope) -> str:
+        """Request id and client address, built only when a line is written."""
+        request_id = _header(scope, REQUEST_ID_HEADER) or uuid4().hex[:8]
+        client = scope.get("client")
+        return f"request_id={request_id} client={client[0] if client else 'unknown'}"
+
+
+class AdmissionControlMiddleware:
+    """
+    Reject requests with 429 and Retry-After before they queue too long.
+
+    Endpoints are matched by the first or last path segment, so "stream"
+    covers both /stream and /{agent_id}/stream, and "generate_business_plan"
+    covers /generate_business_plan/{agent_id}. Endpoints without limits pass
+    through untouched.
+
+    Args:
+        app: The wrapped ASGI application
+        limits: Endpoint -> {"max_concurrent": int, "max_wait_s": float};
+            either key may be omitted
+        wait_estimators: Callables taking the endpoint name and returning the
+            expected queueing delay in seconds (LLM scheduler, DB pool, ...)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: dict[str, dict[str, float]],
+        wait_estimators: Iterable[Callable[[str], float]] = (),
+    ) -> None:
+        self.app = app
+        self.limits = limits
+        self.wait_estimators = tuple(wait_estimators)
+        self.in_flight: dict[str, int] = {endpoint: 0 for endpoint in limits}
+        # Exponentially weighted mean request duration, for Retry-After on concurrency limits
+        self.avg_duration: dict[str, float] = {}
+
+    def endpoint_for(self, path: str) -> str | None:
+        segments = [segment for segment in path.split("/") if segment]
+        if not segments:
+            return None
+        if segments[-1] in self.limits:
+            return segments[-1]
+        if segments[0] in self.limits:
+            return segments[0]
+        return None
+
+    def estimate_wait(self, endpoint: str) -> float:
+        wait = 0.0
+        for estimator in self.wait_estimators:
+            try:
+                wait = max(wait, estimator(endpoint))
+            except Exception as e:
+                logger.debug("Admission wait estimator failed: %s", e)
+        return wait
+
+    def check(self, endpoint: str) -> tuple[str, int] | None:
+        """Return (reason, retry_after_seconds) if the request should be shed."""
+        limit = self.limits[endpoint]
+        max_concurrent = limit.get("max_concurrent")
+        if max_concurrent and self.in_flight[endpoint] >= max_concurrent:
+            return "concurrency", _retry_after(self.avg_duration.get(endpoint, 1.0))
+        max_wait = limit.get("max_wait_s")
+        if max_wait:
+            wait = self.estimate_wait(endpoint)
+            if wait > max_wait:
+                return "queue_wait", _retry_after(wait)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        endpoint = self.endpoint_for(scope["path"]) if scope["type"] == "http" else None
+        if endpoint is None or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        shed = self.check(endpoint)
+        if shed:
+            reason, retry_after = shed
+            REQUESTS_SHED.labels(endpoint, reason).inc()
+            logger.info("Shedding %s request (%s), Retry-After=%ds", endpoint, reason, retry_after)
+            await _send_too_many_requests(send, reason, retry_after)
+            return
+
+        self.in_flight[endpoint] += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight[endpoint] -= 1
+            duration = time.perf_counter() - start
+            previous = self.avg_duration.get(endpoint)
+            self.avg_duration[endpoint] = duration if previous is None else 0.8 * previous + 0.2 * duration
+
+
+def _retry_after(seconds: float) -> int:
+    return min(max(math.ceil(seconds), 1), 300)
+
+
+async def _send_too_many_requests(send: Send, reason: str, retry_after: int) -> None:
+    body = json.dumps({"detail": f"Server busy ({reason}), retry after {retry_after}s"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    """Return a request header value from the raw ASGI header list."""
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+__all__ = ["AdmissionControlMiddleware", "RequestLoggingMiddleware", "mask_sensitive_fields"]
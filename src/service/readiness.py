@@ -0,0 +1,199 @@
+"""
+Dependency probes for the `/ready` endpoint.
+
+Each probe checks one dependency (Postgres pool, checkpointer, Supabase,
+realtime worker, LLM provider, Langfuse) and its result is cached for
+READINESS_CACHE_TTL seconds, so load balancers polling every instance do not
+multiply outbound calls. Concurrent requests for an expired probe share a
+single check.
+
+Critical probes (Postgres pool, checkpointer) make the instance unavailable
+when they fail. The others are shared by every instance, so a failure only
+marks it degraded rather than pulling the whole fleet out of rotation.
+"""
+
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from core.logging_config import get_logger
+from core.settings import DatabaseType, settings
+
+logger = get_logger(__name__)
+
+Probe = Callable[[], Awaitable[dict[str, Any]]]
+
+# Checkpointer lookups use a thread that never exists
+READINESS_THREAD_ID = "00000000-0000-0000-0000-000000000000"
+
+_langfuse_client = None
+
+
+async def probe_postgres() -> dict[str, Any]:
+    """Pool stats from psycopg_pool plus one round trip."""
+    from memory import pg_manager
+
+    pool = pg_manager.pool
+    if pool is None:
+        raise RuntimeError("PostgreSQL pool is not initialized")
+    stats = pool.get_stats()
+    async with pool.connection() as conn:
+        await conn.execute("SELECT 1")
+    return {
+        "pool": {
+            key: stats.get(key, 0)
+            for key in ("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting")
+        }
+    }
+
+
+def probe_checkpointer(saver: Any) -> Probe:
+    async def probe() -> dict[str, Any]:
+        await saver.aget_tuple({"configurable": {"thread_id": READINESS_THREAD_ID, "checkpoint_ns": ""}})
+        return {}
+
+    return probe
+
+
+async def probe_supabase() -> dict[str, Any]:
+    """One-row PostgREST query (the client is synchronous, so off the event loop)."""
+    from integrations.supabase.supabase_client import get_supabase_client
+
+    def query() -> None:
+        get_supabase_client().table("section_states").select("id").limit(1).execute()
+
+    await asyncio.get_running_loop().run_in_executor(None, query)
+    return {}
+
+
+def probe_realtime(worker: Any) -> Probe:
+    async def probe() -> dict[str, Any]:
+        if not await worker.health_check():
+            raise RuntimeError("realtime listener is not connected")
+        return {"subscriptions": worker.get_subscription_count()}
+
+    return probe
+
+
+async def probe_llm() -> dict[str, Any]:
+    """
+    Reachability of each role's model (the instances the nodes use).
+
+    OpenAI-compatible clients are checked with models.list(), which costs no
+    tokens, once per endpoint however many roles use it; other providers only
+    have their model constructed.
+    """
+    from core.llm import LLMConfig, ModelRole, get_model
+
+    loop = asyncio.get_running_loop()
+    models = {}
+    checked: set[tuple[str, str]] = set()
+    for role in ModelRole:
+        model_name = LLMConfig.get_model_for_role(role)
+        model = await loop.run_in_executor(None, functools.partial(get_model, model_name, role=role))
+        client = getattr(model, "root_async_client", None)
+        if client is not None and (endpoint := (str(client.base_url), client.api_key)) not in checked:
+            checked.add(endpoint)
+            await client.models.list()
+        models[str(role)] = {"model": str(model_name), "reachability_checked": client is not None}
+    return {"models": models}
+
+
+async def probe_langfuse() -> dict[str, Any]:
+    """Langfuse auth check with a single shared client."""
+    global _langfuse_client
+    from langfuse import Langfuse  # type: ignore[import-untyped]
+
+    if _langfuse_client is None:
+        _langfuse_client = Langfuse()
+    if not await asyncio.get_running_loop().run_in_executor(None, _langfuse_client.auth_check):
+        raise RuntimeError("Langfuse auth check failed")
+    return {}
+
+
+class ReadinessProbes:
+    """
+    Run dependency probes with a per-probe TTL cache.
+
+    Args:
+        ttl: Seconds a probe result is reused
+        timeout: Per-probe timeout in seconds
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(self, ttl: float = 5.0, timeout: float = 3.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._clock = clock
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def probes_for(self, state: Any) -> dict[str, tuple[bool, Probe]]:
+        """Probes that apply to the current settings and app state: name -> (critical, probe)."""
+        probes: dict[str, tuple[bool, Probe]] = {}
+        if settings.DATABASE_TYPE == DatabaseType.POSTGRES:
+            probes["postgres"] = (True, probe_postgres)
+        saver = getattr(state, "checkpointer", None)
+        if saver is not None:
+            probes["checkpointer"] = (True, probe_checkpointer(saver))
+        if settings.SUPABASE_URL and settings.SUPABASE_SERVICE_ROLE_KEY:
+            probes["supabase"] = (False, probe_supabase)
+        worker = getattr(state, "realtime_worker", None)
+        if worker is not None:
+            probes["realtime"] = (False, probe_realtime(worker))
+        probes["llm"] = (False, probe_llm)
+        if settings.LANGFUSE_TRACING:
+            probes["langfuse"] = (False, probe_langfuse)
+        return probes
+
+    async def check(self, state: Any, names: Iterable[str] | None = None) -> dict[str, dict[str, Any]]:
+        """
+        Return probe results, running only the ones whose cache entry expired.
+
+        Args:
+            state: app.state (checkpointer, realtime_worker)
+            names: Restrict to these probes (default: all that apply)
+        """
+        probes = self.probes_for(state)
+        if names is not None:
+            wanted = set(names)
+            probes = {name: probe for name, probe in probes.items() if name in wanted}
+        results = await asyncio.gather(
+            *(self._cached(name, critical, probe) for name, (critical, probe) in probes.items())
+        )
+        return dict(zip(probes, results))
+
+    async def _cached(self, name: str, critical: bool, probe: Probe) -> dict[str, Any]:
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._cache.get(name)
+            if cached and self._clock() - cached[0] < self.ttl:
+                return cached[1]
+            result = await self._run(name, probe)
+            result["critical"] = critical
+            self._cache[name] = (self._clock(), result)
+            return result
+
+    async def _run(self, name: str, probe: Probe) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(probe(), timeout=self.timeout)
+            result: dict[str, Any] = {"status": "ok", **details}
+        except TimeoutError:
+            logger.warning(f"⚠️ Readiness probe '{name}' timed out after {self.timeout}s")
+            result = {"status": "timeout"}
+        except Exception as e:
+            logger.warning(f"⚠️ Readiness probe '{name}' failed: {e}")
+            result = {"status": "error", "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+
+def readiness_status(checks: dict[str, dict[str, Any]]) -> str:
+    """Overall status: ready, degraded (a non-critical probe failed) or unavailable."""
+    failed = [result for result in checks.values() if result["status"] != "ok"]
+    if any(result["critical"] for result in failed):
+        return "unavailable"
+    return "degraded" if failed else "ready"
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import json
 
@@ -12,7 +13,7 @@ from contextlib import asynccontextmanager
 from typing import Annotated, Any
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response, status
 from starlette.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
@@ -20,20 +21,30 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from langchain_core._api import LangChainBetaWarning
 from langchain_core.messages import AIMessage, AIMessageChunk, AnyMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
-from langfuse import Langfuse  # type: ignore[import-untyped]
 from langfuse.callback import CallbackHandler  # type: ignore[import-untyped]
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command, Interrupt
 from langsmith import Client as LangsmithClient
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from agents import DEFAULT_AGENT, AgentGraph, get_agent, get_all_agent_info
+from agents import DEFAULT_AGENT, AgentGraph, configure_agents, get_agent, get_all_agent_info
 from agents.founder_buddy.agent import initialize_founder_buddy_state
 from agents.founder_buddy.prompts import SECTION_TEMPLATES as FOUNDER_BUDDY_TEMPLATES
 from core import settings
+from core.diagnostics import MemoryDiagnostics, get_memory_diagnostics
+from core.logging_config import logging_registry_sizes
+from core.metrics import StreamTimer, render_metrics
 from core.settings import DatabaseType
 from integrations.dentapp.dentapp_utils import SECTION_ID_MAPPING, get_section_string_id
-from memory import initialize_database, initialize_store, pg_manager
+from memory import (
+    check_shared_memory,
+    initialize_database,
+    initialize_store,
+    instrument_checkpointer,
+    pg_manager,
+)
 from schema import (
+    BatchInvokeInput,
     ChatHistory,
     ChatHistoryInput,
     ChatMessage,
@@ -45,109 +56,22 @@ from schema import (
     StreamInput,
     UserInput,
 )
+from service.batch import run_batch
+from service.jobs import JobStatus, create_job_queue
+from service.middleware import AdmissionControlMiddleware, RequestLoggingMiddleware
+from service.readiness import ReadinessProbes, readiness_status
+from service.singleflight import single_flight, state_version
 from service.utils import (
     convert_message_content_to_string,
     langchain_to_chat_message,
     remove_tool_calls,
 )
+from service.warmup import Warmup, build_warmup_steps
 
 warnings.filterwarnings("ignore", category=LangChainBetaWarning)
 logger = get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all incoming frontend requests with detailed information."""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Generate unique request ID for tracking
-        request_id = str(uuid4())[:8]
-        start_time = time.time()
-        
-        # Log request details
-        logger.info(f"=== FRONTEND_REQUEST_START: {request_id} ===")
-        logger.info(f"FRONTEND_REQUEST: {request.method} {request.url}")
-        logger.info(f"FRONTEND_REQUEST: Client IP: {request.client.host if request.client else 'unknown'}")
-        logger.info(f"FRONTEND_REQUEST: User-Agent: {request.headers.get('user-agent', 'unknown')}")
-        logger.info(f"FRONTEND_REQUEST: Content-Type: {request.headers.get('content-type', 'unknown')}")
-        
-        # Log all headers (excluding sensitive ones)
-        sensitive_headers = {'authorization', 'cookie', 'x-api-key'}
-        headers_to_log = {
-            k: v for k, v in request.headers.items() 
-            if k.lower() not in sensitive_headers
-        }
-        logger.info(f"FRONTEND_REQUEST: Headers: {headers_to_log}")
-        
-        # Log query parameters
-        if request.query_params:
-            logger.info(f"FRONTEND_REQUEST: Query params: {dict(request.query_params)}")
-        
-        # Log request body for POST/PUT requests, but skip for streaming endpoints
-        is_streaming_endpoint = "/stream" in str(request.url.path)
-        if request.method in ["POST", "PUT", "PATCH"] and not is_streaming_endpoint:
-            try:
-                # Use the safer approach for non-streaming endpoints
-                body = await request.body()
-                if body:
-                    # Try to parse as JSON for better logging
-                    try:
-                        body_json = json.loads(body.decode('utf-8'))
-                        # Mask sensitive fields
-                        masked_body = mask_sensitive_fields(body_json)
-                        logger.info(f"FRONTEND_REQUEST: Body (JSON): {json.dumps(masked_body, ensure_ascii=False)}")
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        # Log as raw text if not JSON
-                        body_str = body.decode('utf-8', errors='replace')[:1000]  # Limit size
-                        logger.info(f"FRONTEND_REQUEST: Body (raw): {body_str}")
-                else:
-                    logger.info("FRONTEND_REQUEST: Body: (empty)")
-                    
-            except Exception as e:
-                logger.warning(f"FRONTEND_REQUEST: Could not read body: {e}")
-        elif is_streaming_endpoint:
-            # For streaming endpoints, just log that we're skipping body logging
-            logger.info("FRONTEND_REQUEST: Body: (skipped for streaming endpoint)")
-        
-        # Process the request
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            
-            # Log response details
-            logger.info(f"=== FRONTEND_RESPONSE_END: {request_id} ===")
-            logger.info(f"FRONTEND_RESPONSE: Status: {response.status_code}")
-            logger.info(f"FRONTEND_RESPONSE: Processing time: {process_time:.3f}s")
-            logger.info(f"FRONTEND_RESPONSE: Content-Type: {response.headers.get('content-type', 'unknown')}")
-            
-            return response
-            
-        except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(f"=== FRONTEND_REQUEST_ERROR: {request_id} ===")
-            logger.error(f"FRONTEND_ERROR: {str(e)}")
-            logger.error(f"FRONTEND_ERROR: Processing time: {process_time:.3f}s")
-            raise
-
-
-def mask_sensitive_fields(data: dict | list | Any) -> dict | list | Any:
-    """Mask sensitive fields in request data for logging."""
-    if isinstance(data, dict):
-        masked = {}
-        for key, value in data.items():
-            key_lower = key.lower()
-            if any(sensitive in key_lower for sensitive in ['password', 'token', 'secret', 'key', 'auth']):
-                masked[key] = "***MASKED***"
-            elif isinstance(value, (dict, list)):
-                masked[key] = mask_sensitive_fields(value)
-            else:
-                masked[key] = value
-        return masked
-    elif isinstance(data, list):
-        return [mask_sensitive_fields(item) for item in data]
-    else:
-        return data
-
-
 def verify_bearer(
     http_auth: Annotated[
         HTTPAuthorizationCredentials | None,
@@ -161,12 +85,106 @@ def verify_bearer(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
 
+def _preload_agent_ids() -> list[str]:
+    """Agent IDs to compile during startup, from settings.PRELOAD_AGENTS."""
+    value = settings.PRELOAD_AGENTS.strip().lower()
+    all_ids = [a.key for a in get_all_agent_info()]
+    if value == "all":
+        return all_ids
+    if value == "none":
+        return []
+    requested = [agent_id.strip() for agent_id in settings.PRELOAD_AGENTS.split(",") if agent_id.strip()]
+    unknown = [agent_id for agent_id in requested if agent_id not in all_ids]
+    if unknown:
+        logger.warning(f"⚠️ PRELOAD_AGENTS: ignoring unknown agents {unknown}")
+    return [agent_id for agent_id in requested if agent_id in all_ids]
+
+
+def _configure_agents_and_warm_up(app: FastAPI, saver: Any, store: Any) -> None:
+    """
+    Attach memory components to the agents, start the readiness warm-up and
+    the background job workers.
+
+    With WARMUP_ENABLED, preloaded agents are compiled by the background
+    warm-up alongside the other steps; otherwise they are compiled here and
+    the service is ready immediately.
+    """
+    check_shared_memory(saver, store)
+    preload = _preload_agent_ids()
+    if settings.WARMUP_ENABLED:
+        configure_agents(saver, store)
+        warmup = Warmup(build_warmup_steps(preload), timeout=settings.WARMUP_TIMEOUT)
+    else:
+        configure_agents(saver, store, preload=preload)
+        warmup = Warmup({})
+    app.state.checkpointer = saver
+    app.state.warmup = warmup
+    warmup.start()
+    if settings.JOBS_ENABLED:
+        app.state.jobs = create_job_queue()
+        app.state.jobs.start()
+    diagnostics = get_memory_diagnostics()
+    if diagnostics is not None:
+        _register_memory_registries(diagnostics, app, saver, store)
+
+
+def _register_memory_registries(diagnostics: MemoryDiagnostics, app: FastAPI, saver: Any, store: Any) -> None:
+    """Report the sizes of state the process keeps for its lifetime at /debug/memory."""
+    inner_saver = getattr(saver, "saver", saver)  # unwrap InstrumentedCheckpointSaver
+    if isinstance(inner_saver, InMemorySaver):
+        diagnostics.register("checkpointer.threads", lambda: len(inner_saver.storage))
+        diagnostics.register("checkpointer.writes", lambda: len(inner_saver.writes))
+        diagnostics.register("checkpointer.blobs", lambda: len(inner_saver.blobs))
+    if isinstance(store, InMemoryStore):
+        diagnostics.register("store.items", lambda: sum(len(items) for items in store._data.values()))
+    diagnostics.register("singleflight.in_flight", single_flight.in_flight)
+    diagnostics.register("logging.smart_loggers", lambda: logging_registry_sizes()["smart_loggers"])
+    diagnostics.register("logging.rate_limit_buckets", lambda: logging_registry_sizes()["rate_limit_buckets"])
+    if settings.LLM_CACHE_ENABLED and settings.LLM_CACHE_BACKEND == "memory":
+        from core.llm_cache import get_llm_cache
+
+        diagnostics.register("llm_cache.entries", lambda: len(get_llm_cache().backend))
+
+    def realtime(size: Any) -> Any:
+        def measure() -> int | None:
+            worker = getattr(app.state, "realtime_worker", None)
+            return size(worker) if worker is not None else None
+
+        return measure
+
+    diagnostics.register("realtime.subscriptions", realtime(lambda worker: len(worker.subscriptions)))
+    diagnostics.register(
+        "realtime.processed_events",
+        realtime(lambda worker: len(worker.processor.processed_events) if worker.processor else 0),
+    )
+    diagnostics.register(
+        "realtime.processed_events_bytes",
+        realtime(lambda worker: worker.processor.processed_events.memory_bytes() if worker.processor else 0),
+    )
+    diagnostics.register(
+        "realtime.queued_events",
+        realtime(lambda worker: sum(map(len, worker.processor.event_queues.values())) if worker.processor else 0),
+    )
+
+
+async def _stop_jobs(app: FastAPI) -> None:
+    """Stop the job workers before the database they use goes away."""
+    jobs = getattr(app.state, "jobs", None)
+    if jobs is not None:
+        await jobs.stop()
+        app.state.jobs = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     Configurable lifespan that initializes the appropriate database checkpointer and store
     based on settings.
     """
+    diagnostics = get_memory_diagnostics()
+    if diagnostics is not None:
+        diagnostics.start()
+
     # Initialize Realtime worker if enabled
     realtime_worker = None
     if settings.USE_SUPABASE_REALTIME:
@@ -184,18 +202,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if settings.DATABASE_TYPE == DatabaseType.POSTGRES:
             # Initialize PostgreSQL connection pool
             await pg_manager.setup()
-            saver = pg_manager.get_saver()
+            saver = instrument_checkpointer(pg_manager.get_saver())
             store = pg_manager.get_store()
             
-            # Configure all agents
-            agents = get_all_agent_info()
-            for a in agents:
-                agent = get_agent(a.key)
-                agent.checkpointer = saver
-                agent.store = store
+            # Configure all agents (compiled now if preloaded, otherwise on first use)
+            _configure_agents_and_warm_up(app, saver, store)
             
             logger.info("Application startup complete with PostgreSQL connection pool")
             yield
+            await _stop_jobs(app)
             
             # Clean up connection pool
             await pg_manager.cleanup()
@@ -209,26 +224,54 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                 if hasattr(store, "setup"):  # ignore: union-attr
                     await store.setup()
 
-                # Configure agents with both memory components
-                agents = get_all_agent_info()
-                for a in agents:
-                    agent = get_agent(a.key)
-                    # Set checkpointer for thread-scoped memory (conversation history)
-                    agent.checkpointer = saver
-                    # Set store for long-term memory (cross-conversation knowledge)
-                    agent.store = store
+                # Configure agents with both memory components:
+                # checkpointer for thread-scoped memory (conversation history),
+                # store for long-term memory (cross-conversation knowledge)
+                _configure_agents_and_warm_up(app, instrument_checkpointer(saver), store)
                 yield
+                await _stop_jobs(app)
     except Exception as e:
         logger.error(f"Error during database/store initialization: {e}")
         raise
     finally:
+        warmup = getattr(app.state, "warmup", None)
+        if warmup:
+            await warmup.stop()
+        if settings.LLM_CACHE_ENABLED:
+            from core.llm_cache import get_llm_cache
+
+            await get_llm_cache().backend.close()
         # Stop Realtime worker on shutdown
         if realtime_worker:
             await realtime_worker.stop()
             logger.info("✅ Realtime worker stopped")
+        if diagnostics is not None:
+            await diagnostics.stop()
 
 
 app = FastAPI(lifespan=lifespan)
+readiness_probes = ReadinessProbes(ttl=settings.READINESS_CACHE_TTL, timeout=settings.READINESS_PROBE_TIMEOUT)
+
+def _llm_queue_wait(endpoint: str) -> float:
+    """Expected LLM scheduler wait for a new request to `endpoint`."""
+    from core.llm import LLMConfig, LLMPriority, ModelRole, get_llm_scheduler, provider_for_model
+
+    if endpoint == "generate_business_plan":
+        role, priority = ModelRole.BUSINESS_PLAN, LLMPriority.BACKGROUND
+    else:
+        role, priority = ModelRole.REPLY, LLMPriority.INTERACTIVE
+    # The provider the endpoint's calls are routed to (LLM_ROLE_MODELS may differ per role)
+    provider = provider_for_model(LLMConfig.get_model_for_role(role))
+    return get_llm_scheduler().estimate_wait(provider, priority)
+
+
+# Shed load before it queues (innermost, so 429s still get CORS headers and are logged)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limits=settings.ADMISSION_LIMITS,
+        wait_estimators=[_llm_queue_wait, lambda endpoint: pg_manager.estimate_wait()],
+    )
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -239,8 +282,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add request logging middleware
-app.add_middleware(RequestLoggingMiddleware)
+# Add request logging middleware (one line per request, sampled)
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=settings.REQUEST_LOG_SAMPLE_RATE,
+    log_body=settings.REQUEST_LOG_BODY,
+    body_max_bytes=settings.REQUEST_LOG_BODY_MAX_BYTES,
+    slow_request_ms=settings.REQUEST_LOG_SLOW_MS,
+)
 
 router = APIRouter(dependencies=[Depends(verify_bearer)])
 
@@ -506,14 +555,56 @@ async def invoke(user_input: UserInput, agent_id: str = DEFAULT_AGENT) -> Invoke
         raise HTTPException(status_code=500, detail="Unexpected error")
 
 
+@router.post("/{agent_id}/invoke_batch", response_class=StreamingResponse)
+@router.post("/invoke_batch", response_class=StreamingResponse)
+async def invoke_batch(batch: BatchInvokeInput, agent_id: str = DEFAULT_AGENT) -> StreamingResponse:
+    """
+    Invoke an agent for many inputs, e.g. scripted conversations for regression
+    checks and backfills.
+
+    Items run concurrently (at most `max_concurrency`, capped by
+    BATCH_MAX_CONCURRENCY); items sharing a thread_id run in list order.
+    Results stream back as NDJSON, one BatchInvokeResult per line, as items
+    finish; `index` refers to the item's position in the request.
+    """
+    if len(batch.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch has {len(batch.items)} items; the limit is {settings.BATCH_MAX_ITEMS}",
+        )
+    try:
+        get_agent(agent_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown agent: {agent_id}")
+
+    max_concurrency = min(batch.max_concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    logger.info(f"📦 Batch invoke: agent_id={agent_id}, items={len(batch.items)}, concurrency={max_concurrency}")
+
+    async def invoke_one(item: UserInput) -> InvokeResponse:
+        return await invoke(item, agent_id)
+
+    async def lines() -> AsyncGenerator[str, None]:
+        async for result in run_batch(batch.items, invoke_one, max_concurrency):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 async def message_generator(
-    user_input: StreamInput, agent_id: str = DEFAULT_AGENT, request: Request | None = None
+    user_input: StreamInput,
+    agent_id: str = DEFAULT_AGENT,
+    request: Request | None = None,
+    accepted_at: float | None = None,
 ) -> AsyncGenerator[str, None]:
     """
     Generate a stream of messages from the agent.
 
     This is the workhorse method for the /stream endpoint.
+    Time-to-first-token and inter-token latency are measured from `accepted_at`
+    (time.perf_counter() when the request was accepted), exported as metrics and
+    sent to the client in the final `section` event under `timing`.
     """
+    stream_timer = StreamTimer(agent_id, accepted_at)
     # Log stream request summary
     thread_id_display = user_input.thread_id if user_input.thread_id else 'new'
     logger.info(f"[STREAM] Start: agent={agent_id}, user={user_input.user_id}, thread_id={thread_id_display}")
@@ -675,14 +766,13 @@ async def message_generator(
                     processed_messages.append(_create_ai_message(current_message))
 
             for message in processed_messages:
-                # TEMP DEBUG: print the raw message structure to diagnose content KeyError
-                logger.info(f"🪵 RAW_MESSAGE: {repr(message)}")
+                logger.debug("🪵 RAW_MESSAGE: %r", message)
                 
                 try:
                     # FIX: Skip processing for internal, content-less messages from structured_output calls
                     if isinstance(message, AIMessage) and not message.content:
                         if message.tool_calls or message.invalid_tool_calls:
-                            logger.info(f"🚫 SKIPPING internal tool_call message: {repr(message)}")
+                            logger.debug("🚫 SKIPPING internal tool_call message: %r", message)
                             continue
                     
                     # Skip messages that appear to be internal data extraction results
@@ -721,12 +811,12 @@ async def message_generator(
                             'project_description', 'aim_statement', 'vision_approach', 'bigger_vision', 'game_statement',
                         ]
                         if any(field in content_lower for field in extraction_fields):
-                            logger.debug(f"Skipping potential extraction data message: {message.content[:50]}...")
+                            logger.debug("Skipping potential extraction data message: %.50s...", message.content)
                             continue
 
-                    logger.info(f"🔧 CONVERTING message type: {type(message).__name__}")
+                    logger.debug("🔧 CONVERTING message type: %s", type(message).__name__)
                     chat_message = langchain_to_chat_message(message)
-                    logger.info(f"✅ CONVERSION SUCCESS for {type(message).__name__}")
+                    logger.debug("✅ CONVERSION SUCCESS for %s", type(message).__name__)
                     chat_message.run_id = str(run_id)
                 except Exception as e:
                     logger.error(f"❌ CONVERSION FAILED: {e}")
@@ -746,7 +836,7 @@ async def message_generator(
                 # Skip messages with internal tags
                 tags = metadata.get("tags", [])
                 if any(tag in tags for tag in ["skip_stream", "internal_extraction", "do_not_stream", "internal_decision"]):
-                    logger.debug(f"Skipping message with internal tags: {tags}")
+                    logger.debug("Skipping message with internal tags: %s", tags)
                     continue
                 # Only process AIMessageChunk for token streaming
                 if not isinstance(msg, AIMessageChunk):
@@ -756,6 +846,7 @@ async def message_generator(
                     # Empty content in the context of OpenAI usually means
                     # that the model is asking for a tool to be invoked.
                     # So we only print non-empty content.
+                    stream_timer.token()
                     yield f"data: {json.dumps({'type': 'token', 'content': convert_message_content_to_string(content)})}\n\n"
     except Exception as e:
         import traceback
@@ -763,6 +854,12 @@ async def message_generator(
         logger.error(f"[STREAM ERROR TRACEBACK]\n{traceback.format_exc()}")
         yield f"data: {json.dumps({'type': 'error', 'content': 'Internal server error'})}\n\n"
     finally:
+        timing = stream_timer.finish()
+        logger.stream_summary(
+            timing["tokens"], timing["total_ms"] / 1000,
+            ttft=timing["ttft_ms"] / 1000 if timing["ttft_ms"] is not None else None,
+        )
+
         # Always send section data at the end of the stream
         try:
             state = await agent.aget_state(config=kwargs["config"])
@@ -793,6 +890,7 @@ async def message_generator(
                     "database_id": SECTION_ID_MAPPING.get(current_section_id),
                     "name": section_template.name if section_template else "Unknown Section",
                     "status": section_state.status.value if section_state else "pending",
+                    "timing": timing,
                 }
                 yield f"data: {json.dumps({'type': 'section', 'content': section_data})}\n\n"
         except Exception as e:
@@ -845,8 +943,9 @@ async def stream(user_input: StreamInput, agent_id: str = DEFAULT_AGENT, request
 
     Set `stream_tokens=false` to return intermediate messages but not token-by-token.
     """
+    accepted_at = time.perf_counter()
     return StreamingResponse(
-        message_generator(user_input, agent_id, request),
+        message_generator(user_input, agent_id, request, accepted_at=accepted_at),
         media_type="text/event-stream",
     )
 
@@ -1041,6 +1140,14 @@ async def sync_section(
     )
 
 
+def _section_status_value(section_state: Any) -> str:
+    """Return the status string of a section state (model or dict), or "not_in_state"."""
+    if section_state is None:
+        return "not_in_state"
+    status_value = section_state.get("status") if isinstance(section_state, dict) else section_state.status
+    return status_value.value if hasattr(status_value, "value") else str(status_value)
+
+
 @router.get("/check_agent_state/{agent_id}")
 async def check_agent_state(
     agent_id: str,
@@ -1051,11 +1158,12 @@ async def check_agent_state(
     """
     Check if agent has read the latest database updates.
     
-    This endpoint compares:
-    1. Current section content in Supabase database
-    2. Current section content in LangGraph agent state
+    This endpoint compares content hashes of:
+    1. Section and business plan rows in Supabase (content_hash column)
+    2. Section states and business plan in LangGraph agent state
     
-    Returns a comparison showing if they match.
+    Only the hashes are read from the database; full text is fetched solely for
+    sections that differ, so the response time does not grow with document size.
     
     Args:
         agent_id: Agent identifier (e.g., "founder-buddy")
@@ -1092,189 +1200,91 @@ async def check_agent_state(
         agent_state = state_snapshot.values
         agent_section_states = agent_state.get("section_states", {})
         
-        # Get database state from Supabase
-        from integrations.supabase.supabase_client import SupabaseClient
+        # Get database hashes from Supabase (Supabase client is synchronous)
+        import asyncio
+
+        from integrations.supabase import (
+            SupabaseClient,
+            compute_content_hash,
+            section_content_hash,
+            section_text,
+        )
         client = SupabaseClient()
+        loop = asyncio.get_event_loop()
         
-        # Build query
-        query = client.client.table("section_states")\
-            .select("*")\
-            .eq("user_id", user_id)\
-            .eq("thread_id", thread_id)\
-            .eq("agent_id", agent_id)
+        db_section_hashes = await loop.run_in_executor(
+            None,
+            lambda: client.get_section_hashes(user_id, thread_id, agent_id=agent_id, section_id=section_id)
+        )
+        db_sections_by_id = {s["section_id"]: s for s in db_section_hashes}
         
         if section_id:
-            query = query.eq("section_id", section_id)
-        
-        result = query.execute()
-        db_section_states = result.data if result.data else []
+            section_ids = [section_id]
+        else:
+            section_ids = sorted(set(db_sections_by_id) | set(agent_section_states))
         
-        # Compare database vs agent state
+        # Compare hashes; collect sections that need a full-text look
         comparison = []
-        
-        if section_id:
-            # Check specific section
-            db_state = next((s for s in db_section_states if s["section_id"] == section_id), None)
-            agent_state_data = agent_section_states.get(section_id)
+        differing: list[str] = []
+        for sid in section_ids:
+            db_row = db_sections_by_id.get(sid)
+            agent_section = agent_section_states.get(sid)
+            agent_hash = section_content_hash(agent_section)
+            db_hash = db_row.get("content_hash") if db_row else None
+            match = bool(db_hash and agent_hash) and db_hash == agent_hash
             
-            if db_state:
-                db_content = db_state.get("content", {})
-                db_plain_text = db_state.get("plain_text", "")
-                db_updated = db_state.get("updated_at")
-                
-                if agent_state_data:
-                    # agent_state_data is a SectionState Pydantic model, not a dict
-                    agent_content = agent_state_data.content
-                    if agent_content:
-                        agent_plain_text = agent_content.plain_text or ""
-                        # Extract text from TiptapDocument if needed
-                        if hasattr(agent_content, 'content') and agent_content.content:
-                            # Try to extract text from Tiptap structure
-                            def get_text_from_tiptap(node):
-                                if hasattr(node, 'content') and node.content:
-                                    if hasattr(node, 'text'):
-                                        return node.text
-                                    return "".join(get_text_from_tiptap(c) for c in node.content)
-                                return ""
-                            agent_plain_text = "".join(get_text_from_tiptap(p) for p in agent_content.content.content) if agent_content.content.content else agent_plain_text
-                    else:
-                        agent_plain_text = ""
-                    agent_status = agent_state_data.status.value if hasattr(agent_state_data.status, 'value') else str(agent_state_data.status)
-                else:
-                    agent_content = None
-                    agent_plain_text = ""
-                    agent_status = "not_in_state"
-                
-                # Extract text for comparison
-                def extract_text(data):
-                    if isinstance(data, str):
-                        return data
-                    if isinstance(data, dict):
-                        if "plain_text" in data:
-                            return data["plain_text"]
-                        if "text" in data:
-                            return data["text"]
-                        # Try to extract from Tiptap structure
-                        if "content" in data and isinstance(data["content"], list):
-                            def get_text(node):
-                                if isinstance(node, dict):
-                                    if "text" in node:
-                                        return node["text"]
-                                    if "content" in node:
-                                        return "".join(get_text(c) for c in node["content"])
-                                return ""
-                            return "".join(get_text(n) for n in data["content"])
-                    return ""
-                
-                db_text = extract_text(db_content) or db_plain_text
-                agent_text = agent_plain_text or extract_text(agent_content)
-                
-                comparison.append({
-                    "section_id": section_id,
-                    "database": {
-                        "has_content": bool(db_content),
-                        "text_preview": db_text[:200] if db_text else None,
-                        "text_length": len(db_text),
-                        "updated_at": db_updated,
-                    },
-                    "agent_state": {
-                        "has_content": bool(agent_content),
-                        "text_preview": agent_text[:200] if agent_text else None,
-                        "text_length": len(agent_text),
-                        "status": agent_status,
-                    },
-                    "match": db_text.strip() == agent_text.strip() if (db_text and agent_text) else False,
-                    "synced": bool(agent_content) and db_text.strip() == agent_text.strip(),
+            entry: dict[str, Any] = {
+                "section_id": sid,
+                "database": {"has_content": bool(db_hash)},
+                "agent_state": {
+                    "has_content": bool(agent_hash),
+                    "content_hash": agent_hash,
+                    "status": _section_status_value(agent_section),
+                },
+                "match": match,
+                "synced": match,
+            }
+            if db_row:
+                entry["database"].update({
+                    "content_hash": db_hash,
+                    "updated_at": db_row.get("updated_at"),
                 })
-            else:
-                comparison.append({
-                    "section_id": section_id,
-                    "database": {"has_content": False},
-                    "agent_state": {
-                        "has_content": bool(agent_state_data),
-                        "status": agent_state_data.status.value if agent_state_data and hasattr(agent_state_data.status, 'value') else (str(agent_state_data.status) if agent_state_data else "not_in_state"),
-                    },
-                    "match": False,
-                    "synced": False,
-                    "message": "Section not found in database",
+                if not match:
+                    differing.append(sid)
+            elif section_id:
+                entry["message"] = "Section not found in database"
+            comparison.append(entry)
+        
+        # Fetch full text only for the sections that differ
+        if differing:
+            db_texts = await loop.run_in_executor(
+                None,
+                lambda: client.get_section_texts(user_id, thread_id, differing, agent_id=agent_id)
+            )
+            db_texts_by_id = {s["section_id"]: s.get("plain_text") or "" for s in db_texts}
+            for entry in comparison:
+                sid = entry["section_id"]
+                if sid not in differing:
+                    continue
+                db_text = db_texts_by_id.get(sid, "")
+                agent_text = section_text(agent_section_states.get(sid))
+                # Rows written before the content_hash column existed have no hash yet
+                db_hash = entry["database"]["content_hash"] or compute_content_hash(db_text)
+                match = bool(db_hash and entry["agent_state"]["content_hash"]) and db_hash == entry["agent_state"]["content_hash"]
+                entry["database"].update({
+                    "has_content": bool(db_text),
+                    "content_hash": db_hash,
+                    "text_preview": db_text[:200] if db_text else None,
+                    "text_length": len(db_text),
                 })
-        else:
-            # Check all sections
-            db_sections_by_id = {s["section_id"]: s for s in db_section_states}
-            
-            all_section_ids = set(list(db_sections_by_id.keys()) + list(agent_section_states.keys()))
-            
-            for sid in all_section_ids:
-                db_state = db_sections_by_id.get(sid)
-                agent_state_data = agent_section_states.get(sid)
-                
-                if db_state:
-                    db_content = db_state.get("content", {})
-                    db_plain_text = db_state.get("plain_text", "")
-                    db_updated = db_state.get("updated_at")
-                    
-                    def extract_text(data):
-                        if isinstance(data, str):
-                            return data
-                        if isinstance(data, dict):
-                            if "plain_text" in data:
-                                return data["plain_text"]
-                            if "text" in data:
-                                return data["text"]
-                        return ""
-                    
-                    db_text = extract_text(db_content) or db_plain_text
-                    
-                    if agent_state_data:
-                        # agent_state_data is a SectionState Pydantic model, not a dict
-                        agent_content = agent_state_data.content
-                        if agent_content:
-                            agent_plain_text = agent_content.plain_text or ""
-                            # Extract text from TiptapDocument if needed
-                            if hasattr(agent_content, 'content') and agent_content.content:
-                                def get_text_from_tiptap(node):
-                                    if hasattr(node, 'content') and node.content:
-                                        if hasattr(node, 'text'):
-                                            return node.text
-                                        return "".join(get_text_from_tiptap(c) for c in node.content)
-                                    return ""
-                                agent_plain_text = "".join(get_text_from_tiptap(p) for p in agent_content.content.content) if agent_content.content.content else agent_plain_text
-                        else:
-                            agent_plain_text = ""
-                        agent_text = agent_plain_text or extract_text(agent_content) if agent_content else ""
-                        agent_status = agent_state_data.status.value if hasattr(agent_state_data.status, 'value') else str(agent_state_data.status)
-                    else:
-                        agent_text = ""
-                        agent_status = "not_in_state"
-                    
-                    comparison.append({
-                        "section_id": sid,
-                        "database": {
-                            "has_content": bool(db_content),
-                            "text_length": len(db_text),
-                            "updated_at": db_updated,
-                        },
-                        "agent_state": {
-                            "has_content": bool(agent_state_data),
-                            "text_length": len(agent_text),
-                            "status": agent_status,
-                        },
-                        "match": db_text.strip() == agent_text.strip() if (db_text and agent_text) else False,
-                        "synced": bool(agent_state_data) and db_text.strip() == agent_text.strip(),
-                    })
-                else:
-                    comparison.append({
-                        "section_id": sid,
-                        "database": {"has_content": False},
-                    "agent_state": {
-                        "has_content": bool(agent_state_data),
-                        "status": agent_state_data.status.value if agent_state_data and hasattr(agent_state_data.status, 'value') else (str(agent_state_data.status) if agent_state_data else "not_in_state"),
-                    },
-                        "match": False,
-                        "synced": False,
-                    })
+                entry["agent_state"].update({
+                    "text_preview": agent_text[:200] if agent_text else None,
+                    "text_length": len(agent_text),
+                })
+                entry["match"] = match
+                entry["synced"] = match
         
-        # Check business_plan from business_plans table
+        # Check business_plan hash from business_plans table
         business_plan_comparison = {
             "database": {"has_content": False},
             "agent_state": {"has_content": False},
@@ -1282,42 +1292,35 @@ async def check_agent_state(
             "synced": False,
         }
         try:
-            bp_result = client.client.table("business_plans")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .eq("thread_id", thread_id)\
-                .eq("agent_id", agent_id)\
-                .maybe_single()\
-                .execute()
-            
-            db_business_plan = bp_result.data if bp_result.data else None
-            agent_business_plan = agent_state.get("business_plan")
-            
-            # Always create comparison, even if both are None
-            db_bp_content = db_business_plan.get("content") if db_business_plan else None
-            db_bp_markdown = db_business_plan.get("markdown_content") if db_business_plan else None
-            db_bp_text = db_bp_markdown or db_bp_content or ""
-            
-            agent_bp_text = agent_business_plan or ""
+            db_business_plan = await loop.run_in_executor(
+                None,
+                lambda: client.get_business_plan_hash(user_id, thread_id, agent_id=agent_id)
+            )
+            agent_bp_hash = agent_state.get("business_plan_hash") or compute_content_hash(agent_state.get("business_plan"))
+            db_bp_hash = db_business_plan.get("content_hash") if db_business_plan else None
             
-            # Normalize for comparison (strip whitespace)
-            db_bp_text_normalized = db_bp_text.strip() if db_bp_text else ""
-            agent_bp_text_normalized = agent_bp_text.strip() if agent_bp_text else ""
+            if db_business_plan and not db_bp_hash:
+                # Legacy row without a stored hash: fall back to hashing the text once
+                full_plan = await loop.run_in_executor(
+                    None,
+                    lambda: client.get_business_plan(user_id, thread_id)
+                )
+                if full_plan:
+                    db_bp_hash = compute_content_hash(full_plan.get("markdown_content") or full_plan.get("content"))
             
+            bp_match = bool(db_bp_hash and agent_bp_hash) and db_bp_hash == agent_bp_hash
             business_plan_comparison = {
                 "database": {
-                    "has_content": bool(db_bp_text),
-                    "text_length": len(db_bp_text),
-                    "text_preview": db_bp_text[:500] if db_bp_text else None,
+                    "has_content": bool(db_bp_hash),
+                    "content_hash": db_bp_hash,
                     "updated_at": db_business_plan.get("updated_at") if db_business_plan else None,
                 },
                 "agent_state": {
-                    "has_content": bool(agent_bp_text),
-                    "text_length": len(agent_bp_text),
-                    "text_preview": agent_bp_text[:500] if agent_bp_text else None,
+                    "has_content": bool(agent_bp_hash),
+                    "content_hash": agent_bp_hash,
                 },
-                "match": db_bp_text_normalized == agent_bp_text_normalized if (db_bp_text_normalized and agent_bp_text_normalized) else False,
-                "synced": bool(agent_bp_text) and db_bp_text_normalized == agent_bp_text_normalized,
+                "match": bp_match,
+                "synced": bp_match,
             }
         except Exception as e:
             logger.warning(f"Could not check business_plan: {e}")
@@ -1338,17 +1341,13 @@ async def check_agent_state(
                 "synced_sections": synced_count,
                 "unsynced_sections": total_count - synced_count,
                 "all_synced": synced_count == total_count and total_count > 0,
+                "business_plan_synced": business_plan_comparison["synced"],
             },
             "comparison": comparison,
+            # Always include business_plan comparison
+            "business_plan": business_plan_comparison,
         }
         
-        # Always include business_plan comparison
-        result["business_plan"] = business_plan_comparison
-        if business_plan_comparison.get("synced"):
-            result["summary"]["business_plan_synced"] = True
-        else:
-            result["summary"]["business_plan_synced"] = False
-        
         return result
         
     except Exception as e:
@@ -1592,21 +1591,66 @@ async def refine_section(
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check. Does not probe dependencies (see /ready)."""
 
     health_status = {"status": "ok"}
 
     if settings.LANGFUSE_TRACING:
-        try:
-            langfuse = Langfuse()
-            health_status["langfuse"] = "connected" if langfuse.auth_check() else "disconnected"
-        except Exception as e:
-            logger.error(f"Langfuse connection error: {e}")
-            health_status["langfuse"] = "disconnected"
+        # Cached, off-loop auth check shared with /ready
+        checks = await readiness_probes.check(app.state, names=["langfuse"])
+        health_status["langfuse"] = "connected" if checks["langfuse"]["status"] == "ok" else "disconnected"
 
     return health_status
 
 
+@app.get("/ready")
+async def readiness_check(response: Response) -> dict[str, Any]:
+    """
+    Readiness probe: 503 until the startup warm-up has finished or while a
+    critical dependency (Postgres pool, checkpointer) is failing. Dependency
+    checks are cached for READINESS_CACHE_TTL seconds.
+    """
+    warmup: Warmup | None = getattr(app.state, "warmup", None)
+    if warmup is None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return warmup.status()
+
+    checks = await readiness_probes.check(app.state)
+    body = warmup.status()
+    body["status"] = readiness_status(checks)
+    body["checks"] = checks
+    if body["status"] == "unavailable":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return body
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics (graph node, LLM, Supabase, checkpointer and DentApp timings)."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
+@router.get("/debug/memory")
+async def debug_memory(limit: int = 20, since_start: bool = True) -> dict[str, Any]:
+    """
+    Memory diagnostics (DIAGNOSTICS_ENABLED): RSS, top allocation sites and
+    the sizes of in-process registries over time.
+
+    Args:
+        limit: Allocation sites returned
+        since_start: Rank sites by growth since startup instead of current size
+    """
+    diagnostics = get_memory_diagnostics()
+    if diagnostics is None:
+        raise HTTPException(status_code=404, detail="Memory diagnostics are disabled (DIAGNOSTICS_ENABLED)")
+    # Snapshots and their comparison take seconds on a large traced heap
+    return await asyncio.to_thread(diagnostics.report, limit, since_start)
+
+
 @router.post("/realtime/subscribe")
 async def subscribe_to_realtime(
     request: Request,
@@ -1661,29 +1705,29 @@ async def subscribe_to_realtime(
         }
     
     try:
+        from integrations.supabase.realtime_worker import SubscriptionResult
+
         realtime_worker = request.app.state.realtime_worker
         
-        # Check if already subscribed
-        if thread_id in realtime_worker.subscriptions:
-            logger.info(f"Already subscribed to thread {thread_id}")
-            return {
-                "success": True,
-                "message": "Already subscribed",
-                "thread_id": thread_id,
-                "subscription_count": realtime_worker.get_subscription_count()
-            }
-        
-        # Subscribe
-        await realtime_worker.subscribe_to_thread(
+        # Subscribe (or find out that this worker or another one already has it)
+        result = await realtime_worker.subscribe_to_thread(
             user_id=user_id,
             thread_id=thread_id,
             agent_id=agent_id
         )
-        
-        logger.info(f"✅ Manual subscription established for thread {thread_id}")
+        messages = {
+            SubscriptionResult.SUBSCRIBED: "Subscription established",
+            SubscriptionResult.ALREADY_SUBSCRIBED: "Already subscribed",
+            SubscriptionResult.OWNED_ELSEWHERE: "Already subscribed by another worker",
+            SubscriptionResult.FAILED: "Failed to establish subscription",
+        }
+        if result == SubscriptionResult.SUBSCRIBED:
+            logger.info(f"✅ Manual subscription established for thread {thread_id}")
+        else:
+            logger.info(f"Subscription for thread {thread_id}: {result}")
         return {
-            "success": True,
-            "message": "Subscription established",
+            "success": result != SubscriptionResult.FAILED,
+            "message": messages[result],
             "thread_id": thread_id,
             "subscription_count": realtime_worker.get_subscription_count()
         }
@@ -1833,33 +1877,125 @@ async def generate_business_plan(
                 "message": "Business plan retrieved successfully"
             }
         
-        # Import and call generate_business_plan_node
-        from agents.founder_buddy.nodes.generate_business_plan import generate_business_plan_node
-        
-        # Create a temporary state dict for the node
-        temp_state = dict(state_values)
-        temp_state = await generate_business_plan_node(temp_state, config)
-        
-        business_plan = temp_state.get("business_plan")
-        
-        if business_plan:
-            logger.info(f"=== GENERATE_BUSINESS_PLAN_SUCCESS ===")
-            logger.info(f"GENERATE_BUSINESS_PLAN: plan_length={len(business_plan)}")
-            return {
-                "success": True,
-                "business_plan": business_plan,
-                "message": "Business plan generated successfully"
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate business plan"
+        async def generate() -> dict[str, Any]:
+            # Import and call generate_business_plan_node
+            from agents.founder_buddy.nodes.generate_business_plan import (
+                generate_business_plan_node,
             )
             
+            # Create a temporary state dict for the node
+            temp_state = dict(state_values)
+            temp_state = await generate_business_plan_node(temp_state, config)
+            
+            business_plan = temp_state.get("business_plan")
+            
+            if business_plan:
+                logger.info(f"=== GENERATE_BUSINESS_PLAN_SUCCESS ===")
+                logger.info(f"GENERATE_BUSINESS_PLAN: plan_length={len(business_plan)}")
+                return {
+                    "success": True,
+                    "business_plan": business_plan,
+                    "message": "Business plan generated successfully"
+                }
+            else:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to generate business plan"
+                )
+        
+        # A double-fired request for the same thread state shares one generation
+        return await single_flight.do(
+            "generate_business_plan", (agent_id, thread_id, state_version(state_snapshot)), generate
+        )
+            
     except Exception as e:
         logger.error(f"=== GENERATE_BUSINESS_PLAN_ERROR ===")
         logger.error(f"GENERATE_BUSINESS_PLAN_ERROR: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate business plan: {str(e)}")
 
 
+
+def _job_queue(request: Request) -> Any:
+    jobs = getattr(request.app.state, "jobs", None)
+    if jobs is None:
+        raise HTTPException(status_code=503, detail="Background jobs are not enabled (JOBS_ENABLED)")
+    return jobs
+
+
+def _job_response(job: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+
+@router.post("/jobs/business_plan/{agent_id}", status_code=202)
+async def submit_business_plan_job(
+    agent_id: str,
+    user_id: int,
+    thread_id: str,
+    request: Request,
+) -> dict[str, Any]:
+    """
+    Queue business plan generation and return a job ID at once.
+
+    Poll `GET /jobs/{job_id}` for status and progress (plan sections written
+    so far), then fetch the plan from `GET /jobs/{job_id}/result`. Submitting
+    again while a job for the same thread state is queued or running returns
+    that job. The graph's own generate_business_plan node, reached from
+    /stream and /invoke, still runs inline.
+
+    Args:
+        agent_id: Agent identifier (must be "founder-buddy")
+        user_id: User identifier
+        thread_id: Thread/conversation identifier
+    """
+    if agent_id != "founder-buddy":
+        raise HTTPException(
+            status_code=422,
+            detail="Business plan generation only supported for 'founder-buddy' agent"
+        )
+    jobs = _job_queue(request)
+    config = RunnableConfig(configurable={"thread_id": thread_id, "user_id": user_id})
+    state_snapshot = await get_agent(agent_id).aget_state(config=config)
+    job = await jobs.submit(
+        "business_plan",
+        {"agent_id": agent_id, "user_id": user_id, "thread_id": thread_id},
+        dedupe_key=f"business_plan:{agent_id}:{thread_id}:{state_version(state_snapshot)}",
+    )
+    logger.info(f"GENERATE_BUSINESS_PLAN_JOB: job_id={job['id']}, thread_id={thread_id}, status={job['status']}")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request) -> dict[str, Any]:
+    """Job status and progress."""
+    job = await _job_queue(request).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, request: Request, response: Response) -> dict[str, Any]:
+    """
+    Job result: 200 with the result once succeeded, 202 while queued or
+    running, 500 with the error if the job failed.
+    """
+    job = await _job_queue(request).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job["status"] == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+    if job["status"] != JobStatus.SUCCEEDED:
+        response.status_code = 202
+        return _job_response(job)
+    return {**_job_response(job), "result": job["result"]}
+
+
 app.include_router(router)
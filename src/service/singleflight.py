@@ -0,0 +1,64 @@
+"""
+Single-flight coalescing for expensive endpoint work.
+
+When the frontend double-fires a request, or several tabs open the same
+thread, identical requests arrive while the first one is still running. The
+first caller starts the work; concurrent callers with the same key await its
+result (or exception) instead of repeating it. Keys include the thread's
+checkpoint ID, so a request made after the state changed starts fresh work.
+
+The shared work runs as its own task, so one caller disconnecting does not
+cancel it for the others.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from core.metrics import SINGLEFLIGHT_DEDUPED
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """In-flight work by key (per worker process)."""
+
+    def __init__(self):
+        self._inflight: dict[tuple[str, Hashable], asyncio.Task] = {}
+
+    async def do(self, endpoint: str, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `work` once for concurrent calls with the same endpoint and key.
+
+        Args:
+            endpoint: Endpoint name (metric label and key prefix)
+            key: Identity of the work, e.g. (agent_id, thread_id, checkpoint_id)
+            work: Coroutine function doing the work
+        """
+        flight_key = (endpoint, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.create_task(work())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda done: self._finished(flight_key, done))
+        else:
+            SINGLEFLIGHT_DEDUPED.labels(endpoint).inc()
+        return await asyncio.shield(task)
+
+    def _finished(self, flight_key: tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+def state_version(state_snapshot: Any) -> str | None:
+    """Checkpoint ID of a LangGraph state snapshot (None for a new thread)."""
+    config = getattr(state_snapshot, "config", None) or {}
+    return config.get("configurable", {}).get("checkpoint_id")
+
+
+single_flight = SingleFlight()
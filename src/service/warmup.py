@@ -0,0 +1,159 @@
+"""
+Startup warm-up for the agent service.
+
+Without it the first request after a deploy pays for opening the Postgres
+pool, creating the Supabase client, constructing the model (provider import
+and client setup), the first TLS handshake to the LLM provider and the first
+graph compile. When WARMUP_ENABLED is set, the lifespan runs these steps
+concurrently in the background: `/health` answers as soon as the process is
+up, while `/ready` returns 503 until every step has finished.
+"""
+
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from core.logging_config import get_logger
+from core.settings import DatabaseType, settings
+
+logger = get_logger(__name__)
+
+WarmupStep = Callable[[], Awaitable[None]]
+
+
+class Warmup:
+    """
+    Run warm-up steps concurrently and track readiness.
+
+    A failed or timed-out step is logged and reported by status(), but does not
+    keep the service unready: the request that needs it will simply pay the
+    cold-start cost (or fail) as it would without warm-up.
+
+    Args:
+        steps: Step name -> coroutine function
+        timeout: Per-step timeout in seconds
+    """
+
+    def __init__(self, steps: dict[str, WarmupStep], timeout: float = 30.0):
+        self.steps = steps
+        self.timeout = timeout
+        self.ready = False
+        self.results: dict[str, dict[str, Any]] = {}
+        self.duration_ms: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the warm-up in the background (ready at once if there are no steps)."""
+        if not self.steps:
+            self.ready = True
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        start = time.perf_counter()
+        logger.info(f"🔥 Warm-up started: {', '.join(self.steps)}")
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self.steps.items()))
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.ready = True
+        failed = [name for name, result in self.results.items() if result["status"] != "ok"]
+        if failed:
+            logger.warning(f"⚠️ Warm-up finished in {self.duration_ms} ms with failed steps: {failed}")
+        else:
+            logger.info(f"✅ Warm-up finished in {self.duration_ms} ms")
+
+    async def _run_step(self, name: str, step: WarmupStep) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(step(), timeout=self.timeout)
+            result: dict[str, Any] = {"status": "ok"}
+        except TimeoutError:
+            logger.warning(f"⚠️ Warm-up step '{name}' timed out after {self.timeout}s")
+            result = {"status": "timeout"}
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up step '{name}' failed: {e}")
+            result = {"status": "error", "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.results[name] = result
+
+    async def stop(self) -> None:
+        """Cancel an unfinished warm-up (called on shutdown)."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "warmup": {"duration_ms": self.duration_ms, "steps": self.results},
+        }
+
+
+async def warm_postgres_pool() -> None:
+    """Wait for the pool's minimum connections and run one round trip."""
+    from memory import pg_manager
+
+    if pg_manager.pool is None:
+        raise RuntimeError("PostgreSQL pool is not initialized")
+    await pg_manager.pool.wait(timeout=settings.WARMUP_TIMEOUT)
+    async with pg_manager.pool.connection() as conn:
+        await conn.execute("SELECT 1")
+
+
+async def warm_supabase_client() -> None:
+    """Create the shared Supabase client (blocking, so off the event loop)."""
+    from integrations.supabase.supabase_client import get_supabase_client
+
+    await asyncio.get_running_loop().run_in_executor(None, get_supabase_client)
+
+
+async def warm_llm() -> None:
+    """
+    Construct each role's model, as the nodes request it, and open its HTTP
+    connection.
+
+    For OpenAI-compatible clients a models.list() call completes the TLS
+    handshake on the same connection pool later completions use, without
+    spending tokens; roles whose clients reach the same endpoint share one
+    call. Other providers only get the model constructed.
+    """
+    from core.llm import LLMConfig, ModelRole, get_model
+
+    loop = asyncio.get_running_loop()
+    listed: set[tuple[str, str]] = set()
+    for role in ModelRole:
+        model_name = LLMConfig.get_model_for_role(role)
+        model = await loop.run_in_executor(None, functools.partial(get_model, model_name, role=role))
+        client = getattr(model, "root_async_client", None)
+        if client is not None and (endpoint := (str(client.base_url), client.api_key)) not in listed:
+            listed.add(endpoint)
+            await client.models.list()
+
+
+async def compile_agent(agent_id: str) -> None:
+    """Compile an agent graph with the configured checkpointer and store."""
+    from agents import get_agent
+
+    await asyncio.get_running_loop().run_in_executor(None, get_agent, agent_id)
+
+
+def build_warmup_steps(agent_ids: list[str]) -> dict[str, WarmupStep]:
+    """
+    Warm-up steps that apply to the current settings.
+
+    Args:
+        agent_ids: Agents to compile during warm-up
+    """
+    steps: dict[str, WarmupStep] = {}
+    if settings.DATABASE_TYPE == DatabaseType.POSTGRES:
+        steps["postgres"] = warm_postgres_pool
+    if settings.SUPABASE_URL and settings.SUPABASE_SERVICE_ROLE_KEY:
+        steps["supabase"] = warm_supabase_client
+    steps["llm"] = warm_llm
+    for agent_id in agent_ids:
+        steps[f"agent:{agent_id}"] = functools.partial(compile_agent, agent_id)
+    return steps
@@ -0,0 +1,58 @@
+-- Content hashes for cheap agent/database sync checks
+--
+-- /check_agent_state compares these hashes against the hashes kept in agent
+-- state instead of pulling and comparing full section and plan texts.
+-- The normalization MUST match compute_content_hash() in
+-- src/integrations/supabase/content_hash.py: trim ' \t\n\r', UTF-8, SHA-256, hex.
+
+CREATE OR REPLACE FUNCTION founder_buddy_content_hash(body TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN body IS NULL OR btrim(body, E' \t\n\r') = '' THEN NULL
+        ELSE encode(sha256(convert_to(btrim(body, E' \t\n\r'), 'UTF8')), 'hex')
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE section_states ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE business_plans ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Backfill existing rows without bumping updated_at or firing per-row triggers
+ALTER TABLE section_states DISABLE TRIGGER update_section_states_updated_at;
+ALTER TABLE business_plans DISABLE TRIGGER update_business_plans_updated_at;
+UPDATE section_states SET content_hash = founder_buddy_content_hash(plain_text);
+UPDATE business_plans SET content_hash = founder_buddy_content_hash(
+    COALESCE(NULLIF(markdown_content, ''), content)
+);
+ALTER TABLE section_states ENABLE TRIGGER update_section_states_updated_at;
+ALTER TABLE business_plans ENABLE TRIGGER update_business_plans_updated_at;
+
+-- Keep hashes current for every writer (backend, frontend editors, SQL console)
+CREATE OR REPLACE FUNCTION set_section_state_content_hash()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.content_hash = founder_buddy_content_hash(NEW.plain_text);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION set_business_plan_content_hash()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.content_hash = founder_buddy_content_hash(
+        COALESCE(NULLIF(NEW.markdown_content, ''), NEW.content)
+    );
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS set_section_states_content_hash ON section_states;
+CREATE TRIGGER set_section_states_content_hash BEFORE INSERT OR UPDATE ON section_states
+    FOR EACH ROW EXECUTE FUNCTION set_section_state_content_hash();
+
+DROP TRIGGER IF EXISTS set_business_plans_content_hash ON business_plans;
+CREATE TRIGGER set_business_plans_content_hash BEFORE INSERT OR UPDATE ON business_plans
+    FOR EACH ROW EXECUTE FUNCTION set_business_plan_content_hash();
+
+-- The sync check filters on (user_id, thread_id, agent_id) and reads only hashes
+CREATE INDEX IF NOT EXISTS idx_section_states_sync
+    ON section_states(user_id, thread_id, agent_id) INCLUDE (section_id, content_hash, updated_at);
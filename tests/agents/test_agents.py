@@ -0,0 +1,55 @@
+from unittest.mock import Mock, patch
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.store.memory import InMemoryStore
+
+from agents import agents as registry
+from agents.agents import Agent, configure_agents, get_agent
+
+
+def test_get_agent_compiles_once_on_first_use():
+    graph = Mock()
+    build = Mock(return_value=graph)
+    with patch.dict(registry.agents, {"lazy-agent": Agent(description="Lazy", build=build)}, clear=True):
+        build.assert_not_called()
+        assert get_agent("lazy-agent") is graph
+        assert get_agent("lazy-agent") is graph
+
+    build.assert_called_once()
+
+
+def test_configure_agents_compiles_with_real_memory():
+    saver, store = MemorySaver(), InMemoryStore()
+    build = Mock(return_value=Mock())
+    skipped = Mock(return_value=Mock())
+    entries = {
+        "preloaded": Agent(description="Preloaded", build=build),
+        "on-demand": Agent(description="On demand", build=skipped),
+    }
+    with patch.dict(registry.agents, entries, clear=True), \
+         patch.object(registry, "_checkpointer", None), \
+         patch.object(registry, "_store", None):
+        configure_agents(saver, store, preload=["preloaded"])
+
+        build.assert_called_once_with(saver, store)
+        skipped.assert_not_called()
+        get_agent("on-demand")
+        skipped.assert_called_once_with(saver, store)
+
+
+def test_configure_agents_updates_compiled_graphs():
+    graph = Mock()
+    saver, store = MemorySaver(), InMemoryStore()
+    with patch.dict(registry.agents, {"static": Agent(description="Static", graph=graph)}, clear=True), \
+         patch.object(registry, "_checkpointer", None), \
+         patch.object(registry, "_store", None):
+        configure_agents(saver, store)
+
+    assert graph.checkpointer is saver
+    assert graph.store is store
+
+
+def test_founder_buddy_graph_uses_configured_saver():
+    saver = MemorySaver()
+    graph = registry._build_founder_buddy(saver, None)
+    assert graph.checkpointer is saver
@@ -9,3 +9,19 @@ def mock_env():
     """Fixture to ensure environment is clean for each test."""
     with patch.dict(os.environ, {}, clear=True):
         yield
+
+
+class FakeClock:
+    """Monotonic clock stand-in; tests move time by setting `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture for a FakeClock starting at 0."""
+    return FakeClock()
@@ -0,0 +1,35 @@
+import asyncio
+
+from core.diagnostics import MemoryDiagnostics, rss_bytes
+
+
+def test_registry_sizes_survive_failing_registries() -> None:
+    diagnostics = MemoryDiagnostics(history=2)
+    items = [1, 2]
+    diagnostics.register("items", lambda: len(items))
+    diagnostics.register("broken", lambda: 1 / 0)
+
+    for _ in range(3):
+        items.append(3)
+        sample = diagnostics.sample()
+
+    assert sample["registries"] == {"items": 5, "broken": None}
+    assert [s["registries"]["items"] for s in diagnostics.history] == [4, 5]
+    assert rss_bytes() > 0
+
+
+def test_top_allocations_report_growth_since_start() -> None:
+    async def run() -> list[dict]:
+        diagnostics = MemoryDiagnostics()
+        diagnostics.start()
+        try:
+            kept = [bytearray(1024) for _ in range(1000)]
+            top = diagnostics.top_allocations(limit=3)
+            del kept
+            return top
+        finally:
+            await diagnostics.stop()
+
+    top = asyncio.run(run())
+    assert "test_diagnostics.py" in top[0]["site"]
+    assert top[0]["size_diff_kb"] > 1000
@@ -1,20 +1,36 @@
+import asyncio
 import os
-from unittest.mock import patch
+import time
+from collections import deque
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from langchain_anthropic import ChatAnthropic
 from langchain_community.chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
 from langchain_groq import ChatGroq
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 
-from core.llm import get_model
+from core.llm import (
+    LLMConfig,
+    LLMPriority,
+    LLMScheduler,
+    TokenBucket,
+    _create_model,
+    _Waiter,
+    get_model,
+    invoke_llm,
+    provider_for_model,
+)
 from core.models import (
     AnthropicModelName,
     FakeModelName,
     GroqModelName,
+    ModelRole,
     OllamaModelName,
     OpenAIModelName,
+    Provider,
 )
 
 
@@ -66,7 +82,143 @@ def test_get_model_fake():
     assert model.responses == ["This is a test response from the fake model."]
 
 
+def test_fake_model_token_delay_paces_ainvoke():
+    with patch("core.llm.settings.FAKE_MODEL_TOKEN_DELAY", 0.001):
+        model = _create_model(FakeModelName.FAKE)
+
+    start = time.perf_counter()
+    response = asyncio.run(model.ainvoke("hi"))
+
+    # One delay per streamed character, also when the caller does not stream
+    assert time.perf_counter() - start >= 0.001 * len(response.content)
+    assert response.content == "This is a test response from the fake model."
+
+
+def test_role_routing_and_budgets():
+    with patch.dict(LLMConfig.ROLE_MODELS, {ModelRole.REPLY: OpenAIModelName.GPT_4O_MINI}), \
+         patch("core.settings.settings.LLM_ROLE_MODELS", {ModelRole.EXTRACTION: AnthropicModelName.HAIKU_3}), \
+         patch("core.settings.settings.LLM_ROLE_MAX_TOKENS", {ModelRole.REPLY: 500}):
+        assert LLMConfig.get_model_for_role(ModelRole.REPLY) == OpenAIModelName.GPT_4O_MINI
+        assert LLMConfig.get_model_for_role(ModelRole.EXTRACTION) == AnthropicModelName.HAIKU_3
+        assert LLMConfig.get_model_for_role(ModelRole.SUMMARIZATION) == LLMConfig.DEFAULT_MODEL
+        assert LLMConfig.get_model_for_role(None) == LLMConfig.DEFAULT_MODEL
+
+        assert LLMConfig.get_max_tokens_for_model(OpenAIModelName.GPT_4O, ModelRole.REPLY) == 500
+        # Roles without an override keep the default budget
+        assert LLMConfig.get_max_tokens_for_model(OpenAIModelName.GPT_4O, ModelRole.BUSINESS_PLAN) == (
+            LLMConfig.DEFAULT_MAX_TOKENS
+        )
+        assert LLMConfig.get_max_tokens_for_model(OpenAIModelName.GPT_4O) == LLMConfig.DEFAULT_MAX_TOKENS
+        assert LLMConfig.get_max_tokens_for_model(OpenAIModelName.GPT_5, ModelRole.REPLY) is None
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test_key"}):
+            model = get_model(OpenAIModelName.GPT_4O_MINI, role=ModelRole.REPLY)
+        assert model.max_tokens == 500
+        assert model.callbacks[-1].role == "reply"
+
+
 def test_get_model_invalid():
     with pytest.raises(ValueError, match="Unsupported model:"):
         # Using type: ignore since we're intentionally testing invalid input
         get_model("invalid_model")  # type: ignore
+
+
+def test_token_bucket_refills_per_minute(clock):
+    bucket = TokenBucket(per_minute=60, burst=2, clock=clock)
+
+    bucket.consume(1)
+    bucket.consume(1)
+    assert bucket.time_until(1) == pytest.approx(1.0)
+    assert bucket.time_until(50) == pytest.approx(2.0)  # clamped to capacity
+
+    clock.now = 0.5
+    assert bucket.time_until(1) == pytest.approx(0.5)
+    clock.now = 10
+    assert bucket.time_until(2) == 0
+
+
+def test_provider_for_model():
+    assert provider_for_model(OpenAIModelName.GPT_4O) == Provider.OPENAI
+    assert provider_for_model(FakeModelName.FAKE) == Provider.FAKE
+
+
+def test_scheduler_prioritizes_interactive_and_rotates_users():
+    # 600 rpm with a burst of 1: one admission every 0.1 s once the bucket is empty
+    scheduler = LLMScheduler({"openai": {"rpm": 600}})
+    order = []
+
+    async def call(user: str, priority: LLMPriority, label: str):
+        async with scheduler.slot("openai", user_id=user, priority=priority):
+            order.append(label)
+
+    async def run():
+        queue = scheduler._queue("openai")
+        queue.requests.capacity = queue.requests.level = 1
+        await call("warm", LLMPriority.INTERACTIVE, "warm")  # empties the bucket
+        tasks = [
+            asyncio.create_task(call("a", LLMPriority.BACKGROUND, "a1")),
+            asyncio.create_task(call("a", LLMPriority.BACKGROUND, "a2")),
+            asyncio.create_task(call("a", LLMPriority.BACKGROUND, "a3")),
+            asyncio.create_task(call("b", LLMPriority.BACKGROUND, "b1")),
+            asyncio.create_task(call("c", LLMPriority.INTERACTIVE, "c1")),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth("openai") == 5
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["warm", "c1", "a1", "b1", "a2", "a3"]
+
+
+def test_scheduler_unlimited_provider_does_not_queue():
+    scheduler = LLMScheduler({"openai": {"rpm": 1}})
+
+    async def run():
+        for _ in range(5):
+            async with scheduler.slot("anthropic", tokens=10_000):
+                pass
+
+    asyncio.run(run())
+    assert scheduler.queue_depth("anthropic") == 0
+
+
+def test_invoke_llm_corrects_token_estimate(clock):
+    scheduler = LLMScheduler({"fake": {"tpm": 10_000}}, clock=clock)
+    response = AIMessage(
+        content="ok", usage_metadata={"input_tokens": 40, "output_tokens": 10, "total_tokens": 50}
+    )
+    llm = AsyncMock()
+    llm.ainvoke.return_value = response
+
+    with patch("core.llm.get_llm_scheduler", return_value=scheduler), \
+         patch("core.llm.get_model", return_value=llm):
+        result = asyncio.run(invoke_llm(["x" * 400], user_id=1, model_name=FakeModelName.FAKE))
+
+    assert result is response
+    # The 100 + max_tokens estimate was replaced by the 50 tokens actually used
+    assert scheduler._queues["fake"].tokens.level == pytest.approx(10_000 - 50)
+
+
+def test_scheduler_estimate_wait_counts_calls_ahead(clock):
+    scheduler = LLMScheduler({"openai": {"rpm": 60}}, clock=clock)
+    assert scheduler.estimate_wait("anthropic") == 0
+
+    queue = scheduler._queue("openai")
+    queue.requests.level = 0
+    assert scheduler.estimate_wait("openai") == pytest.approx(1.0)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for _ in range(3):
+            queue.waiting[LLMPriority.BACKGROUND].setdefault("a", deque()).append(
+                _Waiter(loop.create_future(), 0)
+            )
+        # Background calls queue behind the three waiting ones; interactive calls jump ahead
+        return (
+            scheduler.estimate_wait("openai", LLMPriority.BACKGROUND),
+            scheduler.estimate_wait("openai", LLMPriority.INTERACTIVE),
+        )
+
+    background, interactive = asyncio.run(run())
+    assert background == pytest.approx(4.0)
+    assert interactive == pytest.approx(1.0)
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from core.llm import invoke_llm
+from core.llm_cache import InMemoryLLMCache, LLMResponseCache, SQLiteLLMCache, cache_key
+from core.models import FakeModelName, OpenAIModelName
+
+
+def test_cache_key_ignores_ids_but_not_content_or_params():
+    params = {"temperature": 0.0, "max_tokens": 1500}
+    base = cache_key("gpt-4o", params, [SystemMessage(content="s", id="1"), HumanMessage(content="hi", id="2")])
+
+    assert base == cache_key("gpt-4o", params, [SystemMessage(content="s"), HumanMessage(content="hi", id="x")])
+    assert base != cache_key("gpt-4o", params, [SystemMessage(content="s"), HumanMessage(content="hi!")])
+    assert base != cache_key("gpt-4o", {**params, "max_tokens": 6000}, [SystemMessage(content="s"), HumanMessage(content="hi")])
+    assert base != cache_key("gpt-4o-mini", params, [SystemMessage(content="s"), HumanMessage(content="hi")])
+
+
+def test_in_memory_cache_ttl_and_lru(clock):
+    cache = InMemoryLLMCache(max_entries=2, ttl=10, clock=clock)
+
+    async def run():
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"  # a is now the most recently used
+        await cache.set("c", "3")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1"
+        clock.now = 11
+        assert await cache.get("a") is None
+
+    asyncio.run(run())
+
+
+def test_sqlite_cache_evicts_and_expires(tmp_path):
+    async def run():
+        cache = SQLiteLLMCache(str(tmp_path / "cache.db"), max_entries=2, ttl=60, evict_every=1)
+        try:
+            await cache.set("a", "1")
+            await cache.set("b", "2")
+            await cache.set("c", "3")
+            assert [await cache.get(key) for key in "abc"] == [None, "2", "3"]
+
+            cache.ttl = 0
+            await cache.set("d", "4")
+            assert await cache.get("d") is None
+        finally:
+            await cache.close()
+
+    asyncio.run(run())
+
+
+def test_sqlite_cache_batches_eviction_and_touches(tmp_path):
+    async def run():
+        cache = SQLiteLLMCache(str(tmp_path / "cache.db"), max_entries=2, ttl=60, evict_every=4)
+        try:
+            for key in "abc":
+                await cache.set(key, key)
+            conn = await cache._connection()
+            cursor = await conn.execute("SELECT count(*) FROM llm_response_cache")
+            assert (await cursor.fetchone())[0] == 3  # over the cap until the next eviction pass
+
+            # A recent hit does not write; "a" stays the least recently used
+            assert await cache.get("a") == "a"
+            await cache.set("d", "d")
+            assert [await cache.get(key) for key in "abcd"] == [None, None, "c", "d"]
+
+            # Once the touch interval has passed a hit refreshes accessed_at
+            cache.touch_interval = 0
+            for key in "efg":
+                await cache.set(key, key)
+            assert await cache.get("c") == "c"
+            await cache.set("h", "h")
+            assert [await cache.get(key) for key in "cdefgh"] == ["c", None, None, None, None, "h"]
+        finally:
+            await cache.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(("model_name", "expected_calls"), [(FakeModelName.FAKE, 1), (OpenAIModelName.GPT_5, 2)])
+def test_invoke_llm_serves_deterministic_calls_from_cache(model_name, expected_calls):
+    response = AIMessage(
+        content="plan", usage_metadata={"input_tokens": 900, "output_tokens": 100, "total_tokens": 1000}
+    )
+    llm = AsyncMock()
+    llm.ainvoke.return_value = response
+    cache = LLMResponseCache(InMemoryLLMCache(max_entries=10, ttl=60))
+
+    async def run():
+        first = await invoke_llm([HumanMessage(content="same prompt")], model_name=model_name)
+        second = await invoke_llm([HumanMessage(content="same prompt")], model_name=model_name)
+        return first, second
+
+    with patch("core.llm_cache.get_llm_cache", return_value=cache), \
+         patch("core.llm.get_model", return_value=llm):
+        first, second = asyncio.run(run())
+
+    # GPT-5 runs at temperature 1, so it always goes to the provider
+    assert llm.ainvoke.await_count == expected_calls
+    assert first.content == second.content == "plan"
+    assert second.response_metadata.get("cached", False) is (expected_calls == 1)
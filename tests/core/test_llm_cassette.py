@@ -0,0 +1,65 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_community.chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from core import llm_cassette
+from core.llm_cassette import Cassette, CassetteMiss, recording_model, replay_model
+
+PROMPT = [HumanMessage(content="What is your mission?")]
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    path = tmp_path / "session.jsonl"
+    llm_cassette.get_cassette.cache_clear()
+    with patch("core.llm_cassette.settings.LLM_CASSETTE_PATH", str(path)):
+        yield path
+    llm_cassette.get_cassette.cache_clear()
+
+
+def record(answer: str, sleep: float = 0.0) -> str:
+    model = recording_model(FakeListChatModel(responses=[answer], sleep=sleep), "fake")
+    return asyncio.run(model.ainvoke(PROMPT)).content
+
+
+def test_record_then_replay_from_file(cassette_path):
+    assert record("Clinics first.") == "Clinics first."
+    llm_cassette.get_cassette.cache_clear()  # replay reads the file, as in a new process
+
+    assert Cassette(str(cassette_path)).play(PROMPT)
+    with patch("core.llm_cassette.settings.LLM_CASSETTE_LATENCY_SCALE", 0.0):
+        response = asyncio.run(replay_model().ainvoke([HumanMessage(content="What is your mission?", id="other")]))
+
+    assert response.content == "Clinics first."
+
+
+def test_replay_scales_recorded_chunk_timing(cassette_path):
+    record("abcdefghij", sleep=0.01)  # ten chunks, ~10 ms apart
+
+    def replay_seconds(scale: float) -> float:
+        with patch("core.llm_cassette.settings.LLM_CASSETTE_LATENCY_SCALE", scale):
+            model = replay_model()
+        start = time.perf_counter()
+        asyncio.run(model.ainvoke(PROMPT))
+        return time.perf_counter() - start
+
+    assert replay_seconds(1.0) >= 0.09
+    assert replay_seconds(0.0) < 0.05
+
+
+def test_repeated_prompt_replays_recordings_in_turn(cassette_path):
+    record("first")
+    record("second")
+    with patch("core.llm_cassette.settings.LLM_CASSETTE_LATENCY_SCALE", 0.0):
+        model = replay_model()
+
+    assert [asyncio.run(model.ainvoke(PROMPT)).content for _ in range(3)] == ["first", "second", "first"]
+
+
+def test_unrecorded_prompt_raises(cassette_path):
+    with pytest.raises(CassetteMiss):
+        asyncio.run(replay_model().ainvoke([HumanMessage(content="never recorded")]))
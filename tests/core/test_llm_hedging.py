@@ -0,0 +1,174 @@
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.runnables import RunnableLambda
+
+from core.llm import invoke_hedged
+from core.models import AnthropicModelName, OpenAIModelName
+
+PRIMARY = OpenAIModelName.GPT_4O
+SECONDARY = AnthropicModelName.HAIKU_3
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Offline provider: streams `tokens` after `first_token_delay`, or raises `error`.
+    With `role_chunk`, an empty chunk is sent at once first, as some providers do.
+    """
+
+    tokens: list[str] = ["stub"]
+    role_chunk: bool = False
+    first_token_delay: float = 0.0
+    token_delay: float = 0.0
+    error: str | None = None
+    calls: int = 0
+    cancelled: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        try:
+            if self.role_chunk:
+                yield ChatGenerationChunk(message=AIMessageChunk(content="", response_metadata={"role_chunk": True}))
+            await asyncio.sleep(self.first_token_delay)
+            if self.error:
+                raise RuntimeError(self.error)
+            for index, token in enumerate(self.tokens):
+                if index:
+                    await asyncio.sleep(self.token_delay)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class TokenCollector(AsyncCallbackHandler):
+    """Tokens per chat model run, split by whether the run was tagged nostream."""
+
+    def __init__(self):
+        self.hidden_runs: set = set()
+        self.streamed: list[str] = []
+        self.hidden: list[str] = []
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, **kwargs: Any):
+        if tags and "nostream" in tags:
+            self.hidden_runs.add(run_id)
+
+    async def on_llm_new_token(self, token, *, run_id, **kwargs: Any):
+        (self.hidden if run_id in self.hidden_runs else self.streamed).append(token)
+
+
+def run_hedged(primary: StubChatModel, secondary: StubChatModel, hedge_after: float = 0.05):
+    models = {PRIMARY: primary, SECONDARY: secondary}
+    collector = TokenCollector()
+
+    async def call(_: Any):
+        return await invoke_hedged(
+            [HumanMessage(content="hi")], primary=PRIMARY, secondary=SECONDARY, hedge_after=hedge_after
+        )
+
+    async def run():
+        # Called through a runnable so the attempts and the relay inherit its callbacks, as in a graph node
+        return await RunnableLambda(call).ainvoke(None, config={"callbacks": [collector]})
+
+    with patch("core.llm.get_model", side_effect=lambda model_name, role=None: models[model_name]):
+        response = asyncio.run(run())
+    return response, collector
+
+
+def outcomes() -> dict[str, float]:
+    from prometheus_client import REGISTRY
+
+    return {
+        sample.labels["outcome"]: sample.value
+        for metric in REGISTRY.collect()
+        if metric.name == "founder_buddy_llm_hedge_outcomes"
+        for sample in metric.samples
+        if sample.name.endswith("_total") and sample.labels["role"] == "default"
+    }
+
+
+def test_fast_primary_is_not_hedged():
+    before = outcomes().get("primary", 0)
+    primary = StubChatModel(tokens=["Hello", " there"])
+    secondary = StubChatModel(tokens=["backup"])
+
+    response, collector = run_hedged(primary, secondary)
+
+    assert response.content == "Hello there"
+    assert secondary.calls == 0
+    assert collector.streamed == ["Hello", " there"]
+    assert outcomes()["primary"] == before + 1
+
+
+def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    before = outcomes().get("hedge", 0)
+    primary = StubChatModel(tokens=["slow"], first_token_delay=1.0)
+    secondary = StubChatModel(tokens=["fast", " answer"], token_delay=0.01)
+
+    response, collector = run_hedged(primary, secondary)
+
+    assert response.content == "fast answer"
+    assert primary.cancelled
+    # Only the winner's tokens reach the caller's stream
+    assert collector.streamed == ["fast", " answer"]
+    assert outcomes()["hedge"] == before + 1
+
+
+def test_primary_can_still_win_after_hedge_starts():
+    before = outcomes().get("primary_after_hedge", 0)
+    primary = StubChatModel(tokens=["primary"], first_token_delay=0.1)
+    secondary = StubChatModel(tokens=["secondary"], first_token_delay=1.0)
+
+    response, collector = run_hedged(primary, secondary)
+
+    assert response.content == "primary"
+    assert secondary.calls == 1 and secondary.cancelled
+    assert collector.streamed == ["primary"]
+    assert outcomes()["primary_after_hedge"] == before + 1
+
+
+def test_primary_error_fails_over_without_waiting():
+    before = outcomes().get("failover", 0)
+    primary = StubChatModel(error="503 from provider")
+    secondary = StubChatModel(tokens=["recovered"])
+
+    response, _ = run_hedged(primary, secondary, hedge_after=10.0)
+
+    assert response.content == "recovered"
+    assert outcomes()["failover"] == before + 1
+
+
+def test_both_failing_raises_primary_error():
+    primary = StubChatModel(error="primary down")
+    secondary = StubChatModel(error="secondary down")
+
+    with pytest.raises(RuntimeError, match="primary down"):
+        run_hedged(primary, secondary)
+
+
+def test_empty_role_chunk_does_not_win_the_race():
+    before = outcomes().get("hedge", 0)
+    primary = StubChatModel(tokens=["slow"], first_token_delay=1.0, role_chunk=True)
+    secondary = StubChatModel(tokens=["fast"], role_chunk=True)
+
+    response, collector = run_hedged(primary, secondary)
+
+    assert response.content == "fast"
+    assert primary.cancelled
+    # The winner's leading empty chunk is replayed with its answer
+    assert response.response_metadata.get("role_chunk")
+    assert collector.streamed == ["", "fast"]
+    assert outcomes()["hedge"] == before + 1
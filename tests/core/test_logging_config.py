@@ -0,0 +1,83 @@
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from core.logging_config import (
+    AsyncQueueHandler,
+    JsonFormatter,
+    RateLimitFilter,
+    SmartLogger,
+    TextFormatter,
+)
+
+
+def make_record(msg: str, *args, level: int = logging.INFO, name: str = "test", **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, msg, args or None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    record = make_record("user %s joined", "alice", thread_id="t-1")
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "user alice joined"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "test"
+    assert payload["thread_id"] == "t-1"
+
+
+def test_async_queue_handler_defers_formatting_of_immutable_args():
+    handler = AsyncQueueHandler(queue.SimpleQueue())
+    record = handler.prepare(make_record("count=%d", 3))
+    assert record.msg == "count=%d"
+    assert record.args == (3,)
+
+    # Mutable args are rendered at call time so later mutation does not leak in
+    state = {"step": 1}
+    record = handler.prepare(make_record("state=%s", state))
+    state["step"] = 2
+    assert record.getMessage() == "state={'step': 1}"
+
+
+def test_rate_limit_filter_drops_and_reports():
+    clock = [100.0]
+    rate_filter = RateLimitFilter(rate=1, burst=2)
+    with patch("core.logging_config.time.monotonic", lambda: clock[0]):
+        results = [rate_filter.filter(make_record("hot")) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+
+        # Warnings are never throttled
+        assert rate_filter.filter(make_record("careful", level=logging.WARNING))
+        # Other loggers have their own bucket
+        assert rate_filter.filter(make_record("other", name="other"))
+
+        clock[0] += 1.0
+        record = make_record("hot %s", "again")
+        assert rate_filter.filter(record)
+
+    # The count travels as an attribute, so %-args and JSON output stay intact
+    assert record.getMessage() == "hot again"
+    assert record.rate_limited == 3
+    assert json.loads(JsonFormatter().format(record))["rate_limited"] == 3
+    assert TextFormatter("%(message)s").format(record) == "hot again [rate limited: 3 earlier records dropped]"
+
+
+def test_smart_logger_formats_lazily(caplog):
+    class Expensive:
+        calls = 0
+
+        def __repr__(self):
+            Expensive.calls += 1
+            return "expensive"
+
+    logger = SmartLogger("test.lazy")
+    with caplog.at_level(logging.INFO, logger="test.lazy"):
+        logger.debug("payload %r", Expensive())
+        assert Expensive.calls == 0
+
+        logger.info("payload %r", Expensive())
+        assert caplog.records[-1].getMessage() == "payload expensive"
+        assert caplog.records[-1].funcName == "test_smart_logger_formats_lazily"
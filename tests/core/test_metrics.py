@@ -0,0 +1,118 @@
+import asyncio
+import inspect
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+from prometheus_client import REGISTRY
+
+from core.metrics import LLMMetricsCallback, StreamTimer, instrument_node, track_external_call
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_instrument_node_keeps_signature_and_records_latency():
+    seen_config = {}
+
+    async def echo_node(state: MessagesState, config: RunnableConfig) -> dict:
+        seen_config.update(config.get("configurable", {}))
+        return {"messages": []}
+
+    wrapped = instrument_node("metrics_test_echo", echo_node)
+    assert inspect.iscoroutinefunction(wrapped)
+    assert list(inspect.signature(wrapped).parameters) == ["state", "config"]
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("echo", wrapped)
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", END)
+
+    before = sample("founder_buddy_graph_node_duration_seconds_count", node="metrics_test_echo")
+    asyncio.run(graph.compile().ainvoke({"messages": []}, {"configurable": {"thread_id": "t-1"}}))
+
+    assert seen_config["thread_id"] == "t-1"
+    assert sample("founder_buddy_graph_node_duration_seconds_count", node="metrics_test_echo") == before + 1
+
+
+def test_instrument_node_counts_errors():
+    def failing_node(state: MessagesState) -> dict:
+        raise RuntimeError("boom")
+
+    wrapped = instrument_node("metrics_test_fail", failing_node)
+    with pytest.raises(RuntimeError):
+        wrapped({"messages": []})
+
+    assert sample("founder_buddy_errors_total", component="node", operation="metrics_test_fail") == 1
+    assert sample("founder_buddy_graph_node_duration_seconds_count", node="metrics_test_fail") == 1
+
+
+def test_track_external_call():
+    with track_external_call("dentapp", "metrics_test_ok"):
+        pass
+    with pytest.raises(ValueError):
+        with track_external_call("dentapp", "metrics_test_bad"):
+            raise ValueError("nope")
+
+    count = "founder_buddy_external_call_duration_seconds_count"
+    assert sample(count, service="dentapp", operation="metrics_test_ok") == 1
+    assert sample(count, service="dentapp", operation="metrics_test_bad") == 1
+    assert sample("founder_buddy_errors_total", component="dentapp", operation="metrics_test_bad") == 1
+
+
+def test_llm_callback_counts_tokens():
+    callback = LLMMetricsCallback("metrics-test-model")
+    message = AIMessage(
+        content="hi",
+        usage_metadata={
+            "input_tokens": 120,
+            "output_tokens": 8,
+            "total_tokens": 128,
+            "input_token_details": {"cache_read": 100},
+        },
+    )
+    run_id = uuid4()
+    callback.on_chat_model_start({}, [], run_id=run_id)
+    callback.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+
+    tokens = "founder_buddy_llm_tokens_total"
+    assert sample(tokens, model="metrics-test-model", kind="input") == 120
+    assert sample(tokens, model="metrics-test-model", kind="output") == 8
+    assert sample(tokens, model="metrics-test-model", kind="cache_read") == 100
+    assert sample(
+        "founder_buddy_external_call_duration_seconds_count", service="llm", operation="metrics-test-model"
+    ) == 1
+
+
+def test_stream_timer():
+    clock = iter([10.5, 10.6, 10.7, 11.0])
+    with patch("core.metrics.time.perf_counter", lambda: next(clock)):
+        timer = StreamTimer("metrics-test-agent", accepted_at=10.0)
+        timer.token()  # 10.5
+        timer.token()  # 10.6
+        timer.token()  # 10.7
+        summary = timer.finish()  # 11.0
+
+    assert summary == {
+        "total_ms": 1000.0,
+        "ttft_ms": 500.0,
+        "generation_ms": 200.0,
+        "tokens": 3,
+        "tokens_per_second": 10.0,
+    }
+    assert sample("founder_buddy_stream_tokens_total", agent="metrics-test-agent") == 3
+    assert sample("founder_buddy_stream_inter_token_seconds_count", agent="metrics-test-agent") == 2
+    assert sample("founder_buddy_stream_ttft_seconds_sum", agent="metrics-test-agent") == 0.5
+
+
+def test_stream_timer_without_tokens():
+    summary = StreamTimer("metrics-test-silent").finish()
+
+    assert summary["tokens"] == 0
+    assert summary["ttft_ms"] is None
+    assert sample("founder_buddy_stream_ttft_seconds_count", agent="metrics-test-silent") == 0
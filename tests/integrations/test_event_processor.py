@@ -0,0 +1,83 @@
+import asyncio
+
+from integrations.supabase.event_processor import (
+    EventProcessor,
+    ProcessedEventIds,
+    RealtimeEvent,
+    RealtimeEventType,
+)
+
+
+def make_event(event_id: str) -> RealtimeEvent:
+    return RealtimeEvent(
+        event_type=RealtimeEventType.BUSINESS_PLAN_UPDATED,
+        user_id=1,
+        thread_id="t",
+        event_id=event_id,
+        table="business_plans",
+        operation="UPDATE",
+    )
+
+
+def test_processed_ids_expire_after_ttl(clock):
+    ids = ProcessedEventIds(ttl=10, max_entries=100, clock=clock)
+
+    assert ids.add("a")
+    clock.now = 5
+    assert not ids.add("a")  # seen, and not refreshed by the repeat
+    assert ids.add("b")
+    clock.now = 10
+    assert "a" not in ids
+    assert "b" in ids
+    assert ids.add("a")
+    clock.now = 15
+    assert len(ids) == 1
+
+
+def test_processed_ids_cap_forgets_oldest_first(clock):
+    ids = ProcessedEventIds(ttl=3600, max_entries=3, clock=clock)
+
+    for event_id in "abcd":
+        assert ids.add(event_id)
+
+    assert len(ids) == 3
+    assert "a" not in ids
+    assert all(event_id in ids for event_id in "bcd")
+
+
+def test_processor_dedupe_stays_bounded_over_a_long_run(clock):
+    processor = EventProcessor(cache_ttl_seconds=60, max_processed_events=1_000, clock=clock)
+
+    async def run():
+        # 20k events, 10 a second: only the last minute's 600 IDs are kept
+        for i in range(20_000):
+            clock.now = i / 10
+            assert await processor.add_event(make_event(f"event-{i}"))
+            await processor.get_next_event("t")
+        assert not await processor.add_event(make_event("event-19999"))
+
+    asyncio.run(run())
+
+    assert len(processor.processed_events) == 600
+    assert 0 < processor.processed_events.memory_bytes() < 200 * 1024
+
+
+def test_processor_forgets_drained_threads():
+    processor = EventProcessor()
+
+    async def run():
+        for i in range(1_000):
+            event = make_event(f"event-{i}")
+            event.thread_id = f"thread-{i}"
+            await processor.add_event(event)
+        while not processor.ready_threads.empty():
+            thread_id = await processor.next_ready_thread()
+            while await processor.get_next_event(thread_id) is not None:
+                pass
+
+    asyncio.run(run())
+
+    # Nothing is kept per thread once its queue has been drained
+    assert not processor.event_queues
+    assert not processor._scheduled
+    assert not getattr(processor, "locks", None)
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from integrations.supabase.event_processor import EventProcessor, RealtimeEvent, RealtimeEventType
+from integrations.supabase.realtime_worker import RealtimeWorker
+
+START = datetime(2026, 1, 1)
+
+
+def make_event(thread_id: str, seconds: int = 0) -> RealtimeEvent:
+    return RealtimeEvent(
+        event_type=RealtimeEventType.SECTION_STATE_UPDATED,
+        user_id=1,
+        thread_id=thread_id,
+        section_id="idea",
+        timestamp=START + timedelta(seconds=seconds),
+        table="section_states",
+        operation="UPDATE",
+    )
+
+
+async def start_worker(process_event, threads, consumers: int = 4) -> RealtimeWorker:
+    """A started worker with a stub listener and sync service, subscribed to `threads`."""
+    listener = Mock(connect=AsyncMock(return_value=True), disconnect=AsyncMock())
+    worker = RealtimeWorker()
+    with (
+        patch("integrations.supabase.realtime_worker.settings") as settings,
+        patch("integrations.supabase.realtime_worker.RealtimeListener", return_value=listener),
+        patch("integrations.supabase.realtime_worker.StateSyncService", return_value=Mock(process_event=process_event)),
+        patch("integrations.supabase.realtime_worker.create_subscription_ownership", return_value=AsyncMock()),
+    ):
+        settings.USE_SUPABASE_REALTIME = True
+        settings.REALTIME_CONSUMERS = consumers
+        await worker.start()
+    worker.subscriptions = {thread_id: {"thread_id": thread_id} for thread_id in threads}
+    return worker
+
+
+def test_events_sync_in_timestamp_order_as_they_arrive():
+    synced = []
+
+    async def process_event(event):
+        synced.append((event.thread_id, event.timestamp, time.perf_counter()))
+        return True
+
+    async def run():
+        worker = await start_worker(process_event, ["t"])
+        queued_at = time.perf_counter()
+        for seconds in (2, 0, 1):
+            await worker.processor.add_event(make_event("t", seconds))
+        await worker.processor.add_event(make_event("not-subscribed"))
+        await asyncio.sleep(0.05)
+        await worker.stop()
+        return queued_at
+
+    queued_at = asyncio.run(run())
+
+    assert [(thread_id, timestamp) for thread_id, timestamp, _ in synced] == [
+        ("t", START + timedelta(seconds=s)) for s in (0, 1, 2)
+    ]
+    # Dispatched on the next loop iteration, not on a polling tick
+    assert synced[0][2] - queued_at < 0.02
+
+
+def test_idle_subscriptions_cost_no_cpu():
+    threads = [f"thread-{i}" for i in range(10_000)]
+    synced = asyncio.Event()
+
+    async def process_event(event):
+        synced.set()
+        return True
+
+    async def run():
+        worker = await start_worker(process_event, threads)
+        cpu = time.process_time()
+        await asyncio.sleep(0.3)
+        idle_cpu = time.process_time() - cpu
+
+        await worker.processor.add_event(make_event("thread-9999"))
+        await asyncio.wait_for(synced.wait(), timeout=1)
+        await worker.stop()
+        return idle_cpu
+
+    # The old 100 ms poll walked all 10k queues three times in this window
+    assert asyncio.run(run()) < 0.02
+
+
+def test_consumers_bound_concurrency_and_keep_threads_serial():
+    running: dict[str, int] = {}
+    peak = {"total": 0, "per_thread": 0}
+
+    async def process_event(event):
+        running[event.thread_id] = running.get(event.thread_id, 0) + 1
+        peak["total"] = max(peak["total"], sum(running.values()))
+        peak["per_thread"] = max(peak["per_thread"], running[event.thread_id])
+        await asyncio.sleep(0.01)
+        running[event.thread_id] -= 1
+        return True
+
+    async def run():
+        threads = [f"t{i}" for i in range(5)]
+        worker = await start_worker(process_event, threads, consumers=2)
+        for seconds in range(3):
+            for thread_id in threads:
+                await worker.processor.add_event(make_event(thread_id, seconds))
+        await asyncio.sleep(0.3)
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(run())
+
+    assert peak == {"total": 2, "per_thread": 1}
+    assert not worker.processor.event_queues
+
+
+def test_queue_orders_by_timestamp_then_arrival():
+    processor = EventProcessor()
+    events = [make_event("t", seconds) for seconds in (3, 1, 2, 1, 0)]
+    events[3].event_id = "same-time-later"  # equal timestamp to events[1], added after it
+
+    async def run():
+        for event in events:
+            await processor.add_event(event)
+        ordered = processor.order_events("t")
+        drained = []
+        while (event := await processor.get_next_event("t")) is not None:
+            drained.append(event)
+        return ordered, drained
+
+    ordered, drained = asyncio.run(run())
+
+    expected = [events[4], events[1], events[3], events[2], events[0]]
+    assert ordered == expected
+    assert drained == expected
+    assert "t" not in processor.event_queues
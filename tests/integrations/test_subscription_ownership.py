@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from integrations.supabase.realtime_worker import RealtimeWorker, SubscriptionResult
+from integrations.supabase.subscription_ownership import (
+    FileLockOwnership,
+    PostgresAdvisoryOwnership,
+)
+
+
+def test_file_lock_ownership_gives_each_thread_one_owner(tmp_path):
+    # Separate instances open separate file descriptions, like separate workers
+    worker_a = FileLockOwnership(str(tmp_path))
+    worker_b = FileLockOwnership(str(tmp_path))
+
+    async def run():
+        assert await worker_a.acquire("thread-1")
+        assert await worker_a.acquire("thread-1")  # re-entrant for the owner
+        assert not await worker_b.acquire("thread-1")
+        assert await worker_b.acquire("thread-2")
+
+        await worker_a.release("thread-1")
+        assert await worker_b.acquire("thread-1")
+
+        await worker_b.close()
+        assert await worker_a.acquire("thread-2")
+
+    asyncio.run(run())
+
+
+def test_advisory_lock_key_is_stable_and_signed():
+    key = PostgresAdvisoryOwnership.lock_key("847c6285-8fc9-4560-a83f-4e6285809254")
+    assert key == PostgresAdvisoryOwnership.lock_key("847c6285-8fc9-4560-a83f-4e6285809254")
+    assert -(2**63) <= key < 2**63
+    assert key != PostgresAdvisoryOwnership.lock_key("another-thread")
+
+
+def test_worker_skips_threads_owned_elsewhere(tmp_path):
+    def make_worker():
+        worker = RealtimeWorker()
+        worker.is_running = True
+        worker.listener = Mock(
+            subscribe_to_section_states=AsyncMock(return_value="section_states:t"),
+            subscribe_to_business_plans=AsyncMock(return_value="business_plans:t"),
+        )
+        worker.ownership = FileLockOwnership(str(tmp_path))
+        return worker
+
+    owner, other = make_worker(), make_worker()
+
+    async def run():
+        first = await owner.subscribe_to_thread(user_id=1, thread_id="t")
+        second = await owner.subscribe_to_thread(user_id=1, thread_id="t")
+        elsewhere = await other.subscribe_to_thread(user_id=1, thread_id="t")
+        return first, second, elsewhere
+
+    first, second, elsewhere = asyncio.run(run())
+
+    assert first == SubscriptionResult.SUBSCRIBED
+    assert second == SubscriptionResult.ALREADY_SUBSCRIBED
+    assert elsewhere == SubscriptionResult.OWNED_ELSEWHERE
+    other.listener.subscribe_to_section_states.assert_not_awaited()
+    assert "t" in owner.subscriptions and "t" not in other.subscriptions
+
+
+def test_failed_subscription_releases_the_thread(tmp_path):
+    worker = RealtimeWorker()
+    worker.is_running = True
+    worker.listener = Mock(
+        subscribe_to_section_states=AsyncMock(return_value=None),
+        subscribe_to_business_plans=AsyncMock(return_value=None),
+    )
+    worker.ownership = FileLockOwnership(str(tmp_path))
+
+    result = asyncio.run(worker.subscribe_to_thread(user_id=1, thread_id="t"))
+
+    assert result == SubscriptionResult.FAILED
+    assert asyncio.run(FileLockOwnership(str(tmp_path)).acquire("t"))
@@ -0,0 +1,21 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.store.memory import InMemoryStore
+
+from memory import check_shared_memory, instrument_checkpointer
+
+
+def test_single_worker_allows_in_memory_components():
+    with patch("memory.settings.WORKERS", 1):
+        check_shared_memory(MemorySaver(), InMemoryStore())
+
+
+def test_multi_worker_refuses_process_local_components():
+    with patch("memory.settings.WORKERS", 4):
+        with pytest.raises(RuntimeError, match="checkpointer InMemorySaver"):
+            check_shared_memory(instrument_checkpointer(MemorySaver()), Mock())
+        with pytest.raises(RuntimeError, match="store InMemoryStore"):
+            check_shared_memory(Mock(), InMemoryStore())
+        check_shared_memory(Mock(), Mock())
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from schema import ChatMessage, InvokeResponse, UserInput
+from service.batch import run_batch
+
+
+class FakeInvoker:
+    """Records call order and peak concurrency; fails items whose message is 'fail'."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.calls: list[tuple[str | None, str]] = []
+
+    async def __call__(self, item: UserInput) -> InvokeResponse:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.calls.append((item.thread_id, item.message))
+        try:
+            await asyncio.sleep(self.delay)
+            if item.message == "fail":
+                raise HTTPException(status_code=500, detail="Unexpected error")
+            return InvokeResponse(
+                output=ChatMessage(type="ai", content=f"re: {item.message}"),
+                thread_id=item.thread_id or "new-thread",
+                user_id=1,
+            )
+        finally:
+            self.running -= 1
+
+
+def collect(items: list[UserInput], invoker: FakeInvoker, max_concurrency: int) -> list:
+    async def run():
+        return [result async for result in run_batch(items, invoker, max_concurrency)]
+
+    return asyncio.run(run())
+
+
+def test_bounded_concurrency_and_per_thread_order():
+    items = [UserInput(thread_id=f"t{i % 3}", message=f"m{i}") for i in range(9)] + [
+        UserInput(message="fresh") for _ in range(3)
+    ]
+    invoker = FakeInvoker()
+
+    results = collect(items, invoker, max_concurrency=2)
+
+    assert sorted(result.index for result in results) == list(range(12))
+    assert all(result.status == "ok" for result in results)
+    assert invoker.peak == 2
+    for thread in ("t0", "t1", "t2"):
+        messages = [message for thread_id, message in invoker.calls if thread_id == thread]
+        assert messages == sorted(messages, key=lambda message: int(message[1:]))
+
+
+def test_failure_skips_rest_of_its_thread_only():
+    items = [
+        UserInput(thread_id="a", message="fail"),
+        UserInput(thread_id="a", message="next"),
+        UserInput(thread_id="b", message="ok"),
+    ]
+
+    results = {result.index: result for result in collect(items, FakeInvoker(), max_concurrency=4)}
+
+    assert results[0].status == "error" and results[0].error == "Unexpected error"
+    assert results[1].status == "skipped"
+    assert results[2].status == "ok" and results[2].response.output.content == "re: ok"
+
+
+def test_invoke_batch_streams_ndjson(test_client, mock_agent):
+    invoker = FakeInvoker(delay=0)
+
+    async def fake_invoke(item: UserInput, agent_id: str) -> InvokeResponse:
+        return await invoker(item)
+
+    with patch("service.service.invoke", fake_invoke):
+        response = test_client.post(
+            "/founder-buddy/invoke_batch",
+            json={"items": [{"thread_id": "t", "message": "one"}, {"thread_id": "t", "message": "two"}]},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1]
+    assert [line["response"]["output"]["content"] for line in lines] == ["re: one", "re: two"]
+
+
+def test_invoke_batch_rejects_oversized_batches(test_client, mock_agent):
+    with patch("service.service.settings.BATCH_MAX_ITEMS", 1):
+        response = test_client.post("/invoke_batch", json={"items": [{"message": "a"}, {"message": "b"}]})
+    assert response.status_code == 422
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from service.jobs import (
+    JobQueue,
+    JobStatus,
+    PlanProgressCallback,
+    SQLiteJobStore,
+    run_business_plan_job,
+)
+
+
+async def wait_for_status(queue: JobQueue, job_id: str, *statuses: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise TimeoutError(job)
+
+
+def test_job_queue_runs_jobs_with_bounded_concurrency(tmp_path):
+    running = 0
+    peak = 0
+
+    async def handler(payload, report):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await report({"step": 1})
+        await asyncio.sleep(0.02)
+        running -= 1
+        if payload["n"] == 2:
+            raise ValueError("bad input")
+        return {"n": payload["n"]}
+
+    async def run():
+        queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.db")), {"work": handler}, concurrency=2)
+        queue.start()
+        try:
+            jobs = [await queue.submit("work", {"n": n}) for n in range(4)]
+            assert jobs[0]["status"] == JobStatus.QUEUED
+            return [await wait_for_status(queue, job["id"], "succeeded", "failed") for job in jobs]
+        finally:
+            await queue.stop()
+
+    finished = asyncio.run(run())
+    assert [job["status"] for job in finished] == ["succeeded", "succeeded", "failed", "succeeded"]
+    assert finished[1]["result"] == {"n": 1}
+    assert finished[1]["progress"] == {"step": 1}
+    assert finished[2]["error"] == "bad input"
+    assert peak == 2
+
+
+def test_job_store_dedupes_active_jobs_and_reclaims_stale_ones(tmp_path):
+    async def run():
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+        try:
+            first = await store.create("work", {}, dedupe_key="thread-1:c1")
+            assert (await store.create("work", {}, dedupe_key="thread-1:c1"))["id"] == first["id"]
+            assert (await store.create("work", {}, dedupe_key="thread-1:c2"))["id"] != first["id"]
+
+            claimed = await store.claim(stale_after=300)
+            assert claimed["id"] == first["id"] and claimed["status"] == JobStatus.RUNNING
+            # A running job with a recent heartbeat is not handed out again...
+            assert (await store.claim(stale_after=300))["id"] != first["id"]
+            # ...but one whose worker stopped reporting is
+            assert (await store.claim(stale_after=-1))["id"] in {first["id"], claimed["id"]}
+
+            await store.finish(first["id"], JobStatus.SUCCEEDED, result={"ok": True})
+            assert (await store.create("work", {}, dedupe_key="thread-1:c1"))["id"] != first["id"]
+        finally:
+            await store.close()
+
+    asyncio.run(run())
+
+
+def test_plan_progress_counts_section_headings():
+    reports = []
+
+    async def report(progress):
+        reports.append(progress)
+
+    async def run():
+        callback = PlanProgressCallback(["1. Summary", "2. Mission"], report)
+        for token in ["# Business Plan\n\n## 1. Sum", "mary\nText\n", "## 2. Mission\n", "More"]:
+            await callback.on_llm_new_token(token)
+        return callback.progress(done=True)
+
+    done = asyncio.run(run())
+    assert [progress["current_section"] for progress in reports] == ["1. Summary", "2. Mission"]
+    assert reports[-1]["sections_started"] == 2
+    assert done == {"sections_total": 2, "sections_started": 2, "current_section": None}
+
+
+def test_business_plan_job_endpoints(test_client, mock_agent, tmp_path):
+    async def aget_state(config):
+        return SimpleNamespace(values={"messages": []}, config={"configurable": {"checkpoint_id": "c1"}})
+
+    async def node(state, config):
+        return {**state, "business_plan": "# Plan"}
+
+    mock_agent.aget_state = aget_state
+    queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.db")), {"business_plan": run_business_plan_job})
+    with patch.object(test_client.app.state, "jobs", queue, create=True), \
+         patch("agents.founder_buddy.nodes.generate_business_plan.generate_business_plan_node", node):
+        response = test_client.post("/jobs/business_plan/founder-buddy?user_id=1&thread_id=t1")
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status"] == "queued"
+        # Same thread state: same job
+        assert test_client.post("/jobs/business_plan/founder-buddy?user_id=1&thread_id=t1").json()["job_id"] == job_id
+
+        pending = test_client.get(f"/jobs/{job_id}/result")
+        assert pending.status_code == 202
+
+        async def work_one():
+            job = await queue.store.claim(queue.stale_after)
+            await queue._run(job)
+
+        asyncio.run(work_one())
+
+        status = test_client.get(f"/jobs/{job_id}").json()
+        assert status["status"] == "succeeded"
+        assert status["progress"]["sections_started"] == status["progress"]["sections_total"]
+        result = test_client.get(f"/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.json()["result"] == {"business_plan": "# Plan"}
+        assert test_client.get("/jobs/missing").status_code == 404
+
+    asyncio.run(queue.store.close())
@@ -0,0 +1,176 @@
+import asyncio
+import gc
+import logging
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from typing import Annotated, Any, TypedDict
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, AnyMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.config import get_store
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.store.memory import InMemoryStore
+
+from agents.founder_buddy.enums import SectionID
+from core.diagnostics import MemoryDiagnostics
+from integrations.supabase.event_processor import EventProcessor, RealtimeEvent, RealtimeEventType
+from integrations.supabase.realtime_worker import RealtimeWorker
+from schema import StreamInput
+from service import service
+
+REPLY = "Thanks, that pricing gives us what we need for the revenue model."
+TURNS = 2_000
+WARMUP_TURNS = 500
+THREADS = 100
+KEPT_MESSAGES = 4
+MAX_PROCESSED_EVENTS = 200
+# Allocated blocks allowed to remain once the checkpointer and store are emptied;
+# anything else kept per turn adds at least one block per turn
+MAX_GROWTH_BLOCKS = 1_000
+
+
+def recent_messages(left: list[AnyMessage], right: list[AnyMessage]) -> list[AnyMessage]:
+    return add_messages(left, right)[-KEPT_MESSAGES:]
+
+
+class SoakState(TypedDict, total=False):
+    messages: Annotated[list[AnyMessage], recent_messages]
+    current_section: SectionID
+    section_states: dict[str, Any]
+
+
+def generate_reply(state: SoakState, config: RunnableConfig) -> SoakState:
+    """Reply and remember the thread's latest turn in the store."""
+    thread_id = config["configurable"]["thread_id"]
+    get_store().put(("soak", thread_id), "latest", {"messages": len(state["messages"])})
+    return {"messages": [AIMessage(content=REPLY)], "current_section": SectionID.IDEA}
+
+
+def build_graph(saver: InMemorySaver, store: InMemoryStore):
+    builder = StateGraph(SoakState)
+    builder.add_node("generate_reply", generate_reply)
+    builder.add_edge(START, "generate_reply")
+    builder.add_edge("generate_reply", END)
+    return builder.compile(checkpointer=saver, store=store)
+
+
+class StubSyncService:
+    def __init__(self):
+        self.synced = 0
+
+    async def process_event(self, event: RealtimeEvent) -> bool:
+        self.synced += 1
+        return True
+
+
+async def _turns(agent, worker: RealtimeWorker, start: int, stop: int) -> None:
+    for turn in range(start, stop):
+        # Threads are reused, so state kept per thread stops growing once all have been seen
+        thread_id = f"soak-{turn % THREADS}"
+        user_input = StreamInput(message=f"Turn {turn}", thread_id=thread_id, user_id=turn % 50 + 1)
+        async for _ in service.message_generator(user_input, "founder-buddy"):
+            pass
+        # And an editor autosave for the thread, synced by the realtime consumers
+        await worker.processor.add_event(
+            RealtimeEvent(
+                event_type=RealtimeEventType.SECTION_STATE_UPDATED,
+                user_id=turn % 50 + 1,
+                thread_id=thread_id,
+                section_id=SectionID.IDEA.value,
+                event_id=f"event-{turn}",
+                table="section_states",
+                operation="UPDATE",
+            )
+        )
+    while worker.processor.event_queues:
+        await asyncio.sleep(0)
+
+
+def _clear(saver: InMemorySaver, store: InMemoryStore) -> None:
+    saver.storage.clear()
+    saver.writes.clear()
+    saver.blobs.clear()
+    store._data.clear()
+
+
+def test_stream_turns_have_bounded_memory(caplog) -> None:
+    # pytest keeps every captured record, which would show up as growth per turn
+    caplog.set_level(logging.WARNING)
+    saver, store = InMemorySaver(), InMemoryStore()
+    agent = build_graph(saver, store)
+    worker = RealtimeWorker()
+    worker.processor = EventProcessor(max_processed_events=MAX_PROCESSED_EVENTS)
+    worker.sync_service = StubSyncService()
+    worker.subscriptions = {f"soak-{i}": {"thread_id": f"soak-{i}"} for i in range(THREADS)}
+    app = SimpleNamespace(state=SimpleNamespace(realtime_worker=worker))
+
+    # Registry sizes only: tracemalloc would make the soak several times slower
+    diagnostics = MemoryDiagnostics()
+    service._register_memory_registries(diagnostics, app, saver, store)
+
+    async def soak() -> tuple[dict, dict, int]:
+        consumers = [asyncio.create_task(worker._consume_events()) for _ in range(4)]
+        try:
+            await _turns(agent, worker, 0, WARMUP_TURNS)
+            warm = diagnostics.sample()["registries"]
+            # Checkpoint history is kept on purpose; measure everything else
+            _clear(saver, store)
+            gc.collect()
+            before = sys.getallocatedblocks()
+            await _turns(agent, worker, WARMUP_TURNS, TURNS)
+            end = diagnostics.sample()["registries"]
+            _clear(saver, store)
+            gc.collect()
+            return warm, end, sys.getallocatedblocks() - before
+        finally:
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+
+    with patch.object(service, "get_agent", lambda agent_id: agent):
+        warm, end, growth = asyncio.run(soak())
+
+    assert growth < MAX_GROWTH_BLOCKS
+    assert worker.sync_service.synced == TURNS
+    # Per-thread state stays at one entry per thread, however many turns it has had
+    assert end["checkpointer.threads"] == warm["checkpointer.threads"] == THREADS
+    assert end["store.items"] == warm["store.items"] == THREADS
+    # Checkpoint history grows by the same fixed amount every turn
+    soak_turns = TURNS - WARMUP_TURNS
+    assert end["checkpointer.writes"] * WARMUP_TURNS == warm["checkpointer.writes"] * soak_turns
+    assert end["checkpointer.blobs"] * WARMUP_TURNS == warm["checkpointer.blobs"] * soak_turns
+    # Process-wide registries do not grow with turns at all
+    for name in ("singleflight.in_flight", "logging.smart_loggers", "logging.rate_limit_buckets"):
+        assert end[name] == warm[name], name
+    assert end["singleflight.in_flight"] == 0
+    assert end["realtime.subscriptions"] == THREADS
+    assert end["realtime.processed_events"] == warm["realtime.processed_events"] == MAX_PROCESSED_EVENTS
+    assert end["realtime.queued_events"] == 0
+
+
+def test_debug_memory_disabled(test_client) -> None:
+    with patch.object(service, "get_memory_diagnostics", lambda: None):
+        response = test_client.get("/debug/memory")
+    assert response.status_code == 404
+
+
+def test_debug_memory_report(test_client) -> None:
+    diagnostics = MemoryDiagnostics()
+    diagnostics.register("things", lambda: 3)
+    tracemalloc.start()
+    try:
+        with patch.object(service, "get_memory_diagnostics", lambda: diagnostics):
+            response = test_client.get("/debug/memory", params={"limit": 5, "since_start": False})
+    finally:
+        tracemalloc.stop()
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["registries"] == {"things": 3}
+    assert report["rss_mb"] > 0
+    assert 0 < len(report["top_allocations"]) <= 5
+    assert len(report["history"]) == 1
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from service.middleware import AdmissionControlMiddleware, RequestLoggingMiddleware
+
+LOGGER_NAME = "service.middleware"
+
+
+def build_app(**middleware_kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/invoke")
+    async def invoke(payload: dict) -> dict:
+        return {"ok": True}
+
+    @app.post("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/boom")
+    async def boom() -> dict:
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestLoggingMiddleware, **middleware_kwargs)
+    return app
+
+
+def http_lines(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.name == LOGGER_NAME]
+
+
+def test_one_line_per_request(caplog) -> None:
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    client = TestClient(build_app())
+
+    response = client.post("/invoke", json={"message": "hi"})
+    assert response.status_code == 200
+
+    lines = http_lines(caplog)
+    assert len(lines) == 1
+    assert lines[0].startswith("[HTTP] POST /invoke status=200 duration_ms=")
+    assert "body=" not in lines[0]
+
+
+def test_sampling_skips_success_but_keeps_errors(caplog) -> None:
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    client = TestClient(build_app(sample_rate=0.0), raise_server_exceptions=False)
+
+    client.post("/invoke", json={"message": "hi"})
+    assert http_lines(caplog) == []
+
+    client.get("/boom")
+    lines = http_lines(caplog)
+    assert len(lines) == 1
+    assert "error=RuntimeError: boom" in lines[0]
+
+
+def test_body_logging_on_demand_masks_secrets(caplog) -> None:
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    client = TestClient(build_app())
+
+    client.post("/invoke", json={"message": "hi", "api_token": "abc"}, headers={"X-Log-Body": "1"})
+
+    lines = http_lines(caplog)
+    assert len(lines) == 1
+    assert '"message": "hi"' in lines[0]
+    assert "abc" not in lines[0]
+    assert "***MASKED***" in lines[0]
+
+
+def test_body_logging_truncates(caplog) -> None:
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    client = TestClient(build_app(log_body=True, body_max_bytes=8))
+
+    client.post("/invoke", json={"message": "a long message"})
+
+    assert http_lines(caplog)[0].endswith("...(truncated)")
+
+
+@pytest.mark.parametrize("log_body", [True, False])
+def test_streaming_endpoint_is_not_buffered(caplog, log_body) -> None:
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    client = TestClient(build_app(log_body=log_body))
+
+    with client.stream("POST", "/stream", json={"message": "hi"}) as response:
+        assert len(list(response.iter_lines())) > 0
+
+    lines = http_lines(caplog)
+    assert len(lines) == 1
+    assert "body=" not in lines[0]
+    assert "bytes_out=" in lines[0]
+
+
+def build_admission_app(limits: dict, wait: float = 0.0) -> tuple[FastAPI, AdmissionControlMiddleware]:
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.post("/{agent_id}/stream")
+    async def stream(agent_id: str) -> StreamingResponse:
+        async def chunks():
+            await release.wait()
+            yield "data: done\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/info")
+    async def info() -> dict:
+        return {"ok": True}
+
+    app.add_middleware(AdmissionControlMiddleware, limits=limits, wait_estimators=[lambda endpoint: wait])
+    app.state.release = release
+    return app
+
+
+def shed_count(endpoint: str, reason: str) -> float:
+    labels = {"endpoint": endpoint, "reason": reason}
+    return REGISTRY.get_sample_value("founder_buddy_requests_shed_total", labels) or 0.0
+
+
+def test_admission_sheds_on_queue_wait() -> None:
+    client = TestClient(build_admission_app({"stream": {"max_wait_s": 5}}, wait=12.3))
+    before = shed_count("stream", "queue_wait")
+
+    response = client.post("/founder-buddy/stream")
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "13"
+    assert "queue_wait" in response.json()["detail"]
+    assert shed_count("stream", "queue_wait") == before + 1
+    # Endpoints without limits are never shed
+    assert client.get("/info").status_code == 200
+
+
+def test_admission_concurrency_limit_covers_streaming_body() -> None:
+    app = build_admission_app({"stream": {"max_concurrent": 1}})
+    middleware = AdmissionControlMiddleware(app, {"stream": {"max_concurrent": 1}})
+    assert middleware.endpoint_for("/stream") == "stream"
+    assert middleware.endpoint_for("/generate_business_plan/founder-buddy") is None
+
+    async def run() -> list[int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.post("/a/stream"))
+            await asyncio.sleep(0.05)  # first request is now streaming
+            second = await client.post("/b/stream")
+            app.state.release.set()
+            third_status = (await first).status_code
+            after = await client.post("/c/stream")
+            return [second.status_code, third_status, after.status_code]
+
+    assert asyncio.run(run()) == [429, 200, 200]
+
+
+def test_admission_llm_wait_uses_the_endpoint_role_provider() -> None:
+    from unittest.mock import Mock, patch
+
+    from core.llm import LLMConfig, LLMPriority, ModelRole
+    from core.models import AnthropicModelName, OpenAIModelName, Provider
+    from service.service import _llm_queue_wait
+
+    scheduler = Mock(estimate_wait=Mock(return_value=1.5))
+    with patch.dict(LLMConfig.ROLE_MODELS, {ModelRole.REPLY: OpenAIModelName.GPT_4O_MINI}), \
+         patch("core.settings.settings.LLM_ROLE_MODELS", {ModelRole.BUSINESS_PLAN: AnthropicModelName.HAIKU_3}), \
+         patch("core.llm.get_llm_scheduler", return_value=scheduler):
+        assert _llm_queue_wait("generate_business_plan") == 1.5
+        assert _llm_queue_wait("stream") == 1.5
+
+    assert [call.args for call in scheduler.estimate_wait.call_args_list] == [
+        (Provider.ANTHROPIC, LLMPriority.BACKGROUND),
+        (Provider.OPENAI, LLMPriority.INTERACTIVE),
+    ]
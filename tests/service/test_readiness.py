@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from service.readiness import ReadinessProbes, readiness_status
+from service.warmup import Warmup
+
+
+def test_probe_results_are_cached_for_ttl(clock):
+    probes = ReadinessProbes(ttl=5.0, timeout=1.0, clock=clock)
+    calls = []
+
+    async def probe():
+        calls.append(clock.now)
+        await asyncio.sleep(0.01)
+        return {"pool": {"pool_size": 2}}
+
+    async def run():
+        with patch.object(probes, "probes_for", return_value={"postgres": (True, probe)}):
+            # Concurrent polls while the cache is cold share one probe call
+            first, second = await asyncio.gather(probes.check(None), probes.check(None))
+            clock.now = 4.9
+            cached = await probes.check(None)
+            clock.now = 5.0
+            refreshed = await probes.check(None)
+        return first, second, cached, refreshed
+
+    first, second, cached, refreshed = asyncio.run(run())
+
+    assert calls == [0.0, 5.0]
+    assert first["postgres"]["status"] == "ok"
+    assert first["postgres"]["pool"] == {"pool_size": 2}
+    assert first["postgres"]["critical"] is True
+    assert second == first == cached
+    assert refreshed["postgres"]["status"] == "ok"
+
+
+def test_probe_failures_and_timeouts():
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def hanging():
+        await asyncio.sleep(1)
+
+    probes = ReadinessProbes(ttl=5.0, timeout=0.01)
+    registered = {"supabase": (False, broken), "checkpointer": (True, hanging)}
+    with patch.object(probes, "probes_for", return_value=registered):
+        checks = asyncio.run(probes.check(None))
+
+    assert checks["supabase"]["status"] == "error"
+    assert checks["supabase"]["error"] == "refused"
+    assert checks["checkpointer"]["status"] == "timeout"
+    assert readiness_status(checks) == "unavailable"
+    assert readiness_status({"supabase": checks["supabase"]}) == "degraded"
+    assert readiness_status({}) == "ready"
+
+
+def test_realtime_probe_uses_worker_health_check():
+    worker = SimpleNamespace(health_check=AsyncMock(return_value=False), get_subscription_count=lambda: 3)
+    probes = ReadinessProbes()
+    state = SimpleNamespace(checkpointer=None, realtime_worker=worker)
+
+    checks = asyncio.run(probes.check(state, names=["realtime"]))
+
+    assert list(checks) == ["realtime"]
+    assert checks["realtime"]["status"] == "error"
+    assert checks["realtime"]["critical"] is False
+
+
+def test_ready_endpoint_reports_checks(test_client):
+    ready = Warmup({})
+    ready.start()
+    checks = {
+        "checkpointer": {"status": "ok", "critical": True, "duration_ms": 0.4},
+        "llm": {"status": "error", "critical": False, "error": "401", "duration_ms": 80.0},
+    }
+    with patch.object(test_client.app.state, "warmup", ready, create=True), \
+         patch("service.service.readiness_probes.check", AsyncMock(return_value=checks)):
+        response = test_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["checks"]["llm"]["error"] == "401"
+
+    checks["checkpointer"] = {"status": "timeout", "critical": True, "duration_ms": 3000.0}
+    with patch.object(test_client.app.state, "warmup", ready, create=True), \
+         patch("service.service.readiness_probes.check", AsyncMock(return_value=checks)):
+        response = test_client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
@@ -355,3 +355,102 @@ def test_info(test_client, mock_settings) -> None:
 
     assert output.default_model == OpenAIModelName.GPT_4O_MINI
     assert output.models == [OpenAIModelName.GPT_4O, OpenAIModelName.GPT_4O_MINI]
+
+
+def test_check_agent_state_compares_hashes(test_client, mock_agent) -> None:
+    """Only sections whose hashes differ should have their full text fetched."""
+    from integrations.supabase import compute_content_hash
+
+    SYNCED_TEXT = "We help founders validate ideas."
+    STALE_TEXT = "Old mission statement."
+    EDITED_TEXT = "New mission statement."
+    mock_agent.aget_state.return_value = StateSnapshot(
+        values={
+            "section_states": {
+                "idea": {"content": {"plain_text": SYNCED_TEXT}, "status": "done"},
+                "mission": {"content": {"plain_text": STALE_TEXT}, "status": "done"},
+            },
+            "business_plan": "# Plan",
+        },
+        next=(),
+        config={},
+        metadata=None,
+        created_at=None,
+        parent_config=None,
+        tasks=(),
+        interrupts=(),
+    )
+
+    with patch("integrations.supabase.SupabaseClient") as mock_client:
+        client = mock_client.return_value
+        client.get_section_hashes.return_value = [
+            {"section_id": "idea", "content_hash": compute_content_hash(SYNCED_TEXT), "updated_at": None},
+            {"section_id": "mission", "content_hash": compute_content_hash(EDITED_TEXT), "updated_at": None},
+        ]
+        client.get_section_texts.return_value = [{"section_id": "mission", "plain_text": EDITED_TEXT}]
+        client.get_business_plan_hash.return_value = {
+            "content_hash": compute_content_hash("# Plan\n"),
+            "updated_at": None,
+        }
+
+        response = test_client.get(
+            "/check_agent_state/founder-buddy", params={"user_id": 1, "thread_id": "t-1"}
+        )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["summary"]["synced_sections"] == 1
+    assert result["summary"]["unsynced_sections"] == 1
+    assert result["summary"]["business_plan_synced"] is True
+    client.get_section_texts.assert_called_once_with(1, "t-1", ["mission"], agent_id="founder-buddy")
+    client.get_business_plan.assert_not_called()
+
+    mission = next(c for c in result["comparison"] if c["section_id"] == "mission")
+    assert mission["database"]["text_preview"] == EDITED_TEXT
+    assert mission["agent_state"]["text_preview"] == STALE_TEXT
+
+
+def test_metrics(test_client) -> None:
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "founder_buddy_graph_node_duration_seconds" in response.text
+
+
+def test_stream_section_event_includes_timing(test_client, mock_agent) -> None:
+    """The final section event carries TTFT and token timing for the run."""
+    from agents.founder_buddy.enums import SectionID
+
+    TOKENS = ["Hello", " founder", "!"]
+
+    async def mock_astream(**kwargs):
+        for token in TOKENS:
+            yield ("messages", (AIMessageChunk(content=token), {"tags": []}))
+
+    mock_agent.astream = mock_astream
+    mock_agent.aget_state.return_value = StateSnapshot(
+        values={"current_section": SectionID.MISSION, "section_states": {}},
+        next=(),
+        config={},
+        metadata=None,
+        created_at=None,
+        parent_config=None,
+        tasks=(),
+        interrupts=(),
+    )
+
+    with test_client.stream("POST", "/stream", json={"message": "hi", "stream_tokens": True}) as response:
+        assert response.status_code == 200
+        messages = [
+            json.loads(line.lstrip("data: "))
+            for line in response.iter_lines()
+            if line and line.strip() != "data: [DONE]"
+        ]
+
+    section_events = [msg for msg in messages if msg["type"] == "section"]
+    assert len(section_events) == 1
+    timing = section_events[0]["content"]["timing"]
+    assert timing["tokens"] == len(TOKENS)
+    assert timing["ttft_ms"] is not None
+    assert timing["ttft_ms"] <= timing["total_ms"]
+    assert timing["generation_ms"] >= 0
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from service import app
+from service.singleflight import SingleFlight
+
+
+def test_single_flight_shares_result_and_errors():
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value == "bad":
+            raise ValueError("boom")
+        return value
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            flight.do("plan", ("t1", "c1"), lambda: work("a")),
+            flight.do("plan", ("t1", "c1"), lambda: work("a")),
+            flight.do("plan", ("t1", "c2"), lambda: work("b")),
+        )
+        errors = await asyncio.gather(
+            flight.do("plan", "x", lambda: work("bad")),
+            flight.do("plan", "x", lambda: work("bad")),
+            return_exceptions=True,
+        )
+        # Finished work is not reused
+        again = await flight.do("plan", ("t1", "c1"), lambda: work("a"))
+        return results, errors, again, flight.in_flight()
+
+    results, errors, again, in_flight = asyncio.run(run())
+    assert results == ["a", "a", "b"]
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+    assert again == "a"
+    assert calls == ["a", "b", "bad", "a"]
+    assert in_flight == 0
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    async def run():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "plan"
+
+        first = asyncio.create_task(flight.do("plan", "k", work))
+        await started.wait()
+        second = asyncio.create_task(flight.do("plan", "k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "plan"
+
+
+@pytest.mark.parametrize("checkpoints", [("c1", "c1"), ("c1", "c2")])
+def test_generate_business_plan_coalesces_identical_requests(mock_agent, checkpoints):
+    versions = iter(checkpoints)
+    generated = []
+
+    async def aget_state(config):
+        return SimpleNamespace(
+            values={"messages": []}, config={"configurable": {"checkpoint_id": next(versions)}}
+        )
+
+    async def node(state, config):
+        generated.append(config["configurable"]["thread_id"])
+        await asyncio.sleep(0.05)
+        return {**state, "business_plan": "# Plan"}
+
+    mock_agent.aget_state = aget_state
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            url = "/generate_business_plan/founder-buddy?user_id=1&thread_id=t1"
+            return await asyncio.gather(client.post(url), client.post(url))
+
+    with patch(
+        "agents.founder_buddy.nodes.generate_business_plan.generate_business_plan_node", node
+    ):
+        responses = asyncio.run(run())
+
+    assert [response.json()["business_plan"] for response in responses] == ["# Plan", "# Plan"]
+    # Same checkpoint: one generation; a newer checkpoint starts its own
+    assert len(generated) == (1 if checkpoints[0] == checkpoints[1] else 2)
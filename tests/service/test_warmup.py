@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from service.warmup import Warmup
+
+
+def test_warmup_runs_steps_concurrently_and_flips_ready():
+    started = []
+
+    async def step(name: str):
+        started.append(name)
+        await asyncio.sleep(0.05)
+
+    async def failing():
+        raise RuntimeError("no provider")
+
+    async def run():
+        warmup = Warmup(
+            {"a": lambda: step("a"), "b": lambda: step("b"), "llm": failing},
+            timeout=1.0,
+        )
+        warmup.start()
+        assert not warmup.ready
+        await warmup._task
+        return warmup
+
+    warmup = asyncio.run(run())
+
+    assert warmup.ready
+    assert sorted(started) == ["a", "b"]
+    # Both 50 ms steps overlapped
+    assert warmup.duration_ms < 95
+    status = warmup.status()
+    assert status["status"] == "ready"
+    assert status["warmup"]["steps"]["a"]["status"] == "ok"
+    assert status["warmup"]["steps"]["llm"] == {
+        "status": "error",
+        "error": "no provider",
+        "duration_ms": status["warmup"]["steps"]["llm"]["duration_ms"],
+    }
+
+
+def test_warmup_step_timeout():
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def run():
+        warmup = Warmup({"slow": slow}, timeout=0.01)
+        await warmup.run()
+        return warmup
+
+    warmup = asyncio.run(run())
+    assert warmup.ready
+    assert warmup.results["slow"]["status"] == "timeout"
+
+
+def test_ready_endpoint(test_client):
+    not_ready = Warmup({"llm": lambda: asyncio.sleep(0)})
+    with patch.object(test_client.app.state, "warmup", not_ready, create=True):
+        response = test_client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    ready = Warmup({})
+    ready.start()
+    with patch.object(test_client.app.state, "warmup", ready, create=True), \
+         patch("service.service.readiness_probes.check", AsyncMock(return_value={})):
+        response = test_client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    # /health stays a liveness check
+    with patch.object(test_client.app.state, "warmup", not_ready, create=True):
+        assert test_client.get("/health").status_code == 200
+
+
+def test_warm_llm_builds_the_models_the_nodes_use():
+    from core.llm import LLMConfig, ModelRole
+    from core.models import AnthropicModelName, OpenAIModelName
+    from service.warmup import warm_llm
+
+    built = []
+    list_models = AsyncMock()
+
+    def get_model(model_name, role=None):
+        built.append((model_name, role))
+        if isinstance(model_name, AnthropicModelName):
+            return object()
+        # A client per model instance, as ChatOpenAI builds them, all for one endpoint
+        client = SimpleNamespace(base_url="https://api.openai.com/v1", api_key="k", models=SimpleNamespace(list=list_models))
+        return SimpleNamespace(root_async_client=client)
+
+    with patch.dict(LLMConfig.ROLE_MODELS, {ModelRole.REPLY: OpenAIModelName.GPT_4O_MINI}), \
+         patch("core.settings.settings.LLM_ROLE_MODELS", {ModelRole.BUSINESS_PLAN: AnthropicModelName.HAIKU_3}), \
+         patch("core.llm.get_model", get_model):
+        asyncio.run(warm_llm())
+        expected = {(LLMConfig.get_model_for_role(role), role) for role in ModelRole}
+
+    assert len(built) == len(ModelRole)
+    assert set(built) == expected
+    assert (OpenAIModelName.GPT_4O_MINI, ModelRole.REPLY) in built
+    assert (AnthropicModelName.HAIKU_3, ModelRole.BUSINESS_PLAN) in built
+    # Three OpenAI roles, one connection to open
+    list_models.assert_awaited_once()